@@ -0,0 +1,212 @@
+"""Headless benchmarks for Seat, CinemaScreen and CinemaApp.draw_layout.
+
+    python3 benchmark.py                      # 1k/10k/100k seats and the stadium layout, compared with benchmark_baseline.json
+    python3 benchmark.py --sizes 1000,10000
+    python3 benchmark.py --update-baseline    # record the current numbers as the new baseline
+
+Exits with status 1 when an operation's time or peak memory exceeds its baseline by more than --tolerance,
+so CI can flag regressions. Baselines are machine-specific; record them on the CI runner.
+"""
+import argparse
+from contextlib import redirect_stdout
+import gc
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from layout import SEAT_COLORS, load_layout, write_layout
+from main import CinemaApp, CinemaScreen, Seat
+
+BASELINE = 'benchmark_baseline.json'
+STADIUM = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'layouts', 'stadium.json')
+
+
+class RecordingCanvas:
+    """Stand-in for tk.Canvas that records calls instead of drawing."""
+
+    def __init__(self):
+        self.calls = 0
+        self._next_id = 0
+
+    def _create(self, *args, **kwargs):
+        self.calls += 1
+        self._next_id += 1
+        return self._next_id
+
+    create_polygon = create_text = create_rectangle = create_image = _create
+
+    def _record(self, *args, **kwargs):
+        self.calls += 1
+
+    itemconfig = itemconfigure = coords = move = scale = delete = tag_bind = bind = tag_lower = _record
+
+    def canvasx(self, x):
+        return x
+
+    def canvasy(self, y):
+        return y
+
+
+def make_screen(layout_path):
+    screen = CinemaScreen(RecordingCanvas(), SEAT_COLORS, lambda: None)
+    app = CinemaApp.__new__(CinemaApp)
+    app.screen = screen
+    app.LAYOUT = layout_path
+    app.draw_layout()
+    return app, screen
+
+
+def operations(n, layout_path, workdir):
+    # Each entry is (name, setup, op); setup's result is passed to op and not timed
+    def seats():
+        canvas = RecordingCanvas()
+        made = [Seat(canvas, f'S{i}', i % 100 * 22, i // 100 * 30, 'standard', 'purple', lambda: None)
+                for i in range(n)]
+        for s in made:
+            s.book(canvas)
+            s.reset(canvas)
+
+    def add_seat(_):
+        screen = CinemaScreen(RecordingCanvas(), SEAT_COLORS, lambda: None)
+        for i in range(n):
+            screen.add_seat(f'S{i}', i % 100 * 22, i // 100 * 30, 'standard')
+
+    def fresh():
+        return make_screen(layout_path)[1]
+
+    def booked():
+        screen = fresh()
+        screen.book_all()
+        return screen
+
+    bookings = os.path.join(workdir, 'bookings.json')
+
+    def saved():
+        screen = booked()
+        screen.save_bookings(bookings)
+        return fresh()
+
+    return [
+        ('Seat construct/book/reset', lambda: None, lambda _: seats()),
+        ('CinemaScreen.add_seat', lambda: None, add_seat),
+        ('CinemaApp.draw_layout', lambda: None, lambda _: make_screen(layout_path)),
+        ('CinemaScreen.clear + redraw', fresh, lambda s: (s.clear(), s.load_layout(load_layout(layout_path)))),
+        ('CinemaScreen.book_all', fresh, lambda s: s.book_all()),
+        ('CinemaScreen.reset_all', booked, lambda s: s.reset_all()),
+        ('CinemaScreen.get_summary', booked, lambda s: s.get_summary()),
+        ('CinemaScreen.get_total_price', booked, lambda s: s.get_total_price()),
+        ('CinemaScreen.save_bookings', booked, lambda s: s.save_bookings(bookings)),
+        ('CinemaScreen.load_bookings', saved, lambda s: s.load_bookings(bookings)),
+    ]
+
+
+def measure(setup, op, repeat):
+    # Best of `repeat` runs, each on fresh state from setup()
+    elapsed = []
+    for _ in range(repeat):
+        state = setup()
+        gc.collect()
+        # As timeit does, keep the cyclic collector from landing inside the timed region
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            op(state)
+            elapsed.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+        del state
+    # Memory is measured on a separate run: tracemalloc slows allocation-heavy code down
+    state = setup()
+    gc.collect()
+    tracemalloc.start()
+    op(state)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(elapsed), peak
+
+
+def stadium_operations():
+    # The shipped ~50k-seat curved layout, loaded into a headless screen from its compiled arrays
+    layout = load_layout(STADIUM)
+    return len(layout), [
+        ('CinemaScreen.load_layout', lambda: CinemaScreen(None, SEAT_COLORS, lambda: None),
+         lambda s: s.load_layout(layout)),
+    ]
+
+
+def run(sizes, repeat=3, stadium=True):
+    results = {}
+
+    def record(name, n, label, setup, op):
+        # Keep stray prints out of the report
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            seconds, peak = measure(setup, op, repeat)
+        results[f'{name} @ {label}'] = {'seconds': seconds, 'peak_bytes': peak}
+        print(f"{name:<32}{n:>8} seats {seconds * 1000:12.2f} ms {peak / 2 ** 20:10.2f} MiB", flush=True)
+
+    workdir = tempfile.mkdtemp(prefix='cinema-bench-')
+    try:
+        for n in sizes:
+            layout_path = os.path.join(workdir, f'hall_{n}.json')
+            write_layout(layout_path, n)
+            for name, setup, op in operations(n, layout_path, workdir):
+                record(name, n, n, setup, op)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    if stadium:
+        n, ops = stadium_operations()
+        for name, setup, op in ops:
+            record(name, n, 'stadium', setup, op)
+    return results
+
+
+def compare(results, baseline, tolerance, min_seconds=0.001, min_bytes=64 * 1024):
+    regressions = []
+    for key, now in results.items():
+        before = baseline.get(key)
+        if before is None:
+            continue
+        if now['seconds'] > max(before['seconds'] * (1 + tolerance), min_seconds):
+            regressions.append(f"{key}: {now['seconds'] * 1000:.2f} ms vs baseline {before['seconds'] * 1000:.2f} ms")
+        if now['peak_bytes'] > max(before['peak_bytes'] * (1 + tolerance), min_bytes):
+            regressions.append(f"{key}: peak {now['peak_bytes'] / 2 ** 20:.2f} MiB "
+                               f"vs baseline {before['peak_bytes'] / 2 ** 20:.2f} MiB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000', help='comma-separated seat counts')
+    parser.add_argument('--baseline', default=BASELINE, help='baseline JSON file')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per operation, best is kept')
+    parser.add_argument('--tolerance', type=float, default=1.0, help='allowed growth, 1.0 = twice the baseline')
+    parser.add_argument('--no-stadium', action='store_true', help='skip loading layouts/stadium.json')
+    parser.add_argument('--update-baseline', action='store_true', help='write results as the new baseline')
+    parser.add_argument('--output', help='also write results to this JSON file')
+    args = parser.parse_args(argv)
+
+    results = run([int(n) for n in args.sizes.split(',')], args.repeat, not args.no_stadium)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
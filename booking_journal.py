@@ -0,0 +1,134 @@
+import json
+import os
+import threading
+
+
+def write_json_atomic(path, records):
+    # Stream a JSON list to a temp file, fsync it, then atomically rename it over `path`
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as f:
+        f.write('[')
+        for n, record in enumerate(records):
+            if n:
+                f.write(', ')
+            json.dump(record, f)
+        f.write(']')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class BookingJournal:
+    """Append-only log of book/reset events, compacted into a bookings.json snapshot.
+
+    Every change is appended as one JSON line as it happens. Compaction rotates the live
+    journal to `<path>.old`, writes a snapshot of the state at rotation time (in a worker
+    thread by default), renames it over `snapshot` and only then drops the rotated file.
+    Events record absolute states, so replaying snapshot -> .old -> live journal is always
+    correct, including after a crash half-way through a compaction.
+    """
+
+    def __init__(self, path='bookings.journal', snapshot='bookings.json', compact_after=1000, fsync=False):
+        self.path = path
+        self.snapshot = snapshot
+        self.compact_after = compact_after
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._worker = None
+        self._entries = sum(1 for _ in self._read(path))
+        self._file = self._open_append(path)
+
+    @staticmethod
+    def _open_append(path):
+        # After a crash mid-write the file can end in a torn line; terminate it so the next
+        # event starts a line of its own instead of being glued onto the garbage
+        f = open(path, 'a')
+        if f.tell():
+            with open(path, 'rb') as tail:
+                tail.seek(-1, os.SEEK_END)
+                if tail.read(1) != b'\n':
+                    f.write('\n')
+        return f
+
+    @property
+    def old_path(self):
+        return f"{self.path}.old"
+
+    @staticmethod
+    def _read(path):
+        if not os.path.exists(path):
+            return
+        with open(path) as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # A torn final line from a crash mid-write; everything before it is intact
+                    continue
+                yield event['seat_id'], event['booked']
+
+    def record(self, seat_id, booked):
+        line = json.dumps({'seat_id': seat_id, 'booked': booked}) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._entries += 1
+
+    def due(self, seat_count=0):
+        """True once the journal holds enough events to be worth compacting.
+
+        The threshold grows with the venue so that snapshot writes stay amortised O(1) per event.
+        """
+        return self._entries >= max(self.compact_after, seat_count) and not self.compacting
+
+    def replay(self):
+        """(seat_id, booked) events not yet folded into the snapshot, oldest first."""
+        with self._lock:
+            self._file.flush()
+        yield from self._read(self.old_path)
+        yield from self._read(self.path)
+
+    @property
+    def compacting(self):
+        return self._worker is not None and self._worker.is_alive()
+
+    def compact(self, records, background=True):
+        """Fold the journal into the snapshot.
+
+        `records` is an iterable of Seat.to_dict()-shaped dicts describing the state at the
+        moment of the call; it is consumed in the worker thread, so it must not depend on
+        state that changes afterwards.
+        """
+        self.wait()
+        with self._lock:
+            self._file.close()
+            if os.path.exists(self.old_path):
+                # A previous compaction never finished: keep its events and append ours
+                with open(self.path) as src, self._open_append(self.old_path) as dst:
+                    dst.write(src.read())
+                os.remove(self.path)
+            else:
+                os.replace(self.path, self.old_path)
+            self._file = self._open_append(self.path)
+            self._entries = 0
+        if background:
+            self._worker = threading.Thread(target=self._write_snapshot, args=(records,), daemon=True)
+            self._worker.start()
+        else:
+            self._write_snapshot(records)
+
+    def _write_snapshot(self, records):
+        write_json_atomic(self.snapshot, records)
+        os.remove(self.old_path)
+
+    def wait(self):
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
+    def close(self):
+        self.wait()
+        with self._lock:
+            self._file.close()
@@ -0,0 +1,314 @@
+import asyncio
+from array import array
+import json
+import logging
+import os
+import re
+import threading
+
+from booking_snapshot import Snapshot, is_snapshot, write_snapshot_bits
+from main import CinemaScreen, build_main_hall, enable_metrics
+
+log = logging.getLogger(__name__)
+
+# Showtime keys name files under data_dir, so they are restricted to a safe file name
+SHOWTIME_KEY = re.compile(r'[A-Za-z0-9][A-Za-z0-9_-]{0,63}')
+
+
+class Showtime:
+    """One headless CinemaScreen plus a version counter per seat for compare-and-swap."""
+
+    def __init__(self, key, layout):
+        self.key = key
+        self.screen = CinemaScreen(None, {}, lambda: None)
+        layout(self.screen)
+        self.versions = array('L', [0]) * len(self.screen.seat_map)
+        self.changes = 0
+        self.saved = 0
+        self._write_lock = threading.Lock()
+
+    @property
+    def dirty(self):
+        return self.saved != self.changes
+
+    def save(self, path, changes, bits):
+        # Runs in an executor thread. The lock keeps two writers off the same temp file, and a
+        # capture older than what is already on disk is dropped rather than written over it.
+        with self._write_lock:
+            if changes <= self.saved:
+                return
+            seat_map = self.screen.seat_map
+            write_snapshot_bits(path, len(seat_map), seat_map.layout_hash(), bits)
+            self.saved = changes
+
+    def state(self, seat_id):
+        i = self.screen.seat_map.index(seat_id)
+        return {'ok': True, 'seat_id': seat_id, 'booked': self.screen.seat_map.is_booked(i),
+                'version': self.versions[i]}
+
+    def change(self, seat_id, booked, expected_version=None):
+        # Runs on the event loop thread without awaiting, so check-and-set is atomic
+        seat_map = self.screen.seat_map
+        i = seat_map.get_index(seat_id)
+        if i is None:
+            return {'ok': False, 'error': 'unknown seat', 'seat_id': seat_id}
+        version = self.versions[i]
+        if expected_version is not None and expected_version != version:
+            return {'ok': False, 'error': 'version conflict', 'seat_id': seat_id,
+                    'booked': seat_map.is_booked(i), 'version': version}
+        if seat_map.is_booked(i) == booked:
+            return {'ok': False, 'error': 'already booked' if booked else 'not booked', 'seat_id': seat_id,
+                    'booked': booked, 'version': version}
+        # Through the screen, so its instrumented _set_booked sees service bookings too
+        self.screen._set_booked(i, booked)
+        self.versions[i] = version + 1
+        self.changes += 1
+        return {'ok': True, 'seat_id': seat_id, 'booked': booked, 'version': version + 1}
+
+    def book_many(self, seat_ids):
+        seat_map = self.screen.seat_map
+        indices = [seat_map.get_index(seat_id) for seat_id in seat_ids]
+        taken = [seat_id for seat_id, i in zip(seat_ids, indices) if i is None or seat_map.is_booked(i)]
+        if taken or len(set(indices)) != len(indices):
+            return {'ok': False, 'error': 'unavailable', 'seat_ids': taken}
+        self.screen.apply_bookings((i, True) for i in indices)
+        for i in indices:
+            self.versions[i] += 1
+        self.changes += 1
+        return {'ok': True, 'seat_ids': list(seat_ids)}
+
+
+class BookingService:
+    """Hosts many showtimes in one asyncio process.
+
+    Concurrent requests can never double-book: every change is a compare-and-swap on the
+    seat's booked flag (and optionally its version). Persistence is batched: dirty
+    showtimes are written as binary snapshots every `flush_interval` seconds, off the
+    event loop.
+
+    Showtime keys must match SHOWTIME_KEY and, when `keys` is given, be one of them;
+    at most `max_showtimes` are kept in memory.
+    """
+
+    def __init__(self, data_dir='showtimes', layout=build_main_hall, flush_interval=1.0, keys=None,
+                 max_showtimes=256):
+        self.data_dir = data_dir
+        self.layout = layout
+        self.flush_interval = flush_interval
+        self.keys = None if keys is None else set(keys)
+        self.max_showtimes = max_showtimes
+        self.showtimes = {}
+        self._flusher = None
+        os.makedirs(data_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.data_dir, f"{key}.bin")
+
+    def showtime(self, key):
+        if not isinstance(key, str):
+            raise ValueError(f"unknown showtime {key!r}")
+        show = self.showtimes.get(key)
+        if show is None:
+            if not SHOWTIME_KEY.fullmatch(key) or (self.keys is not None and key not in self.keys):
+                raise ValueError(f"unknown showtime {key!r}")
+            if len(self.showtimes) >= self.max_showtimes:
+                raise ValueError("too many showtimes")
+            show = Showtime(key, self.layout)
+            path = self._path(key)
+            if is_snapshot(path):
+                # Only a showtime whose snapshot loaded is registered: an empty one left behind
+                # would take requests and then be flushed over the bookings on disk
+                with Snapshot(path) as snap:
+                    snap.check(show.screen.seat_map)
+                    for _ in show.screen.seat_map.book_bits(snap.bits):
+                        pass
+            self.showtimes[key] = show
+        return show
+
+    async def book(self, showtime, seat_id, expected_version=None):
+        return self.showtime(showtime).change(seat_id, True, expected_version)
+
+    async def reset(self, showtime, seat_id, expected_version=None):
+        return self.showtime(showtime).change(seat_id, False, expected_version)
+
+    async def book_many(self, showtime, seat_ids):
+        return self.showtime(showtime).book_many(seat_ids)
+
+    async def state(self, showtime, seat_id):
+        return self.showtime(showtime).state(seat_id)
+
+    async def best_available(self, showtime, n, seat_type=None):
+        show = self.showtime(showtime)
+        block = show.screen.find_best_available(n, seat_type, book=False)
+        if block is None:
+            return {'ok': False, 'error': 'no block available'}
+        return show.book_many(block)
+
+    async def start(self):
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                # The showtimes stay dirty, so the next pass retries them
+                log.exception("Flushing showtimes failed")
+
+    async def flush(self):
+        # A showtime is only marked clean by a write that succeeded (see Showtime.save)
+        loop = asyncio.get_running_loop()
+        writes = [loop.run_in_executor(None, show.save, self._path(key), show.changes,
+                                       show.screen.seat_map.booked_bits())
+                  for key, show in self.showtimes.items() if show.dirty]
+        if writes:
+            await asyncio.gather(*writes)
+
+    async def handle(self, request):
+        if not isinstance(request, dict):
+            return {'ok': False, 'error': 'bad request: expected a JSON object'}
+        op = request.get('op')
+        try:
+            if op == 'book':
+                return await self.book(request['showtime'], _field(request, 'seat_id', str),
+                                       _field(request, 'version', int, None))
+            if op == 'reset':
+                return await self.reset(request['showtime'], _field(request, 'seat_id', str),
+                                        _field(request, 'version', int, None))
+            if op == 'book_many':
+                seat_ids = _field(request, 'seat_ids', list)
+                if not all(isinstance(seat_id, str) for seat_id in seat_ids):
+                    raise ValueError("seat_ids must be strings")
+                return await self.book_many(request['showtime'], seat_ids)
+            if op == 'state':
+                return await self.state(request['showtime'], _field(request, 'seat_id', str))
+            if op == 'best_available':
+                n = _field(request, 'n', int)
+                if n < 1:
+                    raise ValueError("n must be positive")
+                return await self.best_available(request['showtime'], n, _field(request, 'seat_type', str, None))
+        except (KeyError, ValueError) as e:
+            return {'ok': False, 'error': f"bad request: {e}"}
+        except Exception:
+            log.exception("Request %r failed", request)
+            return {'ok': False, 'error': 'internal error'}
+        return {'ok': False, 'error': f"unknown op {op!r}"}
+
+
+_MISSING = object()
+
+
+def _field(request, name, kind, default=_MISSING):
+    # Request fields come straight from the client, so check their types before use
+    value = request.get(name, default)
+    if value is _MISSING:
+        raise KeyError(name)
+    if value is default and default is None:
+        return None
+    if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+        raise ValueError(f"{name} must be {kind.__name__}")
+    return value
+
+
+# Localhost stand-in: newline-delimited JSON requests and replies over TCP
+
+async def read_request(reader):
+    """The next request line; b'' at end of stream, None for a line over the reader's limit (skipped)."""
+    try:
+        return await reader.readuntil(b'\n')
+    except asyncio.IncompleteReadError as e:
+        return e.partial
+    except asyncio.LimitOverrunError:
+        pass
+    while True:
+        try:
+            await reader.readuntil(b'\n')
+            return None
+        except asyncio.LimitOverrunError as e:
+            await reader.readexactly(e.consumed)
+        except asyncio.IncompleteReadError:
+            return b''
+
+
+async def serve(service, host='127.0.0.1', port=8765):
+    async def on_client(reader, writer):
+        try:
+            while True:
+                line = await read_request(reader)
+                if line is None:
+                    reply = {'ok': False, 'error': 'request too long'}
+                elif not line:
+                    break
+                else:
+                    try:
+                        request = json.loads(line)
+                    except ValueError:
+                        reply = {'ok': False, 'error': 'malformed request'}
+                    else:
+                        reply = await service.handle(request)
+                writer.write(json.dumps(reply).encode() + b'\n')
+                await writer.drain()
+        finally:
+            writer.close()
+
+    await service.start()
+    return await asyncio.start_server(on_client, host, port)
+
+
+class BookingClient:
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    async def connect(cls, host='127.0.0.1', port=8765):
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def request(self, **request):
+        async with self._lock:
+            self._writer.write(json.dumps(request).encode() + b'\n')
+            await self._writer.drain()
+            return json.loads(await self._reader.readline())
+
+    async def book(self, showtime, seat_id, version=None):
+        return await self.request(op='book', showtime=showtime, seat_id=seat_id, version=version)
+
+    async def reset(self, showtime, seat_id, version=None):
+        return await self.request(op='reset', showtime=showtime, seat_id=seat_id, version=version)
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+async def _main():
+    metrics = enable_metrics()
+    if metrics is not None:
+        metrics.instrument(Showtime, 'change', 'book_many')
+    service = BookingService()
+    server = await serve(service)
+    print(f"Booking service listening on {', '.join(str(s.getsockname()) for s in server.sockets)}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+        if metrics is not None and metrics.path:
+            metrics.write()
+
+
+if __name__ == '__main__':
+    asyncio.run(_main())
@@ -0,0 +1,118 @@
+import json
+import mmap
+import os
+import struct
+
+from booking_journal import write_json_atomic
+from seat_map import SeatMap
+
+# Binary booking snapshot:
+#   magic (4s) | version (H) | reserved (H) | seat count (I) | layout hash (16s)
+#   followed by the booked flags as a bitset in seat-index order (bit i&7 of byte i>>3)
+MAGIC = b'CBSN'
+VERSION = 1
+HEADER = struct.Struct('<4sHHI16s')
+
+_POPCOUNT = bytes(bin(b).count('1') for b in range(256))
+
+
+def is_snapshot(path):
+    if not os.path.exists(path):
+        return False
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def write_snapshot(path, seat_map):
+    write_snapshot_bits(path, len(seat_map), seat_map.layout_hash(), seat_map.booked_bits())
+
+
+def write_snapshot_bits(path, count, layout_hash, bits):
+    # Split out so callers can capture the state on one thread and write it on another
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, count, layout_hash))
+        f.write(bits)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class Snapshot:
+    """Read-only, memory-mapped view of a binary snapshot; nothing is copied until asked for."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is too short to be a booking snapshot")
+        magic, version, _, self.count, self.layout_hash = HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} booking snapshot")
+        if len(self._mm) < HEADER.size + (self.count + 7) // 8:
+            self.close()
+            raise ValueError(f"{path} is truncated")
+        self.bits = memoryview(self._mm)[HEADER.size:HEADER.size + (self.count + 7) // 8]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if getattr(self, 'bits', None) is not None:
+            self.bits.release()
+            self.bits = None
+        self._mm.close()
+
+    def __len__(self):
+        return self.count
+
+    def matches(self, seat_map):
+        return self.count == len(seat_map) and self.layout_hash == seat_map.layout_hash()
+
+    def check(self, seat_map):
+        if not self.matches(seat_map):
+            raise ValueError("Booking snapshot was written for a different seat layout")
+
+    def is_booked(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        return bool(self.bits[i >> 3] & (1 << (i & 7)))
+
+    def booked_count(self):
+        return sum(_POPCOUNT[b] for b in self.bits)
+
+
+def read_snapshot(path):
+    return Snapshot(path)
+
+
+# Converters to and from the bookings.json shape produced by Seat.to_dict
+
+def seat_map_from_records(records):
+    seat_map = SeatMap()
+    for d in records:
+        i = seat_map.add(d['seat_id'], d.get('x', 0), d.get('y', 0), d.get('seat_type', 'standard'),
+                         d.get('w', 20), d.get('h', 15), d.get('angle_deg', 0), d.get('price') or 0)
+        if d.get('booked'):
+            seat_map.set_booked(i, True)
+    return seat_map
+
+
+def json_to_snapshot(json_path, snapshot_path):
+    with open(json_path) as f:
+        seat_map = seat_map_from_records(json.load(f))
+    write_snapshot(snapshot_path, seat_map)
+    return seat_map
+
+
+def snapshot_to_json(snapshot_path, json_path, seat_map):
+    # The snapshot only holds flags, so the layout (geometry, prices) comes from seat_map
+    with Snapshot(snapshot_path) as snap:
+        snap.check(seat_map)
+        write_json_atomic(json_path, (dict(seat_map.to_dict(i), booked=snap.is_booked(i))
+                                      for i in range(len(seat_map))))
@@ -0,0 +1,25 @@
+import hashlib
+import os
+
+
+def cached_resize(path, size, cache_dir='.cache'):
+    """Path of a PPM copy of `path` resized to `size`, creating it on first use.
+
+    The cache key is the source file's hash plus the target size, so replacing the image or
+    changing the canvas size never serves a stale copy. PPM is used because Tk decodes it
+    natively, without going through PIL on the GUI thread.
+    """
+    with open(path, 'rb') as f:
+        digest = hashlib.sha1(f.read()).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(path))[0]
+    cached = os.path.join(cache_dir, f"{name}-{digest}-{size[0]}x{size[1]}.ppm")
+    if not os.path.exists(cached):
+        # PIL is only needed on a cache miss
+        from PIL import Image
+
+        os.makedirs(cache_dir, exist_ok=True)
+        img = Image.open(path).convert('RGB').resize(size, Image.Resampling.LANCZOS)
+        tmp = f"{cached}.{os.getpid()}.tmp"
+        img.save(tmp, 'PPM')
+        os.replace(tmp, cached)
+    return cached
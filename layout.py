@@ -0,0 +1,179 @@
+import hashlib
+import json
+import math
+import os
+
+import numpy as np
+
+# A layout file is JSON with a list of blocks. Each block expands to seats in one pass:
+#
+#   grid:   {"id": "S{r}_{c}", "type": "standard", "rows": 3, "cols": 10,
+#            "origin": [400, 500], "col_step": [30, 0], "row_step": [0, 30]}
+#   arc:    {"id": "R{r}_{c}", "type": "standard", "rows": 40,
+#            "arc": {"center": [640, 1400], "radius": 600, "row_spacing": 22,
+#                    "start_deg": 240, "end_deg": 300, "seat_spacing": 22}}
+#   seats:  {"seats": [{"id": "A1", "type": "value", "x": 10, "y": 20, "angle_deg": 15}, ...]}
+#
+# Optional per-block keys: "size": [w, h] (default [20, 15]), "angle_deg", "price",
+# "first_row"/"first_col" (numbering, default 1). (x, y) is the top-left of the unrotated
+# seat, as for CinemaScreen.add_seat; arc seats are turned to face the arc centre.
+
+DEFAULT_SIZE = (20, 15)
+
+# Canvas colour of each seat type, shared by the GUI, the seat detector and the benchmarks
+SEAT_COLORS = {
+    'premium': '#FFFD55', 'standard': 'purple', 'value': 'green',
+    'reserved': '#39107B', 'obstructed': 'maroon', 'handicap': '#a6ffae'
+}
+
+
+class CompiledLayout:
+    """Column arrays for every seat in a layout, plus an (N, 8) array of polygon corners."""
+
+    def __init__(self, ids, types, x, y, w, h, angle, price, name=''):
+        self.name = name
+        self.ids = list(ids)
+        self.types = list(types)
+        self.x, self.y, self.w, self.h, self.angle = (np.asarray(a, dtype=np.float64) for a in (x, y, w, h, angle))
+        # NaN marks "use the default price for the seat type"
+        self.price = np.asarray(price, dtype=np.float64)
+        self.polygons = seat_polygons(self.x, self.y, self.w, self.h, self.angle)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def bboxes(self):
+        xs, ys = self.polygons[:, 0::2], self.polygons[:, 1::2]
+        return np.stack([xs.min(axis=1), ys.min(axis=1), xs.max(axis=1), ys.max(axis=1)], axis=1)
+
+
+def seat_polygons(x, y, w, h, angle_deg):
+    # Vectorised seat_map.seat_polygon: same corner order, one row of 8 coords per seat
+    a = np.radians(angle_deg)
+    cos_a, sin_a = np.cos(a), np.sin(a)
+    cx, cy = x + w / 2, y + h / 2
+    dx = np.stack([-w / 2, w / 2, w / 2, -w / 2], axis=1)
+    dy = np.stack([-h / 2, -h / 2, h / 2, h / 2], axis=1)
+    out = np.empty((len(x), 8))
+    out[:, 0::2] = cx[:, None] + dx * cos_a[:, None] - dy * sin_a[:, None]
+    out[:, 1::2] = cy[:, None] + dx * sin_a[:, None] + dy * cos_a[:, None]
+    return out
+
+
+def _ids(template, rows, cols):
+    return [template.format(r=r, c=c) for r, c in zip(rows.tolist(), cols.tolist())]
+
+
+def _grid_block(block):
+    rows, cols = block.get('rows', 1), block['cols']
+    r = np.repeat(np.arange(rows), cols)
+    c = np.tile(np.arange(cols), rows)
+    ox, oy = block.get('origin', (0, 0))
+    cdx, cdy = block.get('col_step', (20, 0))
+    rdx, rdy = block.get('row_step', (0, 30))
+    x = ox + c * cdx + r * rdx
+    y = oy + c * cdy + r * rdy
+    angle = np.full(len(r), float(block.get('angle_deg', 0)))
+    return r, c, x, y, angle
+
+
+def _arc_block(block):
+    arc = block['arc']
+    rows = block.get('rows', 1)
+    radius = arc['radius'] + np.arange(rows) * arc.get('row_spacing', 25)
+    start, end = math.radians(arc['start_deg']), math.radians(arc['end_deg'])
+    if 'cols' in block:
+        counts = np.full(rows, block['cols'])
+    else:
+        counts = np.maximum((radius * abs(end - start) / arc['seat_spacing']).astype(int), 1)
+    r = np.repeat(np.arange(rows), counts)
+    # Position of each seat within its row, spread evenly between start and end angles
+    first = np.repeat(np.cumsum(counts) - counts, counts)
+    c = np.arange(len(r)) - first
+    frac = (c + 0.5) / np.repeat(counts, counts)
+    theta = start + (end - start) * frac
+    rad = radius[r]
+    w, h = block.get('size', DEFAULT_SIZE)
+    cx, cy = arc['center']
+    x = cx + rad * np.cos(theta) - w / 2
+    y = cy + rad * np.sin(theta) - h / 2
+    angle = np.degrees(theta) + 90
+    return r, c, x, y, angle
+
+
+def compile_layout(spec):
+    ids, types = [], []
+    columns = [[] for _ in range(6)]
+    for block in spec['blocks']:
+        if 'seats' in block:
+            seats = block['seats']
+            ids += [s['id'] for s in seats]
+            types += [s.get('type', block.get('type', 'standard')) for s in seats]
+            default_w, default_h = block.get('size', DEFAULT_SIZE)
+            cols = (
+                [s['x'] for s in seats], [s['y'] for s in seats],
+                [s.get('w', default_w) for s in seats], [s.get('h', default_h) for s in seats],
+                [s.get('angle_deg', 0) for s in seats], [s.get('price', math.nan) for s in seats],
+            )
+            for col, values in zip(columns, cols):
+                col.append(np.asarray(values, dtype=np.float64))
+            continue
+        r, c, x, y, angle = _arc_block(block) if 'arc' in block else _grid_block(block)
+        n = len(r)
+        ids += _ids(block['id'], r + block.get('first_row', 1), c + block.get('first_col', 1))
+        types += [block.get('type', 'standard')] * n
+        w, h = block.get('size', DEFAULT_SIZE)
+        for col, values in zip(columns, (x, y, np.full(n, w), np.full(n, h), angle,
+                                         np.full(n, block.get('price', math.nan)))):
+            col.append(np.asarray(values, dtype=np.float64))
+    arrays = [np.concatenate(col) if col else np.empty(0) for col in columns]
+    return CompiledLayout(ids, types, *arrays, name=spec.get('name', ''))
+
+
+# Compiled layouts are cached next to their source as <name>.compiled.npz, keyed by the
+# source file's hash, so only the first load of an edited layout pays for compilation
+
+def _cache_path(path):
+    return f"{os.path.splitext(path)[0]}.compiled.npz"
+
+
+def load_layout(path, use_cache=True):
+    with open(path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha1(raw).hexdigest()
+    cache = _cache_path(path)
+    if use_cache and os.path.exists(cache):
+        try:
+            with np.load(cache, allow_pickle=False) as data:
+                if str(data['digest']) == digest:
+                    return CompiledLayout(data['ids'].tolist(), data['types'].tolist(), data['x'], data['y'],
+                                          data['w'], data['h'], data['angle'], data['price'], str(data['name']))
+        except (OSError, KeyError, ValueError):
+            pass  # unreadable cache: recompile and overwrite it
+    layout = compile_layout(json.loads(raw))
+    if use_cache:
+        tmp = f"{cache}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, digest=digest, name=layout.name, ids=np.array(layout.ids), types=np.array(layout.types),
+                 x=layout.x, y=layout.y, w=layout.w, h=layout.h, angle=layout.angle, price=layout.price)
+        os.replace(tmp, cache)
+    return layout
+
+
+def write_layout(path, n, cols=100):
+    """Write a synthetic grid layout of n seats, as used by the benchmarks and load generator."""
+    # Full rows split evenly between the three seat types, then one partial row
+    full, rest = divmod(n, cols)
+    blocks = []
+    for k, seat_type in enumerate(['premium', 'standard', 'value']):
+        first, last = full * k // 3, full * (k + 1) // 3
+        if last > first:
+            blocks.append({'id': 'R{r}_{c}', 'type': seat_type, 'rows': last - first, 'cols': cols,
+                           'first_row': first + 1, 'origin': [0, first * 30],
+                           'col_step': [22, 0], 'row_step': [0, 30]})
+    if rest:
+        blocks.append({'id': 'R{r}_{c}', 'type': 'value', 'rows': 1, 'cols': rest,
+                       'first_row': full + 1, 'origin': [0, full * 30], 'col_step': [22, 0]})
+    with open(path, 'w') as f:
+        json.dump({'name': f'{n} seats', 'blocks': blocks}, f)
+    # Compile once up front so later loads read the cached arrays
+    load_layout(path)
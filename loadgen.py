@@ -0,0 +1,213 @@
+"""Seeded synthetic load for the radar store and the cinema booking path.
+
+    python3 loadgen.py radar --cars 10000 --readings 200 --db radar.db      # 2M readings into SQLite
+    python3 loadgen.py radar --cars 1000 --alerts --report fleet.jsonl
+    python3 loadgen.py bookings --events 1000000 --out events.journal       # BookingJournal lines
+    python3 loadgen.py bookings --events 1000000 --seats 100000 --apply --journal bookings.journal --snapshot bookings.bin
+
+Work is cut into fixed-size chunks that a process pool generates in parallel. Each chunk
+draws from its own generators seeded with (seed, chunk number) and results are consumed in
+chunk order, so a given --seed always produces the same data whatever --workers is.
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import datetime
+from itertools import count
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from radar_system import generate_random_car, generate_random_radar
+
+START_NS = 1_700_000_000 * 10**9  # 2023-11-14, so generated data never depends on the clock
+
+
+def _rngs(seed, chunk):
+    return random.Random(f"{seed}:{chunk}"), np.random.default_rng([seed, chunk])
+
+
+def _chunks(total, size):
+    return [(k, k * size, min(size, total - k * size)) for k in range((total + size - 1) // size)]
+
+
+def _run(worker, jobs, workers):
+    """Results of worker(*job) in job order, from a process pool unless workers is 1."""
+    if workers == 1:
+        for job in jobs:
+            yield worker(*job)
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        yield from pool.map(worker, *zip(*jobs))
+
+
+# Radar fleets
+def synth_readings(nrng, n, start_ns=START_NS, interval_ns=10**8):
+    """(distances, speeds, timestamps) for n readings taken about every interval_ns."""
+    timestamps = start_ns + np.cumsum(nrng.exponential(interval_ns, n).astype(np.int64) + 1)
+    speeds = np.round(np.clip(nrng.normal(90, 20, n), 0, None), 1)
+    distances = np.round(nrng.gamma(4.0, 10.0, n), 1)
+    return distances, speeds, timestamps
+
+
+def fleet_chunk(seed, chunk, first_car, cars, radars_per_car=1, readings=1000, interval_ns=10**8):
+    """Cars first_car.. with their radars and reading histories; ids are unique across chunks."""
+    rng, nrng = _rngs(seed, chunk)
+    car_ids = count(first_car)
+    radar_ids = count(first_car * radars_per_car)
+    now = datetime.datetime.fromtimestamp(START_NS // 10**9)
+    fleet = []
+    for _ in range(cars):
+        car = generate_random_car(rng, car_ids)
+        for _ in range(radars_per_car):
+            radar = generate_random_radar(car, rng, radar_ids, now=now)
+            start_ns = START_NS + int(nrng.integers(0, 3600 * 10**9))
+            radar.add_readings(*synth_readings(nrng, readings, start_ns, interval_ns))
+        fleet.append(car)
+    return fleet
+
+
+def generate_fleet(cars, radars_per_car=1, readings=1000, seed=0, workers=None, chunk_size=500,
+                   interval_ns=10**8):
+    """Yield the fleet chunk by chunk as lists of cars."""
+    jobs = [(seed, k, first, n, radars_per_car, readings, interval_ns)
+            for k, first, n in _chunks(cars, chunk_size)]
+    yield from _run(fleet_chunk, jobs, workers)
+
+
+# Cinema bookings
+def booking_chunk(seed, chunk, seats, events, book_ratio=0.8, hot=0.2):
+    """(seat indices, booked flags) for one chunk of book/reset events.
+
+    Half of the events go to the first `hot` fraction of seats, so popular seats see
+    repeated book/reset traffic the way a busy showtime does.
+    """
+    _, nrng = _rngs(seed, chunk)
+    hot_seats = max(1, int(seats * hot))
+    indices = np.where(nrng.random(events) < 0.5,
+                       nrng.integers(0, hot_seats, events), nrng.integers(0, seats, events))
+    return indices.astype(np.int32), nrng.random(events) < book_ratio
+
+
+def generate_bookings(seats, events, seed=0, workers=None, chunk_size=100000, book_ratio=0.8):
+    """Yield (indices, booked) arrays chunk by chunk."""
+    jobs = [(seed, k, seats, n, book_ratio) for k, _, n in _chunks(events, chunk_size)]
+    yield from _run(booking_chunk, jobs, workers)
+
+
+def write_events(path, seat_ids, chunks):
+    # Same line format as BookingJournal, so the file can be replayed as a journal
+    n = 0
+    with open(path, 'w') as f:
+        for indices, booked in chunks:
+            f.writelines(json.dumps({'seat_id': seat_ids[i], 'booked': b}) + '\n'
+                         for i, b in zip(indices.tolist(), booked.tolist()))
+            n += len(indices)
+    return n
+
+
+def apply_events(screen, chunks):
+    """Feed events through CinemaScreen.apply_bookings, so journal and listeners see every change."""
+    n = 0
+    with screen.batch():
+        for indices, booked in chunks:
+            screen.apply_bookings(zip(indices.tolist(), booked.tolist()))
+            n += len(indices)
+    return n
+
+
+def _radar_main(args):
+    from radar_alerts import AlertEngine
+    from radar_system import SystemReport
+    db = None
+    if args.db:
+        from radar_db import RadarDatabase
+        db = RadarDatabase(args.db)
+    engine = AlertEngine() if args.alerts else None
+    fleet, alerts = [], 0
+    for cars in generate_fleet(args.cars, args.radars, args.readings, args.seed, args.workers, args.chunk):
+        if engine is not None:
+            alerts += len(engine.evaluate([r for car in cars for r in car.radar_systems]))
+        if db is not None:
+            db.save_fleet(cars)
+        if args.report:
+            fleet += cars
+    if db is not None:
+        db.close()
+    if args.report:
+        SystemReport(*fleet).generate_report(args.report, fmt='jsonl' if args.report.endswith('.jsonl') else 'text')
+    return f"{args.cars * args.radars * args.readings} readings on {args.cars * args.radars} radars, {alerts} alerts"
+
+
+def _bookings_main(args):
+    from booking_journal import BookingJournal
+    from layout import SEAT_COLORS, load_layout
+    from main import MAIN_HALL, CinemaScreen
+    screen = CinemaScreen(None, SEAT_COLORS, lambda: None)
+    if args.seats:
+        from layout import write_layout
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'grid.json')
+            write_layout(path, args.seats)
+            screen.load_layout(load_layout(path))
+    else:
+        screen.load_layout(load_layout(args.layout or MAIN_HALL))
+    seat_map = screen.seat_map
+    chunks = generate_bookings(len(seat_map), args.events, args.seed, args.workers, args.chunk)
+    if args.out:
+        seat_ids = [seat_map.seat_id(i) for i in range(len(seat_map))]
+        n = write_events(args.out, seat_ids, chunks)
+        return f"{n} events on {len(seat_map)} seats written to {args.out}"
+    journal = BookingJournal(args.journal, snapshot=f"{args.journal}.json") if args.journal else None
+    if journal is not None:
+        screen.attach_journal(journal)
+    n = apply_events(screen, chunks)
+    if journal is not None:
+        journal.close()
+    if args.snapshot:
+        screen.save_bookings(args.snapshot)
+    return f"{n} events on {len(seat_map)} seats, {seat_map.booked_count()} booked"
+
+
+def _main():
+    parser = argparse.ArgumentParser(description='Generate reproducible synthetic load.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, help='processes (default: one per CPU; 1 runs in-process)')
+    sub = parser.add_subparsers(dest='kind', required=True)
+    radar = sub.add_parser('radar', help='cars with radars and reading histories')
+    radar.add_argument('--cars', type=int, default=1000)
+    radar.add_argument('--radars', type=int, default=1, help='radars per car')
+    radar.add_argument('--readings', type=int, default=1000, help='readings per radar')
+    radar.add_argument('--chunk', type=int, default=500, help='cars per chunk')
+    radar.add_argument('--alerts', action='store_true', help='run AlertEngine over the readings')
+    radar.add_argument('--db', help='save into a RadarDatabase at this path')
+    radar.add_argument('--report', help='write a SystemReport (.jsonl for JSON Lines)')
+    bookings = sub.add_parser('bookings', help='book/reset events against a CinemaScreen')
+    bookings.add_argument('--events', type=int, default=100000)
+    bookings.add_argument('--layout', help='layout file (default: the main hall)')
+    bookings.add_argument('--seats', type=int, help='use a generated grid of this many seats instead of a layout')
+    bookings.add_argument('--chunk', type=int, default=100000, help='events per chunk')
+    bookings.add_argument('--out', help='write the events as journal lines instead of applying them')
+    bookings.add_argument('--journal', help='with --apply, log changes to this BookingJournal')
+    bookings.add_argument('--snapshot', help='with --apply, save the final state (.bin for binary)')
+    bookings.add_argument('--apply', action='store_true', help='apply the events to a headless CinemaScreen')
+    args = parser.parse_args()
+    if args.kind == 'bookings':
+        if not (args.out or args.apply):
+            parser.error('bookings needs --out or --apply')
+        if args.out and args.apply:
+            parser.error('--out and --apply are mutually exclusive')
+        if (args.journal or args.snapshot) and not args.apply:
+            parser.error('--journal and --snapshot need --apply')
+
+    start = time.perf_counter()
+    summary = _radar_main(args) if args.kind == 'radar' else _bookings_main(args)
+    print(f"{summary} in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    _main()
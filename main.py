@@ -1,14 +1,34 @@
 # Part 1/12 - Khaled Nageh: Project Intro + Abstract Base Class (BaseSeat)
+import time
+_IMPORT_START = time.perf_counter()
+
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
 import tkinter as tk
-from tkinter import messagebox
-from PIL import Image, ImageTk
-import math
+from tkinter import filedialog, messagebox
 import json
 import os
+import weakref
+
+import numpy as np
+
+from booking_journal import BookingJournal, write_json_atomic
+from booking_snapshot import Snapshot, is_snapshot, write_snapshot
+from image_cache import cached_resize
+from layout import SEAT_COLORS, load_layout
+from row_index import RowIndex
+from sales_export import export_sales, format_row
+from timer_wheel import TimerWheel
+from viewport import SeatRenderer
+from seat_map import SeatMap, SeatSlot
 
 # Lecture 6: Abstract Base Class
 class BaseSeat(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def book(self, canvas):
         pass
@@ -16,24 +36,46 @@ class BaseSeat(ABC):
 # Part 2/12 - Omar Mohammed: Multiple Inheritance (Clickable, Highlightable, SpecialSeat)
 # Lecture 6: Multiple Inheritance
 class Clickable:
+    __slots__ = ()
+
     def click(self):
         print(f"Clicked on {self}")
 
 class Highlightable:
+    __slots__ = ()
+
     def highlight(self):
         print(f"Highlighted {self}")
 
 class SpecialSeat(Clickable, Highlightable, BaseSeat):
+    __slots__ = ('_seat',)
+
     def __init__(self, seat):
         self._seat = seat
 
     def book(self, canvas):
         self._seat.book(canvas)
 
+class _Detached:
+    # Storage of a disposed or cleared seat view: any use fails loudly instead of on None
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        raise RuntimeError("seat view detached")
+
+
+_DETACHED = _Detached()
+
 # Part 3/12 - mohamed mahmoud: Seat class (attributes + constructor)
 # Lecture 1–4: Core Class with Static Members, Constructors, Encapsulation
 class Seat(BaseSeat):
+    # No per-instance __dict__: a large venue can hold many seat views at once
+    __slots__ = ('_map', '_index', 'color', 'update_callback', '_shape', '__weakref__')
     _count = 0
+    TAG = 'standalone_seat'
+    # Standalone seats drawn on each canvas, by seat id, so a canvas needs only one shared
+    # click binding. A drawn seat stays registered (and clickable) until dispose(canvas).
+    _drawn = weakref.WeakKeyDictionary()
     PRICES = {
         "premium": 25.0,
         "standard": 18.0,
@@ -43,104 +85,173 @@ class Seat(BaseSeat):
         "handicap": 15.0,
     }
 
-    def __init__(self, canvas, seat_id, x, y, seat_type, color, update_callback, w=20, h=15, angle_deg=0, price=None):
-        self.__seat_id = seat_id
-        self.__x, self.__y = x, y
-        self.__booked = False
-        self.seat_type = seat_type
+    # A Seat is a view over one slot of a SeatMap; standalone seats keep their state in a SeatSlot
+    def __init__(self, canvas, seat_id, x, y, seat_type, color, update_callback, w=20, h=15, angle_deg=0, price=None,
+                 seat_map=None):
+        price = price if price is not None else Seat.PRICES.get(seat_type, 0)
+        if seat_map is None:
+            self._map = SeatSlot(seat_id, x, y, seat_type, w, h, angle_deg, price)
+            self._index = 0
+        else:
+            self._map = seat_map
+            self._index = seat_map.add(seat_id, x, y, seat_type, w, h, angle_deg, price)
         self.color = color
-        self.__price = price if price is not None else Seat.PRICES.get(seat_type, 0)
         self.update_callback = update_callback
-        self.w, self.h = w, h
-        self.angle_deg = angle_deg
+        self._shape = None
 
         Seat._count += 1
-        self.draw(canvas)
+        if canvas is not None:
+            self.draw(canvas)
 
-# Part 4/12 - Mohamed Ashraf : Factory Constructor + Destructor
+    # A view onto an existing slot; CinemaScreen draws and hit-tests attached views itself
     @classmethod
-    def from_dict(cls, data, canvas, seat_colors, update_callback):
+    def attach(cls, seat_map, index, color, update_callback):
+        s = cls.__new__(cls)
+        s._map = seat_map
+        s._index = index
+        s.color = color
+        s.update_callback = update_callback
+        s._shape = None
+        return s
+
+# Part 4/12 - Mohamed Ashraf : Factory Constructor + explicit dispose()
+    @classmethod
+    def from_dict(cls, data, canvas, seat_colors, update_callback, seat_map=None):
         st = data.get('seat_type', 'standard')
         color = seat_colors.get(st, 'gray')
         s = cls(canvas, data['seat_id'], data.get('x', 0), data.get('y', 0), st, color, update_callback,
-                data.get('w', 20), data.get('h', 15), data.get('angle_deg', 0), data.get('price'))
+                data.get('w', 20), data.get('h', 15), data.get('angle_deg', 0), data.get('price'), seat_map)
         if data.get('booked'):
             s.book(canvas)
         return s
 
-    def __del__(self):
-        print(f"Seat {self.__seat_id} destroyed")
+    # Seats have no finaliser; dispose() releases a seat's canvas items, and a standalone seat's
+    # place in the count (a slot in a SeatMap stays counted until the map is cleared)
+    def dispose(self, canvas=None):
+        if canvas is not None and self._shape is not None:
+            Seat._drawn.get(canvas, {}).pop(self.seat_id, None)
+            canvas.delete(self.seat_id)
+            self._shape = None
+        if isinstance(self._map, SeatSlot):
+            self._map = _DETACHED
+            Seat._count -= 1
 
 # Part 5/12 - Yaseen ashraf: Properties + Encapsulation
     @property
-    def seat_id(self): return self.__seat_id
+    def seat_id(self): return self._map.seat_id(self._index)
+
+    @property
+    def index(self): return self._index
+
+    @property
+    def seat_type(self): return self._map.seat_type(self._index)
+
+    @property
+    def x(self): return self._map.geometry(self._index)[0]
 
     @property
-    def booked(self): return self.__booked
+    def y(self): return self._map.geometry(self._index)[1]
+
+    @property
+    def w(self): return self._map.geometry(self._index)[2]
+
+    @property
+    def h(self): return self._map.geometry(self._index)[3]
+
+    @property
+    def angle_deg(self): return self._map.geometry(self._index)[4]
+
+    @property
+    def booked(self): return self._map.is_booked(self._index)
 
     @booked.setter
     def booked(self, val):
         if not isinstance(val, bool):
             raise ValueError("Booked flag must be a boolean")
-        self.__booked = val
+        self._map.set_booked(self._index, val)
+
+    @property
+    def held(self): return self._map.is_held(self._index)
 
     @property
-    def price(self): return self.__price
+    def price(self): return self._map.price(self._index)
 
     @price.setter
     def price(self, val):
-        if val < 0:
-            raise ValueError("Price must be non-negative")
-        self.__price = val
+        self._map.set_price(self._index, val)
 
 # Part 6/12 - AlamElhoda Elbeltagy: Static members + Static method
+    # Counts seat slots (standalone seats plus every seat on a CinemaScreen), not view objects:
+    # a screen only builds Seat views on demand
     @staticmethod
     def total_seats():
         return Seat._count
 
 # Part 7/12 - Moaz Abu lailla: draw() + on_click()
     def draw(self, canvas):
-        angle = math.radians(self.angle_deg)
-        cx, cy = self.__x + self.w / 2, self.__y + self.h / 2
-        coords = []
-        for dx, dy in [(-self.w/2, -self.h/2), (self.w/2, -self.h/2),
-                       (self.w/2, self.h/2), (-self.w/2, self.h/2)]:
-            rx = cx + dx * math.cos(angle) - dy * math.sin(angle)
-            ry = cy + dx * math.sin(angle) + dy * math.cos(angle)
-            coords.extend((rx, ry))
-        fill = self.color if not self.__booked else "red"
-        self._shape = canvas.create_polygon(coords, fill=fill, outline="black", tags=self.__seat_id)
-        canvas.create_text(cx, cy, text=self.__seat_id, font=("Arial", 8), tags=self.__seat_id)
-        canvas.tag_bind(self.__seat_id, "<Button-1>", lambda e: self.on_click(canvas))
+        seat_id = self.seat_id
+        x, y, w, h, _ = self._map.geometry(self._index)
+        coords = self._map.polygon(self._index)
+        fill = self.color if not self.booked else "red"
+        self._shape = canvas.create_polygon(coords, fill=fill, outline="black", tags=(Seat.TAG, seat_id))
+        canvas.create_text(x + w / 2, y + h / 2, text=seat_id, font=("Arial", 8), tags=(Seat.TAG, seat_id))
+        drawn = Seat._drawn.get(canvas)
+        if drawn is None:
+            drawn = Seat._drawn[canvas] = {}
+            canvas.tag_bind(Seat.TAG, "<Button-1>", Seat._clicked)
+        drawn[seat_id] = self
+
+    @staticmethod
+    def _clicked(event):
+        canvas = event.widget
+        drawn = Seat._drawn.get(canvas, {})
+        for tag in canvas.gettags('current'):
+            seat = drawn.get(tag)
+            if seat is not None:
+                seat.on_click(canvas)
+                return
 
     def on_click(self, canvas):
-        if self.__booked:
-            messagebox.showinfo("Already Booked", f"Seat {self.__seat_id} is already booked.")
+        if self.booked:
+            messagebox.showinfo("Already Booked", f"Seat {self.seat_id} is already booked.")
+        elif self.held:
+            messagebox.showinfo("On Hold", f"Seat {self.seat_id} is on hold for another customer.")
         else:
-            if messagebox.askyesno("Book Seat", f"Book seat {self.__seat_id} for ${self.__price:.2f}?"):
+            # Hold the seat while the customer decides, so nobody else can take it meanwhile
+            self.hold(canvas)
+            if messagebox.askyesno("Book Seat", f"Book seat {self.seat_id} for ${self.price:.2f}?"):
                 self.book(canvas)
+            else:
+                self.release(canvas)
+
+    def paint(self, canvas):
+        if canvas is not None and self._shape is not None:
+            fill = "red" if self.booked else "orange" if self.held else self.color
+            canvas.itemconfig(self._shape, fill=fill)
 
 # Part 8/12 - Abdelrahman Bayoumi: book(), reset(), to_dict(), load_state
     def book(self, canvas):
-        self.__booked = True
-        canvas.itemconfig(self._shape, fill="red")
+        self._map.set_booked(self._index, True)
+        self.paint(canvas)
         self.update_callback()
 
     def reset(self, canvas):
-        self.__booked = False
-        canvas.itemconfig(self._shape, fill=self.color)
+        self._map.set_booked(self._index, False)
+        self.paint(canvas)
+        self.update_callback()
+
+    def hold(self, canvas):
+        self._map.set_held(self._index, True)
+        self.paint(canvas)
+        self.update_callback()
+
+    def release(self, canvas):
+        self._map.set_held(self._index, False)
+        self.paint(canvas)
         self.update_callback()
 
     def to_dict(self):
-        return {
-            'seat_id': self.__seat_id,
-            'booked': self.__booked,
-            'seat_type': self.seat_type,
-            'x': self.__x, 'y': self.__y,
-            'w': self.w, 'h': self.h,
-            'angle_deg': self.angle_deg,
-            'price': self.__price
-        }
+        return self._map.to_dict(self._index)
 
     def load_state(self, state, canvas):
         if state.get('booked'):
@@ -154,66 +265,513 @@ class Seat(BaseSeat):
 
 # Part 10/12 - Mohannad: Inheritance (PremiumSeat, StandardSeat, ValueSeat)
 class PremiumSeat(Seat):
+    __slots__ = ()
+
     def get_price(self):
         return super().price * 1.5
 
 class StandardSeat(Seat):
+    __slots__ = ()
+
     def get_price(self):
         return super().price
 
 class ValueSeat(Seat):
+    __slots__ = ()
+
     def get_price(self):
         return super().price * 0.8
 
 # Part 11/12 - Mohamed Elkassas: CinemaScreen class
+class SeatViews(Sequence):
+    # Lazily materialised Seat views, so a headless screen only builds the objects it is asked for
+    def __init__(self, screen):
+        self._screen = screen
+
+    def __len__(self):
+        return len(self._screen.seat_map)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._screen.view(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self._screen.view(i)
+
+
 class CinemaScreen:
+    HOLD_TTL = 300  # seconds a hold lasts unless confirmed or released
+
+    # canvas may be None: the screen then runs headless on its SeatMap alone
     def __init__(self, canvas, seat_colors, update_callback):
         self.canvas = canvas
         self.seat_colors = seat_colors
         self.update_callback = update_callback
-        self.seats = []
+        self.seat_map = SeatMap()
+        self._views = {}
+        self._batch_depth = 0
+        self._pending = False
+        self._drag_start = None
+        self._drag_rect = None
+        self.journal = None
+        self._replaying = False
+        self._rows = None
+        self.focus = None
+        self.pricing = None
+        self.clock = time.monotonic
+        self._holds = None
+        self.renderer = None
+        self.seat_map.subscribe_holds(self._hold_changed)
+        if canvas is not None:
+            # Only seats inside the viewport get canvas items (see viewport.SeatRenderer)
+            self.renderer = SeatRenderer(canvas, self.seat_map, self._fill)
+            self.seat_map.subscribe(self._repaint)
+            self.seat_map.subscribe_holds(self._repaint)
+            canvas.bind("<ButtonPress-1>", self._on_press)
+            canvas.bind("<B1-Motion>", self._on_drag)
+            canvas.bind("<ButtonRelease-1>", self._on_release)
+
+    @property
+    def seats(self):
+        return SeatViews(self)
+
+    def view(self, i):
+        s = self._views.get(i)
+        if s is None:
+            color = self.seat_colors.get(self.seat_map.seat_type(i), 'gray')
+            s = self._views[i] = Seat.attach(self.seat_map, i, color, self._notify)
+        return s
+
+    def _fill(self, i):
+        if self.seat_map.is_booked(i):
+            return "red"
+        if self.seat_map.is_held(i):
+            return "orange"
+        return self.seat_colors.get(self.seat_map.seat_type(i), 'gray')
+
+    def _repaint(self, i, _flag):
+        self.renderer.repaint(i)
+
+    def seat(self, seat_id):
+        return self.view(self.seat_map.index(seat_id))
+
+    def clear(self):
+        """Remove every seat, e.g. before loading another showtime's layout.
+
+        Canvas items go in one delete per tag, seat views are dropped, and the SeatMap keeps
+        its subscribers (journal, pricing, renderer) so the screen can be rebuilt in place.
+        Views handed out before are detached, so they cannot alias seats loaded later.
+        """
+        if self.renderer is not None:
+            self.renderer.clear()
+        Seat._count -= len(self.seat_map)
+        for view in self._views.values():
+            view._map = _DETACHED
+        self._views.clear()
+        self._layout_changed()
+        self._holds = None
+        self.seat_map.clear()
+        if self.pricing is not None:
+            self.pricing.forget_seats()
+        self._notify()
+
+    def _layout_changed(self):
+        if self._rows is not None:
+            self._rows.close()
+            self._rows = None
 
     def add_seat(self, seat_id, x, y, seat_type, w=20, h=15, angle_deg=0):
-        color = self.seat_colors.get(seat_type, 'gray')
-        s = Seat(self.canvas, seat_id, x, y, seat_type, color, self.update_callback, w, h, angle_deg)
-        self.seats.append(s)
+        self._layout_changed()
+        i = self.seat_map.add(seat_id, x, y, seat_type, w, h, angle_deg, Seat.PRICES.get(seat_type, 0))
+        Seat._count += 1
+        if self.pricing is not None:
+            self.pricing.price_new_seats()
+        if self.renderer is not None:
+            self.renderer.add(i)
+        return i
+
+    def load_layout(self, layout):
+        # Bulk path for a layout.CompiledLayout: one SeatMap.extend, then draw whatever is in view
+        self._layout_changed()
+        prices = layout.price
+        missing = np.isnan(prices)
+        if missing.any():
+            defaults = {t: Seat.PRICES.get(t, 0) for t in set(layout.types)}
+            prices = np.where(missing, np.fromiter(map(defaults.__getitem__, layout.types), float, len(prices)), prices)
+        prices = prices.tolist()
+        start = self.seat_map.extend(layout.ids, layout.types, layout.x.tolist(), layout.y.tolist(),
+                                     layout.w.tolist(), layout.h.tolist(), layout.angle.tolist(), prices,
+                                     polygons=layout.polygons)
+        Seat._count += len(self.seat_map) - start
+        if self.pricing is not None:
+            self.pricing.price_new_seats()
+        if self.renderer is not None:
+            self.renderer.render()
+        return start
+
+    # Zoom and pan, in canvas pixels
+    def zoom(self, factor, cx, cy):
+        self.renderer.zoom(factor, cx, cy)
+
+    def pan(self, dx, dy):
+        self.renderer.pan(dx, dy)
+
+    def resize(self, width, height):
+        self.renderer.resize(width, height)
+
+
+    # Hit testing: one canvas-level handler resolved through the SeatMap spatial index
+    def seat_at(self, x, y):
+        i = self.seat_map.seat_at(x, y)
+        return None if i is None else self.view(i)
+
+    def seats_in_rect(self, x0, y0, x1, y1):
+        return [self.view(i) for i in self.seat_map.seats_in_rect(x0, y0, x1, y1)]
+
+    def _on_press(self, event):
+        self._drag_start = (self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+
+    def _on_drag(self, event):
+        # The rubber band is drawn in canvas coordinates; the query converts to world ones
+        if self._drag_start is None:
+            return
+        x0, y0 = self._drag_start
+        x1, y1 = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+        if self._drag_rect is None:
+            self._drag_rect = self.canvas.create_rectangle(x0, y0, x1, y1, outline="blue", dash=(4, 2))
+        else:
+            self.canvas.coords(self._drag_rect, x0, y0, x1, y1)
+
+    def _on_release(self, event):
+        if self._drag_start is None:
+            return
+        x0, y0 = self._drag_start
+        x1, y1 = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+        self._drag_start = None
+        if self._drag_rect is not None:
+            self.canvas.delete(self._drag_rect)
+            self._drag_rect = None
+        to_world = self.renderer.viewport.to_world
+        if abs(x1 - x0) < 4 and abs(y1 - y0) < 4:
+            s = self.seat_at(*to_world(x0, y0))
+            if s is not None:
+                s.on_click(self.canvas)
+        else:
+            self.book_rect(*to_world(x0, y0), *to_world(x1, y1))
+
+    def book_rect(self, x0, y0, x1, y1):
+        # Seats other customers are holding are not free, even though booking would convert the hold
+        free = [i for i in self.seat_map.seats_in_rect(x0, y0, x1, y1) if self.seat_map.is_available(i)]
+        if not free:
+            return
+        total = sum(self.seat_map.price(i) for i in free)
+        if messagebox.askyesno("Book Seats", f"Book {len(free)} seats for ${total:.2f}?"):
+            with self.batch():
+                for i in free:
+                    # Holds may have been placed while the dialog was open
+                    if self.seat_map.is_available(i):
+                        self._set_booked(i, True)
+
+    # Best available: focus is the (x, y) point blocks are scored against, default the hall centre
+    def find_best_available(self, n, seat_type=None, book=True):
+        if self._rows is None:
+            self._rows = RowIndex(self.seat_map)
+        block = self._rows.find(n, seat_type, self.focus)
+        if block is None:
+            return None
+        if book:
+            with self.batch():
+                for i in block:
+                    self._set_booked(i, True)
+        return [self.seat_map.seat_id(i) for i in block]
+
+    # Change notifications: inside batch() they are held back and coalesced into one call
+    @contextmanager
+    def batch(self):
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._pending:
+                self._pending = False
+                self.update_callback()
+
+    def _notify(self):
+        if self._batch_depth:
+            self._pending = True
+        else:
+            self.update_callback()
+
+    def _set_booked(self, i, flag):
+        changed = self.seat_map.set_booked(i, flag)
+        self._notify()
+        return changed
+
+    # Holds expire through a timing wheel, so expiry never scans the seats
+    def hold(self, seat_id, ttl=None):
+        ttl = ttl if ttl is not None else self.HOLD_TTL
+        if not ttl > 0:
+            raise ValueError("Hold TTL must be positive")
+        i = self.seat_map.index(seat_id)
+        if not self.seat_map.set_held(i, True):
+            return False
+        if self._holds is None:
+            self._holds = TimerWheel(now=self.clock())
+        if not self._holds.schedule(i, self.clock() + ttl):
+            # Already due on the wheel (the clock went backwards): a hold that never expires is worse
+            self.seat_map.set_held(i, False)
+            return False
+        self._notify()
+        return True
+
+    def _hold_changed(self, i, held):
+        # A hold can also end by being booked (set_booked converts it) or by reset_all; drop
+        # its wheel entry then too, or it would later cut short a new hold on the same seat
+        if not held and self._holds is not None:
+            self._holds.cancel(i)
+
+    def release_hold(self, seat_id):
+        i = self.seat_map.index(seat_id)
+        if self._holds is not None:
+            self._holds.cancel(i)
+        if not self.seat_map.set_held(i, False):
+            return False
+        self._notify()
+        return True
+
+    def confirm_hold(self, seat_id):
+        i = self.seat_map.index(seat_id)
+        if not self.seat_map.is_held(i):
+            return False
+        if self._holds is not None:
+            self._holds.cancel(i)
+        self._set_booked(i, True)
+        return True
+
+    def expire_holds(self, now=None):
+        if self._holds is None:
+            return []
+        released = []
+        with self.batch():
+            for i in self._holds.advance(self.clock() if now is None else now):
+                if self.seat_map.set_held(i, False):
+                    self._notify()
+                    released.append(self.seat_map.seat_id(i))
+        return released
+
+    def get_held_total(self):
+        return self.seat_map.held_total
+
+    def apply_bookings(self, pairs):
+        """Set booked flags from (index, booked) pairs in one batch; returns how many seats changed."""
+        n = 0
+        with self.batch():
+            for i, flag in pairs:
+                n += self._set_booked(i, flag)
+        return n
 
     def book_all(self):
-        for s in self.seats:
-            s.book(self.canvas)
+        with self.batch():
+            for i in range(len(self.seat_map)):
+                self._set_booked(i, True)
 
     def reset_all(self):
-        for s in self.seats:
-            s.reset(self.canvas)
+        with self.batch():
+            for i in list(self.seat_map.held_indices()):
+                self.seat_map.set_held(i, False)
+            self._holds = None
+            for i in range(len(self.seat_map)):
+                self._set_booked(i, False)
 
     def get_summary(self):
-        booked = [s for s in self.seats if s.booked]
-        lines, total = [], 0
-        for s in booked:
-            price = s.get_price() if hasattr(s, 'get_price') else s.price
-            lines.append(f"{s.seat_id}: ${price:.2f}")
-            total += price
-        return "\n".join(lines), total
-
+        lines = [f"{self.seat_map.seat_id(i)}: ${self.seat_map.price(i):.2f}"
+                 for i in self.seat_map.booked_indices()]
+        return "\n".join(lines), self.seat_map.booked_total
+
+    # Streaming summary: rows are built only as they are consumed, from one compact index array
+    def _booked_by_type(self):
+        # Booked indices grouped by type code in one pass, plus where each type's group starts
+        seat_map = self.seat_map
+        n = len(seat_map)
+        booked = np.unpackbits(np.frombuffer(seat_map.booked_bits(), dtype=np.uint8), bitorder='little')[:n]
+        indices = np.flatnonzero(booked)
+        codes = np.frombuffer(seat_map.type_column(), dtype=np.uint8)[indices]
+        order = np.argsort(codes, kind='stable')
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=len(seat_map.seat_types)))))
+        return indices[order], bounds.tolist()
+
+    def iter_booked(self, seat_type=None):
+        grouped, bounds = self._booked_by_type()
+        if seat_type is not None:
+            if seat_type not in self.seat_map.seat_types:
+                return
+            code = self.seat_map.seat_types.index(seat_type)
+            grouped = grouped[bounds[code]:bounds[code + 1]]
+        yield from grouped.tolist()
+
+    def iter_summary(self, start=0):
+        """Booked seats grouped by type, a subtotal after each group, then the grand total.
+
+        Rows before `start` are skipped using the per-type counts, without being built.
+        """
+        seat_map = self.seat_map
+        counts, totals = seat_map.type_counts(), seat_map.type_totals()
+        grouped, bounds = self._booked_by_type()
+        for code, t in enumerate(seat_map.seat_types):
+            if not counts[t]:
+                continue
+            # A group is its seats plus the subtotal row
+            if start > counts[t]:
+                start -= counts[t] + 1
+                continue
+            for i in grouped[bounds[code] + start:bounds[code + 1]].tolist():
+                yield {'kind': 'seat', 'seat_type': t, 'seat_id': seat_map.seat_id(i), 'price': seat_map.price(i)}
+            start = 0
+            yield {'kind': 'subtotal', 'seat_type': t, 'count': counts[t], 'amount': totals[t]}
+        if start == 0:
+            yield {'kind': 'total', 'count': seat_map.booked_count(), 'amount': seat_map.booked_total}
+
+    def summary_length(self):
+        counts = self.seat_map.type_counts().values()
+        return sum(counts) + sum(1 for c in counts if c) + 1
+
+    def export_sales(self, filename):
+        return export_sales(self, filename)
+
+    # Files ending in .bin use the compact binary snapshot format (see booking_snapshot)
     def save_bookings(self, filename='bookings.json'):
-        with open(filename, 'w') as f:
-            json.dump([s.to_dict() for s in self.seats], f)
+        if filename.endswith('.bin'):
+            write_snapshot(filename, self.seat_map)
+        elif self.journal is not None and filename == self.journal.snapshot:
+            self.compact(background=False)
+        else:
+            write_json_atomic(filename, (self.seat_map.to_dict(i) for i in range(len(self.seat_map))))
 
     def load_bookings(self, filename='bookings.json'):
-        if os.path.exists(filename):
-            with open(filename) as f:
-                state_map = {d['seat_id']: d for d in json.load(f)}
-                for s in self.seats:
-                    if s.seat_id in state_map:
-                        s.load_state(state_map[s.seat_id], self.canvas)
+        if is_snapshot(filename):
+            with Snapshot(filename) as snap, self.batch():
+                snap.check(self.seat_map)
+                for _ in self.seat_map.book_bits(snap.bits):
+                    self._notify()
+            return
+        # Loading the journal's own snapshot also replays the events logged since it was written
+        own = self.journal is not None and filename == self.journal.snapshot
+        self._replaying = own
+        try:
+            with self.batch():
+                if os.path.exists(filename):
+                    with open(filename) as f:
+                        for d in json.load(f):
+                            i = self.seat_map.get_index(d['seat_id'])
+                            if i is not None and d.get('booked'):
+                                self._set_booked(i, True)
+                if own:
+                    for seat_id, booked in self.journal.replay():
+                        i = self.seat_map.get_index(seat_id)
+                        if i is not None:
+                            self._set_booked(i, booked)
+        finally:
+            self._replaying = False
+
+    # Journal: every booked-flag change is appended as it happens and compacted periodically
+    def attach_journal(self, journal):
+        self.journal = journal
+        self.seat_map.subscribe(self._journal_event)
+
+    def _journal_event(self, i, booked):
+        if self._replaying:
+            return
+        self.journal.record(self.seat_map.seat_id(i), booked)
+        if self.journal.due(len(self.seat_map)):
+            self.compact()
+
+    def _snapshot_records(self, count, bits):
+        for i in range(count):
+            d = self.seat_map.to_dict(i)
+            d['booked'] = bool(bits[i >> 3] & (1 << (i & 7)))
+            yield d
+
+    def compact(self, background=True):
+        records = self._snapshot_records(len(self.seat_map), self.seat_map.booked_bits())
+        self.journal.compact(records, background)
+
+    # Dynamic pricing: the engine rewrites seat prices in place, so totals stay running sums
+    def attach_pricing(self, engine):
+        self.pricing = engine
+        engine.on_reprice = self._notify
 
     def get_total_price(self):
-        return sum((s.get_price() if hasattr(s, 'get_price') else s.price) for s in self.seats if s.booked)
+        return self.seat_map.booked_total
+
+    def get_type_counts(self):
+        return self.seat_map.type_counts()
+
+
+# The hall layout, shared by CinemaApp and headless users such as booking_service
+MAIN_HALL = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'layouts', 'main_hall.json')
+
+
+def build_main_hall(screen, path=MAIN_HALL):
+    screen.load_layout(load_layout(path))
+
+
+def enable_metrics(screen=None, environ=os.environ):
+    # CINEMA_METRICS=<file> (.json, else Prometheus text) and/or CINEMA_METRICS_PORT=<port> turn
+    # instrumentation on; otherwise nothing is wrapped and this returns None
+    path, port = environ.get('CINEMA_METRICS'), environ.get('CINEMA_METRICS_PORT')
+    if not (path or port):
+        return None
+    from metrics import Metrics, instrumented_by
+
+    # Already on: reuse that instance rather than wrapping the methods (and binding the port) again
+    metrics = instrumented_by(CinemaScreen.__dict__['_set_booked'])
+    if metrics is not None:
+        if screen is not None:
+            metrics.watch(screen, 'update_callback')
+        return metrics
+    metrics = Metrics(path=path)
+    metrics.instrument(Seat, 'book', 'reset', 'hold', 'release')
+    metrics.instrument(CinemaScreen, '_set_booked', 'book_all', 'reset_all', 'save_bookings', 'load_bookings',
+                       'compact', prefix='screen')
+    if screen is not None:
+        metrics.watch(screen, 'update_callback')
+    if port:
+        metrics.serve(int(port))
+    return metrics
+
+
+class StartupTimer:
+    # Wall-clock phases of startup; set CINEMA_STARTUP_REPORT=1 to print them
+    def __init__(self, start=None):
+        self._last = start if start is not None else time.perf_counter()
+        self.phases = []
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        self._last = now
+
+    def record(self, name, seconds):
+        self.phases.append((name, seconds))
+
+    def report(self):
+        lines = ["Startup timings:"]
+        lines += [f"  {name:<24}{seconds * 1000:8.1f} ms" for name, seconds in self.phases]
+        return "\n".join(lines)
+
 
 # Part 12/12 - Amr El Sayed: GUI Class (CinemaApp) + UI Layout + Buttons + Summary
 class CinemaApp:
-    def __init__(self, root):
+    BACKGROUND = 'seating_chart.jpg'
+    LAYOUT = MAIN_HALL
+    METRICS_INTERVAL = 10000  # ms between metrics file exports
+
+    def __init__(self, root, timer=None):
         self.root = root
+        self.timer = timer or StartupTimer()
         root.title("Cinema Seat Booking")
         # Start the window maximized for better visibility
         root.geometry("1280x720")
@@ -224,43 +782,145 @@ class CinemaApp:
 
         self.canvas = tk.Canvas(root, width=1280, height=720)
         self.canvas.pack()
-        img = Image.open('seating_chart.jpg').resize((1280, 720), Image.Resampling.LANCZOS)
-        self.bg = ImageTk.PhotoImage(img)
-        self.canvas.create_image(0, 0, anchor='nw', image=self.bg)
+        # The background is decoded and scaled (or fetched from the cache) off the GUI thread
+        # while the seats are laid out; it is slotted in underneath them once ready
+        self.bg = None
+        self._bg_item = None
+        self._bg_path = None
+        self._bg_source = None
+        self._bg_job = None
+        self._bg_zoomed = None
+        self._bg_started = time.perf_counter()
+        self._bg_pool = ThreadPoolExecutor(max_workers=1)
+        self._bg_future = self._bg_pool.submit(cached_resize, self.BACKGROUND, (1280, 720))
+        self.timer.mark('window setup')
 
         self.total_label = tk.Label(root, text='Total: $0.00', font=('Arial', 12, 'bold'), bg='white')
         self.total_label.place(x=20, y=10)
 
-        self.seat_colors = {
-            'premium': '#FFFD55', 'standard': 'purple', 'value': 'green',
-            'reserved': '#39107B', 'obstructed': 'maroon', 'handicap': '#a6ffae'
-        }
+        self.seat_colors = dict(SEAT_COLORS)
 
         self.screen = CinemaScreen(self.canvas, self.seat_colors, self.update_total)
+        self.metrics = enable_metrics(self.screen)
+        self.journal = BookingJournal()
+        self.screen.attach_journal(self.journal)
+        root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.draw_layout()
+        self.timer.mark('draw_layout')
         self.screen.load_bookings()
+        self.timer.mark('load_bookings')
         self.update_total()
         self.draw_legend()
+        self.root.after(1000, self.expire_holds)
+        if self.metrics is not None and self.metrics.path:
+            self.root.after(self.METRICS_INTERVAL, self.export_metrics)
+        self.root.after_idle(self._first_paint)
+        self.root.after(10, self._poll_background)
 
         tk.Button(root, text='🎟️ Book All', command=self.screen.book_all).place(x=1050, y=20)
         tk.Button(root, text='🔁 Reset All', command=self.screen.reset_all).place(x=1150, y=20)
         tk.Button(root, text='📂 Save', command=self.screen.save_bookings).place(x=1050, y=60)
         tk.Button(root, text='📂 Load', command=self.screen.load_bookings).place(x=1150, y=60)
-        tk.Button(root, text='📋 Summary', command=self.show_summary).place(x=1100, y=100)
+        tk.Button(root, text='📋 Summary', command=self.show_summary).place(x=1050, y=100)
+        tk.Button(root, text='📤 Export', command=self.export_sales).place(x=1150, y=100)
+
+        # Zoom with the mouse wheel or +/-, pan with the right mouse button or arrow keys, 0 resets
+        self.canvas.bind("<MouseWheel>", lambda e: self.zoom(1.25 if e.delta > 0 else 0.8, e.x, e.y))
+        self.canvas.bind("<Button-4>", lambda e: self.zoom(1.25, e.x, e.y))
+        self.canvas.bind("<Button-5>", lambda e: self.zoom(0.8, e.x, e.y))
+        self.canvas.bind("<ButtonPress-3>", self._start_pan)
+        self.canvas.bind("<B3-Motion>", self._drag_pan)
+        root.bind("<plus>", lambda e: self.zoom(1.25, 640, 360))
+        root.bind("<minus>", lambda e: self.zoom(0.8, 640, 360))
+        root.bind("<Left>", lambda e: self.pan(100, 0))
+        root.bind("<Right>", lambda e: self.pan(-100, 0))
+        root.bind("<Up>", lambda e: self.pan(0, 100))
+        root.bind("<Down>", lambda e: self.pan(0, -100))
+        root.bind("0", lambda e: self.reset_view())
+        self._pan_from = None
 
     def draw_layout(self):
-        for i in range(2):
-            self.screen.add_seat(f'VIP_{i+1}', 550 + i * 30, 580, 'reserved', w=24, h=18)
-        for i in range(6):
-            self.screen.add_seat(f'P1_{i+1}', 500 + i * 20, 300, 'premium')
-            self.screen.add_seat(f'P2_{i+1}', 700 - i * 20, 300, 'premium')
-        for r in range(2):
-            for c in range(8):
-                self.screen.add_seat(f'V{r+1}_{c+1}', 450 + c * 20, 350 + r * 30, 'value')
-                self.screen.add_seat(f'V{r+3}_{c+1}', 750 - c * 20, 350 + r * 30, 'value')
-        for r in range(3):
-            for c in range(10):
-                self.screen.add_seat(f'S{r+1}_{c+1}', 400 + c * 30, 500 + r * 30, 'standard')
+        build_main_hall(self.screen, self.LAYOUT)
+
+    def _first_paint(self):
+        self.timer.mark('first paint')
+
+    def _poll_background(self):
+        if not self._bg_future.done():
+            self.root.after(10, self._poll_background)
+            return
+        self._bg_pool.shutdown(wait=False)
+        try:
+            self._bg_path = self._bg_future.result()
+            self.bg = tk.PhotoImage(file=self._bg_path)
+        except (OSError, tk.TclError) as e:
+            print(f"Could not load background {self.BACKGROUND}: {e}")
+        else:
+            self._bg_item = self.canvas.create_image(0, 0, anchor='nw', image=self.bg)
+            self.canvas.tag_lower(self._bg_item)
+            self._view_changed()
+        self.timer.record('background (worker)', time.perf_counter() - self._bg_started)
+        if os.environ.get('CINEMA_STARTUP_REPORT'):
+            print(self.timer.report())
+
+    def zoom(self, factor, x, y):
+        scale = self.screen.renderer.viewport.scale * factor
+        if 0.05 <= scale <= 20:
+            self.screen.zoom(factor, x, y)
+            self._view_changed()
+
+    def pan(self, dx, dy):
+        self.screen.pan(dx, dy)
+        self._view_changed()
+
+    def reset_view(self):
+        vp = self.screen.renderer.viewport
+        self.screen.zoom(1 / vp.scale, 0, 0)
+        self.screen.pan(vp.ox * vp.scale, vp.oy * vp.scale)
+        self._view_changed()
+
+    def _start_pan(self, event):
+        self._pan_from = (event.x, event.y)
+
+    def _drag_pan(self, event):
+        if self._pan_from is not None:
+            self.pan(event.x - self._pan_from[0], event.y - self._pan_from[1])
+            self._pan_from = (event.x, event.y)
+
+    def _view_changed(self):
+        # The chart at scale 1 is the cached image moved into place; other zoom levels are
+        # cropped and scaled from it once the wheel has stopped turning
+        if self._bg_item is None:
+            return
+        vp = self.screen.renderer.viewport
+        if self._bg_job is not None:
+            self.root.after_cancel(self._bg_job)
+            self._bg_job = None
+        if abs(vp.scale - 1) < 1e-9:
+            self.canvas.itemconfigure(self._bg_item, image=self.bg, state='normal')
+            self.canvas.coords(self._bg_item, *vp.to_canvas(0, 0))
+        else:
+            self._bg_job = self.root.after(120, self._render_background)
+
+    def _render_background(self):
+        # PIL is only needed once the user zooms
+        from PIL import Image, ImageTk
+
+        self._bg_job = None
+        if self._bg_source is None:
+            self._bg_source = Image.open(self._bg_path)
+            self._bg_source.load()
+        vp = self.screen.renderer.viewport
+        x0, y0, x1, y1 = vp.world_rect()
+        x0, y0 = max(int(x0), 0), max(int(y0), 0)
+        x1, y1 = min(int(x1) + 1, self._bg_source.width), min(int(y1) + 1, self._bg_source.height)
+        if x1 <= x0 or y1 <= y0:
+            self.canvas.itemconfigure(self._bg_item, state='hidden')
+            return
+        size = (max(int((x1 - x0) * vp.scale), 1), max(int((y1 - y0) * vp.scale), 1))
+        self._bg_zoomed = ImageTk.PhotoImage(self._bg_source.crop((x0, y0, x1, y1)).resize(size, Image.Resampling.BILINEAR))
+        self.canvas.itemconfigure(self._bg_item, image=self._bg_zoomed, state='normal')
+        self.canvas.coords(self._bg_item, *vp.to_canvas(x0, y0))
 
     def draw_legend(self):
         x0, y0 = 20, 50
@@ -270,13 +930,67 @@ class CinemaApp:
 
     def update_total(self):
         total = self.screen.get_total_price()
-        self.total_label.config(text=f'Total: ${total:.2f}')
+        text = f'Total: ${total:.2f}'
+        if self.screen.seat_map.held_count:
+            text += f' (on hold: ${self.screen.get_held_total():.2f})'
+        self.total_label.config(text=text)
+
+    def expire_holds(self):
+        self.screen.expire_holds()
+        self.root.after(1000, self.expire_holds)
+
+    def export_metrics(self):
+        self.metrics.write()
+        self.root.after(self.METRICS_INTERVAL, self.export_metrics)
+
+    def on_close(self):
+        self.journal.close()
+        if self.metrics is not None and self.metrics.path:
+            self.metrics.write()
+        self.root.destroy()
 
     def show_summary(self):
-        summary, total = self.screen.get_summary()
-        messagebox.showinfo('Booking Summary', f"{summary}\n\nTotal: ${total:.2f}")
+        SummaryWindow(self.root, self.screen)
+
+    def export_sales(self):
+        filename = filedialog.asksaveasfilename(
+            title='Export Sales', defaultextension='.csv',
+            filetypes=[('CSV', '*.csv'), ('JSON Lines', '*.jsonl')])
+        if filename:
+            rows = self.screen.export_sales(filename)
+            messagebox.showinfo('Export Sales', f"Wrote {rows} rows to {filename}")
+
+
+class SummaryWindow:
+    # Lists one page of the streaming summary at a time; only the visible rows are ever built
+    def __init__(self, root, screen, page_size=40):
+        self.screen = screen
+        self.page_size = page_size
+        self.page = 0
+        self.top = tk.Toplevel(root)
+        self.top.title('Booking Summary')
+        self.listbox = tk.Listbox(self.top, width=44, height=page_size, font=('Courier', 10))
+        self.listbox.pack(fill='both', expand=True)
+        bar = tk.Frame(self.top)
+        bar.pack(fill='x')
+        tk.Button(bar, text='◀ Prev', command=lambda: self.show(self.page - 1)).pack(side='left')
+        self.label = tk.Label(bar)
+        self.label.pack(side='left', expand=True)
+        tk.Button(bar, text='Next ▶', command=lambda: self.show(self.page + 1)).pack(side='right')
+        self.show(0)
+
+    def show(self, page):
+        pages = -(-self.screen.summary_length() // self.page_size)
+        self.page = min(max(page, 0), pages - 1)
+        start = self.page * self.page_size
+        self.listbox.delete(0, tk.END)
+        for row in islice(self.screen.iter_summary(start), self.page_size):
+            self.listbox.insert(tk.END, format_row(row))
+        self.label.config(text=f'Page {self.page + 1} of {pages}')
 
 if __name__ == '__main__':
+    timer = StartupTimer(_IMPORT_START)
+    timer.mark('import')
     root = tk.Tk()
-    app = CinemaApp(root)
+    app = CinemaApp(root, timer)
     root.mainloop()
@@ -0,0 +1,178 @@
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import threading
+import time
+
+# Opt-in instrumentation. Nothing here runs unless Metrics.instrument() is called: it swaps
+# the named methods for timed wrappers and uninstrument() puts the originals back, so the
+# hot paths carry no overhead while metrics are off. Wrappers are tagged with the Metrics that
+# made them, so instrumenting a method twice keeps the first wrapper instead of nesting another.
+
+LATENCY_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+def instrumented_by(fn):
+    """The Metrics whose timed wrapper fn is, or None."""
+    return getattr(fn, '_metrics', None)
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, n in zip(self.buckets + (float('inf'),), self.counts):
+            total += n
+            yield bound, total
+
+
+class Metrics:
+    """Counters, latency histograms and a ring buffer of recent spans."""
+
+    def __init__(self, prefix='cinema', max_spans=1000, path=None):
+        self.prefix = prefix
+        self.path = path
+        self.counters = {}
+        self.histograms = {}
+        self.spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._patched = []
+
+    def inc(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name, seconds):
+        with self._lock:
+            h = self.histograms.get(name)
+            if h is None:
+                h = self.histograms[name] = Histogram()
+            h.observe(seconds)
+
+    @contextmanager
+    def span(self, name):
+        # Spans nest per thread; each records its parent so slow calls can be traced to their caller
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        parent = stack[-1] if stack else None
+        stack.append(name)
+        wall, start = time.time(), time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            self.inc(f'{name}_errors_total')
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            self.observe(f'{name}_seconds', elapsed)
+            self.spans.append({'name': name, 'parent': parent, 'start': wall, 'seconds': elapsed,
+                               'thread': threading.current_thread().name, 'error': error})
+
+    def timed(self, name, fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with self.span(name):
+                return fn(*args, **kwargs)
+        wrapper._metrics = self
+        return wrapper
+
+    def instrument(self, cls, *names, prefix=None):
+        """Replace cls.<name> with a timed wrapper, reported as <prefix>_<name>; wrapped names are skipped."""
+        prefix = prefix or cls.__name__.lower()
+        for name in names:
+            original = cls.__dict__[name]
+            if instrumented_by(original) is not None:
+                continue
+            self._patched.append((cls, name, original))
+            setattr(cls, name, self.timed(f'{prefix}_{name.lstrip("_")}', original))
+
+    def uninstrument(self):
+        while self._patched:
+            cls, name, original = self._patched.pop()
+            setattr(cls, name, original)
+
+    def watch(self, obj, attr, name=None):
+        # For callables stored on instances, e.g. a screen's update_callback
+        fn = getattr(obj, attr)
+        if instrumented_by(fn) is None:
+            setattr(obj, attr, self.timed(name or attr, fn))
+
+    def to_prometheus(self):
+        lines = []
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                lines.append(f'# TYPE {self.prefix}_{name} counter')
+                lines.append(f'{self.prefix}_{name} {value}')
+            for name, h in sorted(self.histograms.items()):
+                full = f'{self.prefix}_{name}'
+                lines.append(f'# TYPE {full} histogram')
+                for bound, total in h.cumulative():
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'{full}_bucket{{le="{le}"}} {total}')
+                lines.append(f'{full}_sum {h.sum}')
+                lines.append(f'{full}_count {h.count}')
+        return '\n'.join(lines) + '\n'
+
+    def to_json(self):
+        with self._lock:
+            return json.dumps({
+                'counters': dict(self.counters),
+                'histograms': {name: {'buckets': list(h.buckets), 'counts': list(h.counts), 'sum': h.sum,
+                                      'count': h.count} for name, h in self.histograms.items()},
+                'spans': list(self.spans),
+            }, indent=2)
+
+    def write(self, path=None):
+        # .json gets the JSON export (with spans), anything else Prometheus text
+        path = path or self.path
+        text = self.to_json() if path.endswith('.json') else self.to_prometheus()
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+    def serve(self, port=9464, host='127.0.0.1'):
+        """Serve /metrics (Prometheus text) and /metrics.json from a daemon thread."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body, kind = metrics.to_prometheus(), 'text/plain; version=0.0.4'
+                elif self.path == '/metrics.json':
+                    body, kind = metrics.to_json(), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode()
+                self.send_response(200)
+                self.send_header('Content-Type', kind)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+        return server
@@ -0,0 +1,158 @@
+from bisect import bisect_right
+
+import numpy as np
+
+
+class PricingEngine:
+    """Compiles pricing rules into one price per seat and keeps a SeatMap's prices in step.
+
+    A seat's price is its base price (what the layout gave it) times a factor for its type.
+    The factor folds in the type, showtime, day-of-week, surge and promo rules, so changing
+    a rule only rebuilds a small per-type table and reprices every seat in one vectorised
+    pass. Bookings reprice only when occupancy crosses a surge tier. Booked seats keep the
+    price they were booked at; a seat that is reset goes back on sale at the current price.
+
+        type_multipliers  {'premium': 1.2}
+        day_multipliers   {5: 1.15, 6: 1.15}           weekday() of the showtime, Monday is 0
+        time_multipliers  [(10, 16, 0.8)]               [start_hour, end_hour) of the showtime
+        surge             [(0.7, 1.1), (0.9, 1.25)]     (occupancy fraction, multiplier)
+        promos            {'STUDENT': {'percent': 20, 'seat_types': ['standard', 'value']}}
+    """
+
+    def __init__(self, seat_map, showtime=None, type_multipliers=None, day_multipliers=None,
+                 time_multipliers=(), surge=(), promos=None):
+        self.seat_map = seat_map
+        self.showtime = showtime
+        self.type_multipliers = dict(type_multipliers or {})
+        self.day_multipliers = dict(day_multipliers or {})
+        self.time_multipliers = list(time_multipliers)
+        self.surge = sorted(surge)
+        self.promos = dict(promos or {})
+        self.active_promos = []
+        self.on_reprice = None
+        self._base = np.empty(0)
+        self._prices = np.empty(0)
+        self._tier = 0
+        self.reprice()
+        seat_map.subscribe(self._booked_changed)
+
+    def close(self):
+        self.seat_map.unsubscribe(self._booked_changed)
+
+    def forget_seats(self):
+        # After SeatMap.clear(): the next pass prices the new seats from their layout prices
+        self._base = np.empty(0)
+        self._prices = np.empty(0)
+        self._tier = 0
+
+    # Rules
+    def set_showtime(self, showtime):
+        self.showtime = showtime
+        self.reprice()
+
+    def set_type_multiplier(self, seat_type, multiplier):
+        self.type_multipliers[seat_type] = multiplier
+        self.reprice()
+
+    def set_surge(self, tiers):
+        self.surge = sorted(tiers)
+        self.reprice()
+
+    def add_promo(self, code, percent, seat_types=None):
+        self.promos[code] = {'percent': percent, 'seat_types': seat_types}
+
+    def apply_promo(self, code):
+        if code not in self.promos:
+            raise ValueError(f"Unknown promo code {code!r}")
+        if code not in self.active_promos:
+            self.active_promos.append(code)
+            self.reprice()
+
+    def remove_promo(self, code):
+        if code in self.active_promos:
+            self.active_promos.remove(code)
+            self.reprice()
+
+    # Compilation
+    def _showtime_factor(self):
+        if self.showtime is None:
+            return 1.0
+        factor = self.day_multipliers.get(self.showtime.weekday(), 1.0)
+        hour = self.showtime.hour + self.showtime.minute / 60
+        for start, end, multiplier in self.time_multipliers:
+            if start <= hour < end:
+                factor *= multiplier
+                break
+        return factor
+
+    def _surge_tier(self):
+        n = len(self.seat_map)
+        occupancy = self.seat_map.booked_count() / n if n else 0.0
+        return bisect_right([threshold for threshold, _ in self.surge], occupancy)
+
+    def _promo_factor(self, code, seat_type):
+        promo = self.promos[code]
+        types = promo.get('seat_types')
+        return 1 - promo['percent'] / 100 if types is None or seat_type in types else 1.0
+
+    def _type_factors(self):
+        common = self._showtime_factor()
+        if self._tier:
+            common *= self.surge[self._tier - 1][1]
+        factors = []
+        for seat_type in self.seat_map.seat_types:
+            factor = common * self.type_multipliers.get(seat_type, 1.0)
+            for code in self.active_promos:
+                factor *= self._promo_factor(code, seat_type)
+            factors.append(factor)
+        return np.array(factors or [1.0])
+
+    def _sync_base(self):
+        # Seats added since the last pass bring their layout price as base price
+        n = len(self.seat_map)
+        if len(self._base) < n:
+            current = np.frombuffer(self.seat_map.price_column(), dtype=np.float64)
+            self._base = np.concatenate([self._base, current[len(self._base):]])
+        return n
+
+    def reprice(self):
+        """Recompute every unbooked seat's price from the current rules."""
+        n = self._sync_base()
+        self._tier = self._surge_tier()
+        codes = np.frombuffer(self.seat_map.type_column(), dtype=np.uint8)
+        self._prices = np.round(self._base * self._type_factors()[codes], 2)
+        booked = np.unpackbits(np.frombuffer(self.seat_map.booked_bits(), dtype=np.uint8), bitorder='little')[:n]
+        current = np.frombuffer(self.seat_map.price_column(), dtype=np.float64)
+        self.seat_map.set_prices(np.where(booked.astype(bool), current, self._prices).tolist())
+        if self.on_reprice is not None:
+            self.on_reprice()
+
+    def price_new_seats(self):
+        """Price seats added since the last pass without touching the rest."""
+        start = len(self._base)
+        n = self._sync_base()
+        if n == start:
+            return
+        codes = np.frombuffer(self.seat_map.type_column(), dtype=np.uint8)[start:]
+        new = np.round(self._base[start:] * self._type_factors()[codes], 2)
+        self._prices = np.concatenate([self._prices, new])
+        for i, price in enumerate(new.tolist(), start):
+            self.seat_map.set_price(i, price)
+
+    def _booked_changed(self, i, booked):
+        if not booked and i < len(self._prices):
+            self.seat_map.set_price(i, float(self._prices[i]))
+        if self._surge_tier() != self._tier:
+            self.reprice()
+
+    def quote(self, indices, promo=None):
+        """Total for the given seats at their current prices, optionally with one more promo code."""
+        idx = np.fromiter(indices, dtype=np.intp)
+        prices = np.frombuffer(self.seat_map.price_column(), dtype=np.float64)[idx]
+        if promo is not None and promo not in self.active_promos:
+            if promo not in self.promos:
+                raise ValueError(f"Unknown promo code {promo!r}")
+            codes = np.frombuffer(self.seat_map.type_column(), dtype=np.uint8)[idx]
+            discount = np.array([self._promo_factor(promo, t) for t in self.seat_map.seat_types] or [1.0])
+            prices = np.round(prices * discount[codes], 2)
+        return round(float(prices.sum()), 2)
@@ -0,0 +1,106 @@
+from itertools import count
+
+import numpy as np
+
+from radar_system import DistanceAlert, RadarSystem, SpeedAlert, _plain
+
+
+def violation_windows(mask, timestamps, max_gap_ns=None):
+    """(starts, stops) of runs of True in mask; a run is also cut where readings are more than max_gap_ns apart."""
+    prev = np.concatenate(([False], mask[:-1]))
+    starts = mask & ~prev
+    if max_gap_ns is not None and len(mask):
+        gaps = np.diff(timestamps, prepend=timestamps[0]) > max_gap_ns
+        starts |= mask & prev & gaps
+    start_idx = np.flatnonzero(starts)
+    # A run stops where the mask drops or where the next run starts
+    nxt = np.concatenate((mask[1:], [False]))
+    stops = mask & ~nxt
+    if max_gap_ns is not None and len(mask):
+        stops |= mask & np.concatenate((starts[1:], [False])) & nxt
+    return start_idx, np.flatnonzero(stops) + 1
+
+
+def run_extremes(ufunc, values, starts, stops):
+    """ufunc.reduceat over each [start, stop) run only, skipping the readings between runs."""
+    if not len(starts):
+        return starts
+    # Interleave the bounds so every other segment is a run; the sentinel lets a run end at len(values)
+    bounds = np.column_stack((starts, stops)).ravel()
+    return ufunc.reduceat(np.append(values, values[-1]), bounds)[::2]
+
+
+class AlertEngine:
+    """Evaluates speed-limit and minimum-distance rules over radar readings in batches.
+
+    Each evaluate() call looks only at readings stored since the previous call, finds the
+    violating readings with array comparisons and collapses every sustained run of them into
+    one alert whose window covers the run. A run still open at the end of a batch stays open,
+    so a violation spanning several batches yields one alert that keeps growing (until it is
+    resolved; a run that carries on after that gets a new alert). Radars are tracked by
+    their id, which must be unique across the radars passed in.
+    """
+
+    def __init__(self, speed_limit=120, min_distance=10, max_gap_ns=None, speed_priority="High",
+                 distance_priority="Medium", first_id=1):
+        self.speed_limit = speed_limit
+        self.min_distance = min_distance
+        self.max_gap_ns = max_gap_ns
+        self.speed_priority = speed_priority
+        self.distance_priority = distance_priority
+        self._ids = count(first_id)
+        self._cursor = {}
+        self._open = {}
+
+    def evaluate(self, radars):
+        """Check new readings of one radar or an iterable of radars; returns the alerts created."""
+        if isinstance(radars, RadarSystem):
+            radars = [radars]
+        created = []
+        for radar in radars:
+            start = self._cursor.get(radar.id, 0)
+            rows = radar.readings.rows(start)
+            self._cursor[radar.id] = start + len(rows['id'])
+            if len(rows['id']):
+                created += self._rule(radar, rows, 'speed', rows['speed'] > self.speed_limit)
+                created += self._rule(radar, rows, 'distance', rows['distance'] < self.min_distance)
+        return created
+
+    def _rule(self, radar, rows, kind, mask):
+        ts = rows['timestamp']
+        starts, stops = violation_windows(mask, ts, self.max_gap_ns)
+        if kind == 'speed':
+            worst = run_extremes(np.maximum, rows['speed'], starts, stops)
+        else:
+            worst = run_extremes(np.minimum, rows['distance'], starts, stops)
+        key = (radar.id, kind)
+        opened = self._open.pop(key, None)
+        windows = list(zip(starts.tolist(), stops.tolist(), worst.tolist()))
+        # Continue the alert left open by the previous batch if its run carries on here
+        if opened is not None and not opened._resolved and windows and windows[0][0] == 0 and (
+                self.max_gap_ns is None or ts[0] - opened.window[1] <= self.max_gap_ns):
+            _, stop, value = windows.pop(0)
+            self._extend(opened, kind, value, ts[stop - 1], stop)
+            if stop == len(mask):
+                self._open[key] = opened
+        created = [self._create(radar, kind, value, ts[begin], ts[stop - 1], stop - begin)
+                   for begin, stop, value in windows]
+        if windows and windows[-1][1] == len(mask):
+            self._open[key] = created[-1]
+        return created
+
+    def _create(self, radar, kind, value, first_ns, last_ns, readings):
+        if kind == 'speed':
+            alert = SpeedAlert(next(self._ids), radar, _plain(value), self.speed_limit, self.speed_priority)
+        else:
+            alert = DistanceAlert(next(self._ids), radar, _plain(value), self.min_distance, self.distance_priority)
+        alert.window = (int(first_ns), int(last_ns), readings)
+        return alert
+
+    def _extend(self, alert, kind, value, last_ns, readings):
+        if kind == 'speed':
+            alert._speed_measured = _plain(max(alert._speed_measured, value))
+        else:
+            alert._distance_measured = _plain(min(alert._distance_measured, value))
+        first_ns, _, count_so_far = alert.window
+        alert.window = (first_ns, int(last_ns), count_so_far + readings)
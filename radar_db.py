@@ -0,0 +1,271 @@
+from contextlib import contextmanager
+import queue
+import sqlite3
+import threading
+
+import numpy as np
+
+from radar_system import (Alert, Car, DistanceAlert, MaintenanceRecord, RadarReadingStore, RadarSystem,
+                          SpeedAlert, Technician, _plain, to_epoch_ns)
+
+# SQLite persistence for the radar entities. Entity ids are the primary keys, so they must
+# be unique per kind; saving an entity again replaces its row. Readings are append-only:
+# each save writes only the readings added since the radar was last saved or loaded, and a
+# reading already stored under the same (radar id, reading id) is left as it is.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cars (
+    id INTEGER PRIMARY KEY, license_plate TEXT, model TEXT, owner TEXT, mileage INTEGER);
+CREATE INDEX IF NOT EXISTS cars_plate ON cars (license_plate);
+CREATE TABLE IF NOT EXISTS radars (
+    id INTEGER PRIMARY KEY, car_id INTEGER, radar_type TEXT, status TEXT, version TEXT);
+CREATE TABLE IF NOT EXISTS readings (
+    radar_id INTEGER, id INTEGER, timestamp_ns INTEGER, distance REAL, speed REAL,
+    PRIMARY KEY (radar_id, id));
+CREATE INDEX IF NOT EXISTS readings_radar_time ON readings (radar_id, timestamp_ns);
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY, radar_id INTEGER, kind TEXT, measured REAL, threshold REAL,
+    priority TEXT, resolved INTEGER, window_start INTEGER, window_end INTEGER, window_readings INTEGER);
+CREATE INDEX IF NOT EXISTS alerts_open ON alerts (resolved, priority);
+CREATE TABLE IF NOT EXISTS technicians (
+    id INTEGER PRIMARY KEY, name TEXT, email TEXT, certification_level TEXT, department TEXT);
+CREATE TABLE IF NOT EXISTS maintenance (
+    id INTEGER PRIMARY KEY, radar_id INTEGER, technician_id INTEGER, notes TEXT, date TEXT);
+CREATE INDEX IF NOT EXISTS maintenance_tech_date ON maintenance (technician_id, date);
+"""
+
+INSERT = {
+    'cars': "INSERT OR REPLACE INTO cars VALUES (?, ?, ?, ?, ?)",
+    'radars': "INSERT OR REPLACE INTO radars VALUES (?, ?, ?, ?, ?)",
+    'readings': "INSERT OR IGNORE INTO readings VALUES (?, ?, ?, ?, ?)",
+    'alerts': "INSERT OR REPLACE INTO alerts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    'technicians': "INSERT OR REPLACE INTO technicians VALUES (?, ?, ?, ?, ?)",
+    'maintenance': "INSERT OR REPLACE INTO maintenance VALUES (?, ?, ?, ?, ?)",
+}
+
+
+def _connect(path, readonly=False):
+    if readonly:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    else:
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class ConnectionPool:
+    """A fixed set of read-only connections shared by reader threads."""
+
+    def __init__(self, path, size=4):
+        self._idle = queue.Queue()
+        for _ in range(size):
+            self._idle.put(_connect(path, readonly=True))
+        self.size = size
+
+    @contextmanager
+    def connection(self):
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        for _ in range(self.size):
+            self._idle.get().close()
+
+
+def _loads_first(method):
+    def wrapper(self, *args, **kwargs):
+        self._load()
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+class LazyReadingStore(RadarReadingStore):
+    """A loaded radar's reading history; it is read from the database on first use."""
+
+    def __init__(self, db, radar_id, saved):
+        super().__init__()
+        self._db = db
+        self._radar_id = radar_id
+        self._saved = saved
+        self._loaded = saved == 0
+
+    def _load(self):
+        if not self._loaded:
+            self._loaded = True
+            cols = self._db.reading_columns(self._radar_id)
+            RadarReadingStore.extend(self, cols['distance'], cols['speed'], cols['timestamp'], cols['id'])
+
+    __len__ = _loads_first(RadarReadingStore.__len__)
+    extend = _loads_first(RadarReadingStore.extend)
+    get = _loads_first(RadarReadingStore.get)
+    set = _loads_first(RadarReadingStore.set)
+    set_timestamp = _loads_first(RadarReadingStore.set_timestamp)
+    rows = _loads_first(RadarReadingStore.rows)
+    column = _loads_first(RadarReadingStore.column)
+    indices_between = _loads_first(RadarReadingStore.indices_between)
+    between = _loads_first(RadarReadingStore.between)
+
+
+class RadarDatabase:
+    """Batched SQLite store for cars, radars, readings, alerts, technicians and maintenance.
+
+    Writes are queued and flushed with executemany inside one transaction once `batch_size`
+    rows are pending (or on flush()/close()), on a WAL-mode database so readers from the
+    connection pool are never blocked by an ingest in progress.
+    """
+
+    def __init__(self, path='radar.db', readers=4, batch_size=10000):
+        if path == ':memory:':
+            raise ValueError("RadarDatabase needs a file: reader connections open it separately")
+        self.path = path
+        self.batch_size = batch_size
+        self._conn = _connect(path)
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._pending = {table: [] for table in INSERT}
+        self._pending_rows = 0
+        self._saved_readings = {}
+        self._queued_readings = {}  # reading cursors that take effect once their rows are committed
+        self._lock = threading.Lock()
+        self.pool = ConnectionPool(path, readers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.flush()
+        self.pool.close()
+        self._conn.close()
+
+    # Writing
+    def _queue(self, table, rows, readings_of=None):
+        with self._lock:
+            if readings_of is not None:
+                radar_id, cursor = readings_of
+                self._queued_readings[radar_id] = cursor
+            self._pending[table].extend(rows)
+            self._pending_rows += len(rows)
+            due = self._pending_rows >= self.batch_size
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            if not self._pending_rows:
+                return
+            # On failure the transaction rolls back and everything stays queued for the next flush
+            with self._conn:
+                for table, rows in self._pending.items():
+                    if rows:
+                        self._conn.executemany(INSERT[table], rows)
+            self._pending = {table: [] for table in INSERT}
+            self._pending_rows = 0
+            self._saved_readings.update(self._queued_readings)
+            self._queued_readings = {}
+
+    def save(self, entity):
+        if isinstance(entity, Car):
+            self._queue('cars', [(entity.id, entity.get_license_plate(), entity._model, entity.owner,
+                                  entity.mileage)])
+        elif isinstance(entity, RadarSystem):
+            self._queue('radars', [(entity.id, entity._car.id, entity._radar_type, entity._status,
+                                    entity._version)])
+            self.save_readings(entity)
+        elif isinstance(entity, Alert):
+            if isinstance(entity, SpeedAlert):
+                kind, measured, threshold = 'speed', entity._speed_measured, entity._speed_limit
+            else:
+                kind, measured, threshold = 'distance', entity._distance_measured, entity._min_distance
+            window = entity.window or (None, None, None)
+            self._queue('alerts', [(entity.id, entity._radar_system.id, kind, measured, threshold,
+                                    entity._priority, int(entity._resolved), *window)])
+        elif isinstance(entity, Technician):
+            self._queue('technicians', [(entity.id, entity.name, entity._email, entity.certification_level,
+                                         entity.department)])
+        elif isinstance(entity, MaintenanceRecord):
+            self._queue('maintenance', [(entity.id, entity._radar_system.id, entity._technician.id,
+                                         entity._notes, str(entity._date))])
+        else:
+            raise TypeError(f"Cannot store {type(entity).__name__}")
+
+    def save_readings(self, radar):
+        """Queue the radar's readings added since its last save (or since the last queued ones)."""
+        store = radar.readings
+        with self._lock:
+            start = self._queued_readings.get(radar.id, self._saved_readings.get(radar.id, 0))
+        if isinstance(store, LazyReadingStore) and not store._loaded:
+            return  # nothing new: the history is still only in the database
+        if len(store) <= start:
+            return
+        cols = store.rows(start)
+        rows = zip([radar.id] * len(cols['id']), cols['id'].tolist(), cols['timestamp'].tolist(),
+                   cols['distance'].tolist(), cols['speed'].tolist())
+        self._queue('readings', list(rows), (radar.id, start + len(cols['id'])))
+
+    def save_fleet(self, cars, technicians=()):
+        """Save cars and everything reachable from them: radars, readings, alerts, maintenance."""
+        seen_techs = set()
+        for tech in technicians:
+            seen_techs.add(id(tech))
+            self.save(tech)
+        for car in cars:
+            self.save(car)
+            for radar in car.radar_systems:
+                self.save(radar)
+                for alert in radar.alerts:
+                    self.save(alert)
+                for record in radar.maintenance_records:
+                    if id(record._technician) not in seen_techs:
+                        seen_techs.add(id(record._technician))
+                        self.save(record._technician)
+                    self.save(record)
+        self.flush()
+
+    # Reading
+    def query(self, sql, params=()):
+        with self.pool.connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def reading_columns(self, radar_id, start=None, end=None):
+        """Column arrays of a radar's stored readings, optionally with start <= timestamp < end."""
+        sql = "SELECT id, timestamp_ns, distance, speed FROM readings WHERE radar_id = ?"
+        params = [radar_id]
+        if start is not None:
+            sql += " AND timestamp_ns >= ? AND timestamp_ns < ?"
+            params += [to_epoch_ns(start), to_epoch_ns(end)]
+        rows = self.query(sql + " ORDER BY rowid", params)
+        ids, ts, distance, speed = zip(*rows) if rows else ((), (), (), ())
+        return {'id': np.array(ids, dtype=np.int64), 'timestamp': np.array(ts, dtype=np.int64),
+                'distance': np.array(distance, dtype=np.float64), 'speed': np.array(speed, dtype=np.float64)}
+
+    def load_fleet(self):
+        """Rebuild every stored entity; returns (cars, technicians). Reading history loads lazily."""
+        techs = {row[0]: Technician(*row[:3], certification_level=row[3], department=row[4])
+                 for row in self.query("SELECT * FROM technicians")}
+        cars = {row[0]: Car(row[0], row[1], row[2], owner=row[3], mileage=row[4])
+                for row in self.query("SELECT * FROM cars")}
+        counts = dict(self.query("SELECT radar_id, COUNT(*) FROM readings GROUP BY radar_id"))
+        radars = {}
+        for _id, car_id, radar_type, status, version in self.query("SELECT * FROM radars"):
+            radar = radars[_id] = RadarSystem(_id, cars[car_id], radar_type, status=status, version=version)
+            saved = counts.get(_id, 0)
+            radar.readings = LazyReadingStore(self, _id, saved)
+            self._saved_readings[_id] = saved
+        for _id, radar_id, kind, measured, threshold, priority, resolved, *window in self.query(
+                "SELECT * FROM alerts ORDER BY rowid"):
+            cls = SpeedAlert if kind == 'speed' else DistanceAlert
+            alert = cls(_id, radars[radar_id], _plain(measured), _plain(threshold), priority=priority)
+            if window[0] is not None:
+                alert.window = tuple(window)
+            if resolved:
+                alert.resolve()
+        for _id, radar_id, tech_id, notes, date in self.query("SELECT * FROM maintenance ORDER BY rowid"):
+            MaintenanceRecord(_id, radars[radar_id], techs[tech_id], notes=notes, date=date)
+        return list(cars.values()), list(techs.values())
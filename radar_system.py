@@ -1,284 +1,811 @@
-from abc import ABC, abstractmethod
-import random
-import datetime
-
-class BaseEntity(ABC):
-    def __init__(self, _id, name=""):
-        self._id = _id
-        self._name = name
-
-    @property
-    def id(self):
-        return self._id
-
-    @property
-    def name(self):
-        return self._name
-
-    @abstractmethod
-    def display_info(self):
-        pass
-
-
-class Car(BaseEntity):
-    def __init__(self, _id, license_plate, model, owner=None, mileage=0):
-        super().__init__(_id)
-        self._license_plate = license_plate
-        self._model = model
-        self.owner = owner
-        self.mileage = mileage 
-        self.radar_systems = []
-
-    def get_license_plate(self):
-        return self._license_plate
-
-    def set_license_plate(self, plate):
-        self._license_plate = plate
-
-    def display_info(self):
-        return (f"Car #{self.id}: {self._model} - Plate: {self._license_plate}, "
-                f"Owner: {self.owner}, Mileage: {self.mileage} km")
-
-
-class RadarSystem(BaseEntity):
-    def __init__(self, _id, car, radar_type, status="Active", version="v1.0"):
-        super().__init__(_id)
-        self._car = car
-        self._radar_type = radar_type
-        self._status = status
-        self._version = version
-        self.radar_readings = []
-        self.alerts = []
-        self.maintenance_records = []
-        car.radar_systems.append(self)
-
-    def display_info(self):
-        return (f"Radar #{self.id} ({self._radar_type}) for car "
-                f"{self._car.get_license_plate()} - Status: {self._status}, "
-                f"Version: {self._version}")
-
-
-class RadarReading(BaseEntity):
-    def __init__(self, _id, radar_system, distance, speed, timestamp=None):
-        super().__init__(_id)
-        self._radar_system = radar_system
-        self._distance = distance
-        self._speed = speed
-        self.timestamp = timestamp or "Not Recorded"
-        radar_system.radar_readings.append(self)
-
-    def get_speed(self):
-        return self._speed
-
-    def get_distance(self):
-        return self._distance
-
-    def display_info(self):
-        return (f"Reading #{self.id}: Speed = {self._speed} km/h, "
-                f"Distance = {self._distance} m, Timestamp: {self.timestamp}")
-
-
-class Alert(BaseEntity, ABC):
-    def __init__(self, _id, radar_system, alert_type, priority="Low"):
-        super().__init__(_id)
-        self._radar_system = radar_system
-        self._alert_type = alert_type
-        self._priority = priority  
-        self._resolved = False 
-
-    @abstractmethod
-    def display_info(self):
-        pass
-
-    def resolve(self):
-        self._resolved = True
-
-    def display_resolved_status(self):
-        return "Resolved" if self._resolved else "Unresolved"
-
-
-class SpeedAlert(Alert):
-    def __init__(self, _id, radar_system, speed_measured, speed_limit, priority="High"):
-        super().__init__(_id, radar_system, "Speed Limit Exceeded", priority)
-        self._speed_measured = speed_measured
-        self._speed_limit = speed_limit
-        radar_system.alerts.append(self)
-
-    def display_info(self):
-        return (f"ALERT #{self.id}: {self._alert_type} - "
-                f"Speed {self._speed_measured} > Limit {self._speed_limit}, "
-                f"Priority: {self._priority}, Status: {self.display_resolved_status()}")
-
-
-class DistanceAlert(Alert):
-    def __init__(self, _id, radar_system, distance_measured, min_distance, priority="Medium"):
-        super().__init__(_id, radar_system, "Unsafe Distance Detected", priority)
-        self._distance_measured = distance_measured
-        self._min_distance = min_distance
-        radar_system.alerts.append(self)
-
-    def display_info(self):
-        return (f"ALERT #{self.id}: {self._alert_type} - "
-                f"Distance {self._distance_measured} < Minimum {self._min_distance}, "
-                f"Priority: {self._priority}, Status: {self.display_resolved_status()}")
-
-
-class Technician(BaseEntity):
-    def __init__(self, _id, name, email, certification_level="Beginner", department="Tech"):
-        super().__init__(_id, name)
-        self._email = email
-        self.certification_level = certification_level 
-        self.department = department 
-        self.maintenance_records = []
-
-    def display_info(self):
-        return (f"Technician #{self.id}: {self.name} - {self._email}, "
-                f"Certification Level: {self.certification_level}, "
-                f"Department: {self.department}")
-
-
-class MaintenanceRecord(BaseEntity):
-    def __init__(self, _id, radar_system, technician, notes="", date="Not Set"):
-        super().__init__(_id)
-        self._radar_system = radar_system
-        self._technician = technician
-        self._notes = notes
-        self._date = date 
-        radar_system.maintenance_records.append(self)
-        technician.maintenance_records.append(self)
-
-    def display_info(self):
-        return (f"Maintenance #{self.id} by {self._technician.name} - "
-                f"Notes: {self._notes}, Date: {self._date}")
-
-
-class SystemReport:
-    def __init__(self, root_entity: BaseEntity):
-        self.root_entity = root_entity
-        self.reported = set()
-
-    def generate_report(self):
-        print("=== System Report ===")
-        self._traverse(self.root_entity)
-
-    def _traverse(self, entity: BaseEntity):
-        if id(entity) in self.reported:
-            return
-        self.reported.add(id(entity))
-        print(entity.display_info())
-
-        if isinstance(entity, Car):
-            for radar in entity.radar_systems:
-                self._traverse(radar)
-
-        elif isinstance(entity, RadarSystem):
-            for reading in entity.radar_readings:
-                self._traverse(reading)
-            for alert in entity.alerts:
-                self._traverse(alert)
-            for rec in entity.maintenance_records:
-                self._traverse(rec)
-
-        elif isinstance(entity, Technician):
-            for record in entity.maintenance_records:
-                self._traverse(record)
-
-        elif isinstance(entity, MaintenanceRecord):
-            self._traverse(entity._technician)
-
-        elif isinstance(entity, Alert):
-            self._traverse(entity._radar_system)
-
-        elif isinstance(entity, RadarReading):
-            self._traverse(entity._radar_system)
-
-
-# === Utility functions to generate random data ===
-
-def generate_random_car():
-    models = ["Tesla Model 3", "BMW X5", "Audi A4", "Mercedes-Benz E-Class"]
-    plates = ["XYZ-123", "ABC-456", "DEF-789", "GHI-012"]
-    owners = ["John Doe", "Jane Smith", "Alice Brown", "Bob White"]
-    return Car(
-        random.randint(1000, 9999),
-        random.choice(plates),
-        random.choice(models),
-        owner=random.choice(owners),
-        mileage=random.randint(1000, 20000)
-    )
-
-
-def generate_random_radar(car):
-    types = ["Front Radar", "Rear Radar", "Side Radar"]
-    radar = RadarSystem(
-        random.randint(1000, 9999),
-        car,
-        random.choice(types),
-        status=random.choice(["Active", "Inactive"]),
-        version=f"v{random.randint(1,3)}.{random.randint(0,9)}"
-    )
-    for _ in range(random.randint(1,5)):
-        RadarReading(
-            random.randint(1000, 9999),
-            radar,
-            distance=random.randint(1,100),
-            speed=random.randint(50,150),
-            timestamp=datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        )
-    return radar
-
-
-def generate_random_alert(radar):
-    if random.choice([True, False]):
-        return SpeedAlert(
-            random.randint(1000, 9999),
-            radar,
-            speed_measured=random.randint(100,200),
-            speed_limit=random.randint(60,120),
-            priority=random.choice(["High","Medium","Low"])
-        )
-    else:
-        return DistanceAlert(
-            random.randint(1000, 9999),
-            radar,
-            distance_measured=random.randint(5,50),
-            min_distance=random.randint(10,100),
-            priority=random.choice(["High","Medium","Low"])
-        )
-
-
-def generate_random_maintenance_record(radar, tech):
-    return MaintenanceRecord(
-        random.randint(1000, 9999),
-        radar,
-        tech,
-        notes=random.choice(["Firmware update","Sensor calibration","System reboot"]),
-        date=datetime.datetime.now().strftime("%Y-%m-%d")
-    )
-
-
-if __name__ == "__main__":
-    car1 = generate_random_car()
-    car2 = generate_random_car()
-
-    radar1 = generate_random_radar(car1)
-    radar2 = generate_random_radar(car2)
-
-    tech = Technician(1, "Alice Smith", "alice@example.com", certification_level="Advanced", department="Radar Maintenance")
-
-    alert1 = generate_random_alert(radar1)
-    alert2 = generate_random_alert(radar2)
-
-    rec1 = generate_random_maintenance_record(radar1, tech)
-    rec2 = generate_random_maintenance_record(radar2, tech)
-
-    report = SystemReport(car1)
-    report.generate_report()
-
-    print("\n--- Additional Report for Car 2 ---")
-    SystemReport(car2).generate_report()
-
-    print("\n--- Summary ---")
-    print(f"Technician {tech.name} has {len(tech.maintenance_records)} maintenance records.")
-    print(f"Radar {radar1.id} on car {car1.get_license_plate()} has {len(radar1.radar_readings)} readings.")
-    print(f"Radar {radar2.id} on car {car2.get_license_plate()} has {len(radar2.radar_readings)} readings.")
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Sequence
+import heapq
+from itertools import chain
+import json
+import random
+import datetime
+import sys
+
+import numpy as np
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+NO_TIMESTAMP = np.iinfo(np.int64).min  # stored for readings without a timestamp
+# Numbers are epoch nanoseconds when ints and epoch seconds when floats. Either must land between
+# 1971 and the end of int64 nanoseconds: seconds or milliseconds passed as an int would otherwise
+# be read as a moment in January 1970, and nanoseconds passed as a float would overflow.
+MIN_EPOCH_NS = 365 * 86400 * 10**9
+MAX_EPOCH_NS = np.iinfo(np.int64).max
+_MIN_EPOCH_S, _MAX_EPOCH_S = MIN_EPOCH_NS / 1e9, MAX_EPOCH_NS / 1e9
+
+
+def to_epoch_ns(value):
+    """Epoch nanoseconds for an int (ns), float (epoch seconds), date, datetime, or a
+    TIMESTAMP_FORMAT or ISO 8601 string; NO_TIMESTAMP for None or NaN. ValueError for anything
+    else, including numbers outside the range above."""
+    if value is None or value == "Not Recorded" or value == "":
+        return NO_TIMESTAMP
+    if isinstance(value, (bool, np.bool_)):
+        raise ValueError(f"Unsupported timestamp {value!r}")
+    if isinstance(value, (int, np.integer)):
+        value = int(value)
+        if value != NO_TIMESTAMP and not MIN_EPOCH_NS <= value <= MAX_EPOCH_NS:
+            raise ValueError(f"Timestamp {value!r} is out of range for epoch nanoseconds "
+                             "(pass epoch seconds as a float)")
+        return value
+    if isinstance(value, (float, np.floating)):
+        if value != value:
+            return NO_TIMESTAMP
+        if not _MIN_EPOCH_S <= value < _MAX_EPOCH_S:
+            raise ValueError(f"Timestamp {value!r} is out of range for epoch seconds")
+        return round(value * 1e6) * 1000
+    if isinstance(value, str):
+        try:
+            value = datetime.datetime.strptime(value, TIMESTAMP_FORMAT)
+        except ValueError:
+            value = datetime.datetime.fromisoformat(value)
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        value = datetime.datetime.combine(value, datetime.time())
+    if isinstance(value, datetime.datetime):
+        return round(value.timestamp() * 1e6) * 1000
+    raise ValueError(f"Unsupported timestamp {value!r}")
+
+
+# Registries (see EntityRegistry) listening for entity creation and changes
+_listeners = []
+
+
+def _notify(event, entity, *args):
+    for registry in _listeners:
+        registry.on_event(event, entity, *args)
+
+
+def _plain(value):
+    # Whole-number readings print as ints, the way they were entered
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+class BaseEntity(ABC):
+    def __init__(self, _id, name=""):
+        self._id = _id
+        self._name = name
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def name(self):
+        return self._name
+
+    def identity(self):
+        # What "the same entity" means when traversing; views override it
+        return id(self)
+
+    @abstractmethod
+    def display_info(self):
+        pass
+
+
+class Car(BaseEntity):
+    def __init__(self, _id, license_plate, model, owner=None, mileage=0):
+        super().__init__(_id)
+        self._license_plate = license_plate
+        self._model = model
+        self.owner = owner
+        self.mileage = mileage 
+        self.radar_systems = []
+        _notify('created', self)
+
+    def get_license_plate(self):
+        return self._license_plate
+
+    def set_license_plate(self, plate):
+        old = self._license_plate
+        self._license_plate = plate
+        _notify('plate_changed', self, old)
+
+    def display_info(self):
+        return (f"Car #{self.id}: {self._model} - Plate: {self._license_plate}, "
+                f"Owner: {self.owner}, Mileage: {self.mileage} km")
+
+
+class RadarSystem(BaseEntity):
+    def __init__(self, _id, car, radar_type, status="Active", version="v1.0"):
+        super().__init__(_id)
+        self._car = car
+        self._radar_type = radar_type
+        self._status = status
+        self._version = version
+        self.readings = RadarReadingStore()
+        self.alerts = []
+        self.maintenance_records = []
+        car.radar_systems.append(self)
+        _notify('created', self)
+
+    @property
+    def radar_readings(self):
+        return ReadingViews(self)
+
+    def add_readings(self, distances, speeds, timestamps=None, ids=None):
+        """Bulk append; returns the index of the first new reading."""
+        return self.readings.extend(distances, speeds, timestamps, ids)
+
+    def readings_between(self, start, end):
+        """Lazy RadarReading views for readings with start <= timestamp < end."""
+        return ReadingViews(self, self.readings.indices_between(start, end))
+
+    def display_info(self):
+        return (f"Radar #{self.id} ({self._radar_type}) for car "
+                f"{self._car.get_license_plate()} - Status: {self._status}, "
+                f"Version: {self._version}")
+
+
+class RadarReadingStore:
+    """Columnar storage for one radar's readings: id, epoch-ns timestamp, distance and speed.
+
+    Rows live in NumPy chunks that start small and double up to `max_chunk` rows, so a radar
+    with a handful of readings stays cheap and one with millions never copies what it already
+    holds. A row costs 32 bytes, against roughly a kilobyte for a RadarReading object.
+    Timestamps that to_epoch_ns cannot parse or that are out of range are stored as
+    NO_TIMESTAMP and the original value is kept in a side dict by row, so odd input is shown as
+    entered instead of raising. Missing values are None, NaN, NaT or masked (np.ma) entries;
+    a masked int column never goes through float64.
+    """
+
+    COLUMNS = (('id', np.int64), ('timestamp', np.int64), ('distance', np.float64), ('speed', np.float64))
+
+    def __init__(self, first_chunk=64, max_chunk=1 << 16):
+        self.first_chunk = first_chunk
+        self.max_chunk = max_chunk
+        self._chunks = []
+        self._starts = []
+        self._capacity = 0
+        self._n = 0
+        self._next_id = 1
+        self._sorted = True
+        self._last_ts = NO_TIMESTAMP
+        self._columns = None
+        self._raw_timestamps = {}
+
+    def __len__(self):
+        return self._n
+
+    def _grow(self):
+        size = min(self.first_chunk << len(self._chunks), self.max_chunk)
+        self._chunks.append({name: np.empty(size, dtype) for name, dtype in self.COLUMNS})
+        self._starts.append(self._capacity)
+        self._capacity += size
+
+    def _locate(self, i):
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        k = bisect_right(self._starts, i) - 1
+        return self._chunks[k], i - self._starts[k]
+
+    def append(self, _id, distance, speed, timestamp=None):
+        return self.extend([distance], [speed], [timestamp], None if _id is None else [_id])
+
+    def extend(self, distances, speeds, timestamps=None, ids=None):
+        distances = np.asarray(distances, dtype=np.float64)
+        n = len(distances)
+        values = {
+            'id': np.arange(self._next_id, self._next_id + n) if ids is None else np.asarray(ids, dtype=np.int64),
+            'timestamp': self._timestamps(timestamps, n, self._n),
+            'distance': distances,
+            'speed': np.asarray(speeds, dtype=np.float64),
+        }
+        if any(len(v) != n for v in values.values()):
+            raise ValueError("All reading columns must have the same length")
+        start = self._n
+        pos = 0
+        while pos < n:
+            if self._n == self._capacity:
+                self._grow()
+            chunk, offset = self._chunks[-1], self._n - self._starts[-1]
+            take = min(len(chunk['id']) - offset, n - pos)
+            for name, column in values.items():
+                chunk[name][offset:offset + take] = column[pos:pos + take]
+            pos += take
+            self._n += take
+        if n:
+            ts = values['timestamp']
+            self._sorted = self._sorted and ts[0] >= self._last_ts and bool(np.all(ts[1:] >= ts[:-1]))
+            self._last_ts = max(self._last_ts, int(ts.max()))
+            self._next_id = max(self._next_id, int(values['id'].max()) + 1)
+            self._columns = None
+        return start
+
+    def _timestamps(self, values, n, start):
+        if values is None:
+            return np.full(n, NO_TIMESTAMP, dtype=np.int64)
+        if np.ma.isMaskedArray(values):
+            kind = values.dtype.kind
+            values = (values.astype(np.int64).filled(NO_TIMESTAMP) if kind in 'iu' else
+                      values.astype(np.float64).filled(np.nan) if kind == 'f' else
+                      values.astype(object).filled(None))
+        arr = np.asarray(values)
+        if arr.dtype.kind in 'iu':
+            ns = arr.astype(np.int64)
+            bad = (ns < MIN_EPOCH_NS) & (ns != NO_TIMESTAMP)
+        elif arr.dtype.kind == 'M':
+            return arr.astype('datetime64[ns]').astype(np.int64)
+        elif arr.dtype.kind == 'f':
+            missing = np.isnan(arr)
+            bad = ~missing & ~((arr >= _MIN_EPOCH_S) & (arr < _MAX_EPOCH_S))
+            ns = np.round(np.where(missing | bad, 0, arr) * 1e6).astype(np.int64) * 1000
+            ns[missing] = NO_TIMESTAMP
+        else:
+            return np.fromiter((self._parse(start + k, v) for k, v in enumerate(values)), np.int64, n)
+        for k in np.flatnonzero(bad).tolist():
+            self._raw_timestamps[start + k] = arr[k].item()
+            ns[k] = NO_TIMESTAMP
+        return ns
+
+    def _parse(self, i, value):
+        try:
+            return to_epoch_ns(value)
+        except (TypeError, ValueError):
+            self._raw_timestamps[i] = value
+            return NO_TIMESTAMP
+
+    def set_timestamp(self, i, value):
+        """Set row i's timestamp from anything extend() accepts."""
+        self._locate(i)
+        self._raw_timestamps.pop(i, None)
+        self.set('timestamp', i, self._parse(i, value))
+
+    def raw_timestamp(self, i):
+        """The unparseable value given as row i's timestamp, or None."""
+        return self._raw_timestamps.get(i)
+
+    def get(self, name, i):
+        chunk, offset = self._locate(i)
+        return chunk[name][offset]
+
+    def set(self, name, i, value):
+        chunk, offset = self._locate(i)
+        chunk[name][offset] = value
+        if name == 'timestamp':
+            self._sorted = False
+        self._columns = None
+
+    def rows(self, start, stop=None):
+        """Column arrays for rows [start, stop), copied from the chunks they span only."""
+        stop = self._n if stop is None else min(stop, self._n)
+        parts = {name: [] for name, _ in self.COLUMNS}
+        for chunk, first in zip(self._chunks, self._starts):
+            lo, hi = max(start, first) - first, min(stop, first + len(chunk['id'])) - first
+            if lo < hi:
+                for name in parts:
+                    parts[name].append(chunk[name][lo:hi])
+        return {name: np.concatenate(p) if p else np.empty(0, dtype)
+                for (name, dtype), p in zip(self.COLUMNS, parts.values())}
+
+    def column(self, name):
+        """One contiguous array per column, rebuilt only after the store changes."""
+        if self._columns is None:
+            self._columns = {}
+        column = self._columns.get(name)
+        if column is None:
+            parts = [chunk[name] for chunk in self._chunks]
+            column = np.concatenate(parts)[:self._n] if parts else np.empty(0, dict(self.COLUMNS)[name])
+            self._columns[name] = column
+        return column
+
+    def indices_between(self, start, end):
+        """Indices of readings with start <= timestamp < end (ints, datetimes or strings)."""
+        start, end = to_epoch_ns(start), to_epoch_ns(end)
+        ts = self.column('timestamp')
+        if self._sorted:
+            return np.arange(np.searchsorted(ts, start, 'left'), np.searchsorted(ts, end, 'left'))
+        return np.flatnonzero((ts >= start) & (ts < end))
+
+    def between(self, start, end):
+        """Column arrays for the readings in [start, end); views when timestamps arrived in order."""
+        idx = self.indices_between(start, end)
+        if self._sorted:
+            part = slice(idx[0], idx[-1] + 1) if len(idx) else slice(0, 0)
+            return {name: self.column(name)[part] for name, _ in self.COLUMNS}
+        return {name: self.column(name)[idx] for name, _ in self.COLUMNS}
+
+
+class ReadingViews(Sequence):
+    # RadarReading views over a radar's store, made on access; `indices` picks a subset
+    def __init__(self, radar_system, indices=None):
+        self._radar = radar_system
+        self._indices = indices
+
+    def __len__(self):
+        return len(self._radar.readings) if self._indices is None else len(self._indices)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return RadarReading.attach(self._radar, i if self._indices is None else int(self._indices[i]))
+
+    def __iter__(self):
+        indices = range(len(self._radar.readings)) if self._indices is None else self._indices.tolist()
+        for i in indices:
+            yield RadarReading.attach(self._radar, i)
+
+    def __contains__(self, reading):
+        # By row, without materialising a view per reading
+        if not isinstance(reading, RadarReading) or reading._radar_system is not self._radar:
+            return False
+        if self._indices is None:
+            return 0 <= reading._index < len(self._radar.readings)
+        return bool(np.any(self._indices == reading._index))
+
+
+class RadarReading(BaseEntity):
+    _name = ""
+
+    # A RadarReading is a view over one row of its radar's RadarReadingStore
+    def __init__(self, _id, radar_system, distance, speed, timestamp=None):
+        self._radar_system = radar_system
+        self._index = radar_system.readings.append(_id, distance, speed, timestamp)
+
+    @classmethod
+    def attach(cls, radar_system, index):
+        r = cls.__new__(cls)
+        r._radar_system = radar_system
+        r._index = index
+        return r
+
+    def identity(self):
+        return (id(self._radar_system), self._index)
+
+    # Views are made on access, so two views of the same row must compare equal
+    def __eq__(self, other):
+        if not isinstance(other, RadarReading):
+            return NotImplemented
+        return self.identity() == other.identity()
+
+    def __hash__(self):
+        return hash(self.identity())
+
+    @property
+    def id(self):
+        return int(self._radar_system.readings.get('id', self._index))
+
+    @property
+    def timestamp_ns(self):
+        return int(self._radar_system.readings.get('timestamp', self._index))
+
+    @property
+    def timestamp(self):
+        ns = self.timestamp_ns
+        if ns == NO_TIMESTAMP:
+            raw = self._radar_system.readings.raw_timestamp(self._index)
+            return "Not Recorded" if raw is None else raw
+        return datetime.datetime.fromtimestamp(ns / 1e9).strftime(TIMESTAMP_FORMAT)
+
+    @timestamp.setter
+    def timestamp(self, value):
+        self._radar_system.readings.set_timestamp(self._index, value)
+
+    def get_speed(self):
+        return _plain(self._radar_system.readings.get('speed', self._index))
+
+    def get_distance(self):
+        return _plain(self._radar_system.readings.get('distance', self._index))
+
+    def display_info(self):
+        return (f"Reading #{self.id}: Speed = {self.get_speed()} km/h, "
+                f"Distance = {self.get_distance()} m, Timestamp: {self.timestamp}")
+
+
+class Alert(BaseEntity, ABC):
+    def __init__(self, _id, radar_system, alert_type, priority="Low"):
+        super().__init__(_id)
+        self._radar_system = radar_system
+        self._alert_type = alert_type
+        self._priority = priority  
+        self._resolved = False 
+        self.window = None  # (first_ns, last_ns, readings) when raised by radar_alerts.AlertEngine
+
+    @abstractmethod
+    def display_info(self):
+        pass
+
+    def resolve(self):
+        if not self._resolved:
+            self._resolved = True
+            _notify('resolved', self)
+
+    def display_resolved_status(self):
+        return "Resolved" if self._resolved else "Unresolved"
+
+
+class SpeedAlert(Alert):
+    def __init__(self, _id, radar_system, speed_measured, speed_limit, priority="High"):
+        super().__init__(_id, radar_system, "Speed Limit Exceeded", priority)
+        self._speed_measured = speed_measured
+        self._speed_limit = speed_limit
+        radar_system.alerts.append(self)
+        _notify('created', self)
+
+    def display_info(self):
+        return (f"ALERT #{self.id}: {self._alert_type} - "
+                f"Speed {self._speed_measured} > Limit {self._speed_limit}, "
+                f"Priority: {self._priority}, Status: {self.display_resolved_status()}")
+
+
+class DistanceAlert(Alert):
+    def __init__(self, _id, radar_system, distance_measured, min_distance, priority="Medium"):
+        super().__init__(_id, radar_system, "Unsafe Distance Detected", priority)
+        self._distance_measured = distance_measured
+        self._min_distance = min_distance
+        radar_system.alerts.append(self)
+        _notify('created', self)
+
+    def display_info(self):
+        return (f"ALERT #{self.id}: {self._alert_type} - "
+                f"Distance {self._distance_measured} < Minimum {self._min_distance}, "
+                f"Priority: {self._priority}, Status: {self.display_resolved_status()}")
+
+
+class Technician(BaseEntity):
+    def __init__(self, _id, name, email, certification_level="Beginner", department="Tech"):
+        super().__init__(_id, name)
+        self._email = email
+        self.certification_level = certification_level 
+        self.department = department 
+        self.maintenance_records = []
+        _notify('created', self)
+
+    def display_info(self):
+        return (f"Technician #{self.id}: {self.name} - {self._email}, "
+                f"Certification Level: {self.certification_level}, "
+                f"Department: {self.department}")
+
+
+class MaintenanceRecord(BaseEntity):
+    def __init__(self, _id, radar_system, technician, notes="", date="Not Set"):
+        super().__init__(_id)
+        self._radar_system = radar_system
+        self._technician = technician
+        self._notes = notes
+        self._date = date 
+        radar_system.maintenance_records.append(self)
+        technician.maintenance_records.append(self)
+        _notify('created', self)
+
+    def display_info(self):
+        return (f"Maintenance #{self.id} by {self._technician.name} - "
+                f"Notes: {self._notes}, Date: {self._date}")
+
+
+PRIORITY_RANK = {"High": 0, "Medium": 1, "Low": 2}
+
+
+def _iso_date(value):
+    # Maintenance dates are kept as ISO strings, which sort chronologically
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.strftime("%Y-%m-%d")
+    try:
+        return datetime.datetime.strptime(str(value)[:10], "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+class EntityRegistry:
+    """Secondary indexes over the entity graph, kept up to date as entities are created and changed.
+
+    attach() starts indexing every entity constructed afterwards (add_all() takes existing
+    ones). Lookups by id and license plate are hash lookups, the most urgent unresolved
+    alerts come off a priority heap, and maintenance records are kept sorted by date, both
+    overall and per technician, so range queries are a bisect. Readings are not indexed;
+    their radar's RadarReadingStore already answers time-range queries. An entity added with
+    the id of another of its kind replaces it, and the replaced one is dropped from every index.
+    """
+
+    KINDS = (Car, RadarSystem, Alert, Technician, MaintenanceRecord)
+
+    def __init__(self):
+        self.by_id = {kind: {} for kind in self.KINDS}
+        self.by_plate = {}
+        self._alerts = []   # heap of (rank, seq, alert); resolved ones are dropped when reached
+        self._unresolved = {rank: {} for rank in PRIORITY_RANK.values()}
+        self._dates = []    # sorted (date, seq, record)
+        self._tech_dates = {}
+        self._seq = 0
+
+    def attach(self):
+        if self not in _listeners:
+            _listeners.append(self)
+        return self
+
+    def detach(self):
+        if self in _listeners:
+            _listeners.remove(self)
+
+    def _kind(self, entity):
+        for kind in self.KINDS:
+            if isinstance(entity, kind):
+                return kind
+        return None
+
+    def add(self, entity):
+        kind = self._kind(entity)
+        if kind is None:
+            return
+        old = self.by_id[kind].get(entity.id)
+        if old is entity:
+            return
+        if old is not None:
+            self._remove(kind, old)
+        self.by_id[kind][entity.id] = entity
+        self._seq += 1
+        if kind is Car:
+            self.by_plate.setdefault(entity.get_license_plate(), []).append(entity)
+        elif kind is Alert and not entity._resolved:
+            rank = PRIORITY_RANK.get(entity._priority, len(PRIORITY_RANK))
+            heapq.heappush(self._alerts, (rank, self._seq, entity))
+            self._unresolved.setdefault(rank, {})[id(entity)] = entity
+        elif kind is MaintenanceRecord:
+            date = _iso_date(entity._date)
+            if date is not None:
+                entry = (date, self._seq, entity)
+                insort(self._dates, entry)
+                insort(self._tech_dates.setdefault(id(entity._technician), []), entry)
+
+    def _remove(self, kind, entity):
+        # The alert heap is cleaned lazily: top_alerts skips entries no longer in _unresolved
+        if kind is Car:
+            cars = self.by_plate.get(entity.get_license_plate(), [])
+            if entity in cars:
+                cars.remove(entity)
+        elif kind is Alert:
+            self._unresolved.get(PRIORITY_RANK.get(entity._priority, len(PRIORITY_RANK)), {}).pop(id(entity), None)
+        elif kind is MaintenanceRecord:
+            tech = self._tech_dates.get(id(entity._technician), [])
+            for records in (self._dates, tech):
+                records[:] = [entry for entry in records if entry[2] is not entity]
+
+    def add_all(self, entities):
+        for entity in entities:
+            self.add(entity)
+
+    def on_event(self, event, entity, *args):
+        if event == 'created':
+            self.add(entity)
+        elif event == 'resolved':
+            rank = PRIORITY_RANK.get(entity._priority, len(PRIORITY_RANK))
+            self._unresolved.get(rank, {}).pop(id(entity), None)
+        elif event == 'plate_changed':
+            cars = self.by_plate.get(args[0], [])
+            if entity in cars:
+                cars.remove(entity)
+                self.by_plate.setdefault(entity.get_license_plate(), []).append(entity)
+
+    def get(self, kind, _id):
+        return self.by_id[kind].get(_id)
+
+    def cars_by_plate(self, plate):
+        return list(self.by_plate.get(plate, ()))
+
+    def unresolved_alerts(self, priority=None):
+        """Unresolved alerts, optionally of one priority, oldest first."""
+        if priority is not None:
+            return list(self._unresolved.get(PRIORITY_RANK.get(priority), {}).values())
+        return [a for rank in sorted(self._unresolved) for a in self._unresolved[rank].values()]
+
+    def top_alerts(self, n=10):
+        """The n most urgent unresolved alerts: highest priority first, then oldest."""
+        heap = self._alerts
+        top = []
+        while heap and len(top) < n:
+            entry = heapq.heappop(heap)
+            if id(entry[2]) in self._unresolved.get(entry[0], ()):
+                top.append(entry)
+        for entry in top:
+            heapq.heappush(heap, entry)
+        return [alert for _, _, alert in top]
+
+    def maintenance_between(self, start, end, technician=None):
+        """Maintenance records dated start <= date <= end, in date order."""
+        first, last = _iso_date(start), _iso_date(end)
+        if first is None or last is None:
+            raise ValueError(f"Invalid date range {start!r} to {end!r}; expected dates or YYYY-MM-DD strings")
+        records = self._dates if technician is None else self._tech_dates.get(id(technician), [])
+        lo = bisect_left(records, (first,))
+        hi = bisect_right(records, (last, float('inf')))
+        return [record for _, _, record in records[lo:hi]]
+
+
+class TextWriter:
+    """Buffers report lines and writes them to the stream in blocks."""
+
+    def __init__(self, stream, buffer_lines=4096):
+        self.stream = stream
+        self.buffer_lines = buffer_lines
+        self._lines = []
+
+    def header(self, text):
+        self._lines.append(text)
+
+    def write(self, entity):
+        self._lines.append(entity.display_info())
+        if len(self._lines) >= self.buffer_lines:
+            self.flush()
+
+    def flush(self):
+        if self._lines:
+            self.stream.write("\n".join(self._lines) + "\n")
+            self._lines.clear()
+
+
+class JsonLinesWriter(TextWriter):
+    def header(self, text):
+        pass
+
+    def write(self, entity):
+        self._lines.append(json.dumps({"type": type(entity).__name__, "id": entity.id,
+                                       "info": entity.display_info()}))
+        if len(self._lines) >= self.buffer_lines:
+            self.flush()
+
+
+WRITERS = {"text": TextWriter, "jsonl": JsonLinesWriter}
+
+
+class SystemReport:
+    # Which linked entities to visit after each entity type, in report order
+    CHILDREN = {
+        Car: lambda e: e.radar_systems,
+        RadarSystem: lambda e: chain(e.radar_readings, e.alerts, e.maintenance_records),
+        Technician: lambda e: e.maintenance_records,
+        MaintenanceRecord: lambda e: (e._technician,),
+        Alert: lambda e: (e._radar_system,),
+        RadarReading: lambda e: (e._radar_system,),
+    }
+
+    def __init__(self, root_entity: BaseEntity, *more_roots: BaseEntity):
+        # Several roots share one visited set, so an entity reachable from many is reported once
+        self.root_entity = root_entity
+        self.roots = (root_entity,) + more_roots
+        self.reported = set()
+        self._dispatch = {}
+
+    def _children(self, entity):
+        cls = type(entity)
+        children = self._dispatch.get(cls)
+        if children is None:
+            children = next((self.CHILDREN[base] for base in cls.__mro__ if base in self.CHILDREN),
+                            lambda e: ())
+            self._dispatch[cls] = children
+        return children(entity)
+
+    def iter_entities(self):
+        """Entities in depth-first order from each root, without recursion."""
+        reported = self.reported
+        for root in self.roots:
+            stack = [iter((root,))]
+            while stack:
+                for entity in stack[-1]:
+                    key = entity.identity()
+                    if key not in reported:
+                        reported.add(key)
+                        yield entity
+                        stack.append(iter(self._children(entity)))
+                        break
+                else:
+                    stack.pop()
+
+    def generate_report(self, out=None, fmt="text"):
+        """Write the report to a stream or file path (stdout by default) as text or JSON Lines."""
+        if isinstance(out, str):
+            with open(out, "w") as f:
+                return self.generate_report(f, fmt)
+        writer = WRITERS[fmt](sys.stdout if out is None else out)
+        writer.header("=== System Report ===")
+        for entity in self.iter_entities():
+            writer.write(entity)
+        writer.flush()
+
+
+# === Utility functions to generate random data ===
+# Pass a seeded random.Random as rng for reproducible data, and an id iterator such as
+# itertools.count() as ids for unique ids; by default ids are random 4-digit numbers.
+
+def _new_id(rng, ids):
+    return next(ids) if ids is not None else rng.randint(1000, 9999)
+
+
+def generate_random_car(rng=random, ids=None):
+    models = ["Tesla Model 3", "BMW X5", "Audi A4", "Mercedes-Benz E-Class"]
+    plates = ["XYZ-123", "ABC-456", "DEF-789", "GHI-012"]
+    owners = ["John Doe", "Jane Smith", "Alice Brown", "Bob White"]
+    return Car(
+        _new_id(rng, ids),
+        rng.choice(plates),
+        rng.choice(models),
+        owner=rng.choice(owners),
+        mileage=rng.randint(1000, 20000)
+    )
+
+
+def generate_random_radar(car, rng=random, ids=None, now=None):
+    types = ["Front Radar", "Rear Radar", "Side Radar"]
+    radar = RadarSystem(
+        _new_id(rng, ids),
+        car,
+        rng.choice(types),
+        status=rng.choice(["Active", "Inactive"]),
+        version=f"v{rng.randint(1,3)}.{rng.randint(0,9)}"
+    )
+    timestamp = (now or datetime.datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+    for _ in range(rng.randint(1,5)):
+        RadarReading(
+            # With an id sequence, readings are numbered by the radar's store instead
+            None if ids is not None else rng.randint(1000, 9999),
+            radar,
+            distance=rng.randint(1,100),
+            speed=rng.randint(50,150),
+            timestamp=timestamp
+        )
+    return radar
+
+
+def generate_random_alert(radar, rng=random, ids=None):
+    if rng.choice([True, False]):
+        return SpeedAlert(
+            _new_id(rng, ids),
+            radar,
+            speed_measured=rng.randint(100,200),
+            speed_limit=rng.randint(60,120),
+            priority=rng.choice(["High","Medium","Low"])
+        )
+    else:
+        return DistanceAlert(
+            _new_id(rng, ids),
+            radar,
+            distance_measured=rng.randint(5,50),
+            min_distance=rng.randint(10,100),
+            priority=rng.choice(["High","Medium","Low"])
+        )
+
+
+def generate_random_maintenance_record(radar, tech, rng=random, ids=None, now=None):
+    return MaintenanceRecord(
+        _new_id(rng, ids),
+        radar,
+        tech,
+        notes=rng.choice(["Firmware update","Sensor calibration","System reboot"]),
+        date=(now or datetime.datetime.now()).strftime("%Y-%m-%d")
+    )
+
+
+if __name__ == "__main__":
+    car1 = generate_random_car()
+    car2 = generate_random_car()
+
+    radar1 = generate_random_radar(car1)
+    radar2 = generate_random_radar(car2)
+
+    tech = Technician(1, "Alice Smith", "alice@example.com", certification_level="Advanced", department="Radar Maintenance")
+
+    alert1 = generate_random_alert(radar1)
+    alert2 = generate_random_alert(radar2)
+
+    rec1 = generate_random_maintenance_record(radar1, tech)
+    rec2 = generate_random_maintenance_record(radar2, tech)
+
+    report = SystemReport(car1)
+    report.generate_report()
+
+    print("\n--- Additional Report for Car 2 ---")
+    SystemReport(car2).generate_report()
+
+    print("\n--- Summary ---")
+    print(f"Technician {tech.name} has {len(tech.maintenance_records)} maintenance records.")
+    print(f"Radar {radar1.id} on car {car1.get_license_plate()} has {len(radar1.radar_readings)} readings.")
+    print(f"Radar {radar2.id} on car {car2.get_license_plate()} has {len(radar2.radar_readings)} readings.")
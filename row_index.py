@@ -0,0 +1,188 @@
+from array import array
+from bisect import bisect_right
+import math
+import re
+
+# Seat ids encode their row: "S2_7" is seat 7 of row "S2", "VIP_1" seat 1 of row "VIP"
+_SEAT_ID = re.compile(r'^(.*)_(\d+)$')
+
+
+def split_seat_id(seat_id):
+    m = _SEAT_ID.match(seat_id)
+    if m is None:
+        return seat_id, 0
+    return m.group(1), int(m.group(2))
+
+
+class _Segment:
+    # A maximal run of same-type seats with consecutive numbers in one row,
+    # plus the free runs inside it as parallel sorted [start, end] position lists
+    __slots__ = ('row', 'seat_type', 'members', 'sum_x', 'sum_y', 'bbox', 'starts', 'ends')
+
+    def __init__(self, row, seat_type, members, centres):
+        self.row = row
+        self.seat_type = seat_type
+        self.members = array('l', members)
+        self.sum_x = array('d', [0.0])
+        self.sum_y = array('d', [0.0])
+        for i in members:
+            cx, cy = centres[i]
+            self.sum_x.append(self.sum_x[-1] + cx)
+            self.sum_y.append(self.sum_y[-1] + cy)
+        xs = [centres[i][0] for i in members]
+        ys = [centres[i][1] for i in members]
+        self.bbox = (min(xs), min(ys), max(xs), max(ys))
+        self.starts = []
+        self.ends = []
+
+    def centroid(self, start, n):
+        return ((self.sum_x[start + n] - self.sum_x[start]) / n,
+                (self.sum_y[start + n] - self.sum_y[start]) / n)
+
+    def lower_bound(self, fx, fy):
+        x0, y0, x1, y1 = self.bbox
+        return math.hypot(max(x0 - fx, 0, fx - x1), max(y0 - fy, 0, fy - y1))
+
+    def take(self, pos):
+        k = bisect_right(self.starts, pos) - 1
+        start, end = self.starts[k], self.ends[k]
+        del self.starts[k], self.ends[k]
+        if pos + 1 <= end:
+            self.starts.insert(k, pos + 1)
+            self.ends.insert(k, end)
+        if start <= pos - 1:
+            self.starts.insert(k, start)
+            self.ends.insert(k, pos - 1)
+
+    def release(self, pos):
+        k = bisect_right(self.starts, pos)
+        start = end = pos
+        if k < len(self.starts) and self.starts[k] == pos + 1:
+            end = self.ends[k]
+            del self.starts[k], self.ends[k]
+        if k > 0 and self.ends[k - 1] == pos - 1:
+            start = self.starts[k - 1]
+            del self.starts[k - 1], self.ends[k - 1]
+            k -= 1
+        self.starts.insert(k, start)
+        self.ends.insert(k, end)
+
+    def best_window(self, n, fx, fy):
+        best = None
+        for start, end in zip(self.starts, self.ends):
+            for w in range(start, end - n + 2):
+                cx, cy = self.centroid(w, n)
+                score = math.hypot(cx - fx, cy - fy)
+                if best is None or score < best[0]:
+                    best = (score, w)
+        return best
+
+
+class RowIndex:
+    """Row/adjacency index over a SeatMap with per-row free-run tracking.
+
+    Built once from the seat ids, then kept current through SeatMap.subscribe, so a
+    best-available query only visits rows that could still beat the best block found.
+    """
+
+    def __init__(self, seat_map):
+        self.seat_map = seat_map
+        self._segment = array('l', [-1]) * len(seat_map)
+        self._pos = array('l', [0]) * len(seat_map)
+        self._free = bytearray(len(seat_map))
+        self.segments = []
+        self._build()
+        self._order_cache = None
+        seat_map.subscribe(self._on_change)
+        seat_map.subscribe_holds(self._on_change)
+
+    def close(self):
+        self.seat_map.unsubscribe(self._on_change)
+        self.seat_map.unsubscribe_holds(self._on_change)
+
+    def _build(self):
+        seat_map = self.seat_map
+        rows = {}
+        centres = []
+        for i in range(len(seat_map)):
+            x, y, w, h, _ = seat_map.geometry(i)
+            centres.append((x + w / 2, y + h / 2))
+            row, col = split_seat_id(seat_map.seat_id(i))
+            rows.setdefault(row, []).append((col, i))
+        xs = [c[0] for c in centres] or [0.0]
+        ys = [c[1] for c in centres] or [0.0]
+        self.centre = ((min(xs) + max(xs)) / 2, (min(ys) + max(ys)) / 2)
+        for row, seats in rows.items():
+            seats.sort()
+            run = [seats[0]]
+            for prev, cur in zip(seats, seats[1:]):
+                if cur[0] == prev[0] + 1 and seat_map.seat_type(cur[1]) == seat_map.seat_type(prev[1]):
+                    run.append(cur)
+                else:
+                    self._add_segment(row, run, centres)
+                    run = [cur]
+            self._add_segment(row, run, centres)
+
+    def _add_segment(self, row, run, centres):
+        members = [i for _, i in run]
+        seg = _Segment(row, self.seat_map.seat_type(members[0]), members, centres)
+        seg_no = len(self.segments)
+        self.segments.append(seg)
+        free_start = None
+        for pos, i in enumerate(members):
+            self._segment[i] = seg_no
+            self._pos[i] = pos
+            self._free[i] = self.seat_map.is_available(i)
+            if not self._free[i]:
+                if free_start is not None:
+                    seg.starts.append(free_start)
+                    seg.ends.append(pos - 1)
+                    free_start = None
+            elif free_start is None:
+                free_start = pos
+        if free_start is not None:
+            seg.starts.append(free_start)
+            seg.ends.append(len(members) - 1)
+
+    def _on_change(self, i, _flag):
+        # Booked and held seats are both unavailable; only react when availability flips
+        if i >= len(self._free):
+            return
+        free = self.seat_map.is_available(i)
+        if free == self._free[i]:
+            return
+        self._free[i] = free
+        seg = self.segments[self._segment[i]]
+        if free:
+            seg.release(self._pos[i])
+        else:
+            seg.take(self._pos[i])
+
+    def _order(self, focus):
+        # Segments sorted by the closest any of their seats could be to the focus point
+        if self._order_cache is None or self._order_cache[0] != focus:
+            fx, fy = focus
+            order = sorted((seg.lower_bound(fx, fy), k) for k, seg in enumerate(self.segments))
+            self._order_cache = (focus, order)
+        return self._order_cache[1]
+
+    def find(self, n, seat_type=None, focus=None):
+        """Indices of the n adjacent free seats whose centroid is nearest the focus, or None."""
+        if n < 1:
+            raise ValueError("Block size must be at least 1")
+        focus = focus or self.centre
+        fx, fy = focus
+        best = None
+        for bound, k in self._order(focus):
+            if best is not None and bound >= best[0]:
+                break
+            seg = self.segments[k]
+            if len(seg.members) < n or (seat_type is not None and seg.seat_type != seat_type):
+                continue
+            found = seg.best_window(n, fx, fy)
+            if found is not None and (best is None or found[0] < best[0]):
+                best = (found[0], k, found[1])
+        if best is None:
+            return None
+        _, k, start = best
+        return list(self.segments[k].members[start:start + n])
@@ -0,0 +1,56 @@
+import csv
+import json
+import os
+
+# Rows come from CinemaScreen.iter_summary(): one per booked seat (grouped by type), then a
+# subtotal per type and a grand total. They are written one at a time, so exporting never
+# holds more than a single row in memory.
+
+FIELDS = ('kind', 'seat_type', 'seat_id', 'price', 'count', 'amount')
+
+
+def format_row(row):
+    if row['kind'] == 'seat':
+        return f"  {row['seat_id']:<15}{row['seat_type']:<15}${row['price']:>9.2f}"
+    if row['kind'] == 'subtotal':
+        return f"{row['seat_type']} subtotal: {row['count']} seats".ljust(32) + f"${row['amount']:>9.2f}"
+    return f"Total: {row['count']} seats".ljust(32) + f"${row['amount']:>9.2f}"
+
+
+def _atomic(path, write):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', newline='') as f:
+        count = write(f)
+    os.replace(tmp, path)
+    return count
+
+
+def write_csv(path, rows):
+    def write(f):
+        writer = csv.DictWriter(f, FIELDS)
+        writer.writeheader()
+        count = 0
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        return count
+    return _atomic(path, write)
+
+
+def write_jsonl(path, rows):
+    def write(f):
+        count = 0
+        for row in rows:
+            f.write(json.dumps(row) + '\n')
+            count += 1
+        return count
+    return _atomic(path, write)
+
+
+def export_sales(screen, path):
+    """Write the screen's sales summary to a .csv or .jsonl file; returns the number of rows."""
+    if path.endswith('.csv'):
+        return write_csv(path, screen.iter_summary())
+    if path.endswith(('.jsonl', '.ndjson')):
+        return write_jsonl(path, screen.iter_summary())
+    raise ValueError(f"Unsupported export format: {path}")
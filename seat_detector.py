@@ -0,0 +1,195 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+
+import cv2
+import numpy as np
+
+from layout import DEFAULT_SIZE, SEAT_COLORS
+
+# Finds seats on a seating chart image and writes them as a layout file (see layout.py):
+#   1. resize the chart to the canvas size, so detected coordinates are canvas coordinates
+#   2. threshold it in HSV once per seat type, around that type's colour in SEAT_COLORS
+#   3. take the outer contours of each mask and fit a rotated rectangle to each; a blob
+#      several seat-widths long is a run of touching seats and is cut into equal seats
+#   4. number the seats row by row and emit one explicit "seats" block
+# Results are cached under .cache by image hash and detection settings.
+#
+# Detection is by colour only, so it needs a chart whose seat types are drawn in distinct
+# saturated colours. The shipped seating_chart.jpg is grayscale and yields no seats; for
+# other charts, pick each type's colour with hsv_color_picker.py and pass them in a
+# palette file ({"premium": [30, 170, 250], "standard": "#800080", ...}).
+
+# Tk 8.6 resolves these names to the web colours, not the X11 ones
+NAMED_COLORS = {'purple': '#800080', 'green': '#008000', 'maroon': '#800000', 'gray': '#808080'}
+
+
+def color_to_hsv(color):
+    """OpenCV HSV (H in 0-179) of a '#rrggbb' or named palette colour, or an [h, s, v] triple as is."""
+    if not isinstance(color, str):
+        return np.array(color, dtype=int)
+    color = NAMED_COLORS.get(color, color)
+    r, g, b = (int(color[k:k + 2], 16) for k in (1, 3, 5))
+    return cv2.cvtColor(np.uint8([[[b, g, r]]]), cv2.COLOR_BGR2HSV)[0, 0].astype(int)
+
+
+def type_mask(hsv, color, hue_tol=8, sat_tol=60, val_tol=60):
+    h, s, v = color_to_hsv(color)
+    lo_sv, hi_sv = (max(s - sat_tol, 0), max(v - val_tol, 0)), (min(s + sat_tol, 255), min(v + val_tol, 255))
+    lo, hi = h - hue_tol, h + hue_tol
+    mask = cv2.inRange(hsv, np.array([max(lo, 0), *lo_sv]), np.array([min(hi, 179), *hi_sv]))
+    # Hue is circular: reds near 0 also match just below 180, and vice versa
+    if lo < 0:
+        mask |= cv2.inRange(hsv, np.array([180 + lo, *lo_sv]), np.array([179, *hi_sv]))
+    if hi > 179:
+        mask |= cv2.inRange(hsv, np.array([0, *lo_sv]), np.array([hi - 180, *hi_sv]))
+    return mask
+
+
+def _rect_to_seat(rect):
+    (cx, cy), (w, h), angle = rect
+    # Seats are wider than deep, so the long side is the seat's width
+    if w < h:
+        w, h, angle = h, w, angle + 90
+    if angle > 90:
+        angle -= 180
+    elif angle <= -90:
+        angle += 180
+    return cx, cy, w, h, angle
+
+
+def _split_run(cx, cy, w, h, angle, seat_width):
+    n = int(round(w / seat_width))
+    if n < 2:
+        return [(cx, cy, w, h, angle)]
+    a = math.radians(angle)
+    step = w / n
+    offsets = ((k - (n - 1) / 2) * step for k in range(n))
+    return [(cx + o * math.cos(a), cy + o * math.sin(a), step, h, angle) for o in offsets]
+
+
+def detect_seats(image, palette=SEAT_COLORS, size=(1280, 720), min_area=40, max_area=None,
+                 seat_width=DEFAULT_SIZE[0], **tolerances):
+    """List of (seat_type, cx, cy, w, h, angle_deg) found in a BGR image."""
+    img = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+    hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+    kernel = np.ones((3, 3), np.uint8)
+    found = []
+    for seat_type, color in palette.items():
+        mask = cv2.morphologyEx(type_mask(hsv, color, **tolerances), cv2.MORPH_OPEN, kernel)
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        for contour in contours:
+            area = cv2.contourArea(contour)
+            if area >= min_area and (max_area is None or area <= max_area):
+                for seat in _split_run(*_rect_to_seat(cv2.minAreaRect(contour)), seat_width):
+                    found.append((seat_type, *seat))
+    return found
+
+
+def number_seats(found):
+    """Seat dicts in layout format, numbered R<row>_<col> top to bottom, left to right."""
+    if not found:
+        return []
+    found = sorted(found, key=lambda s: s[2])
+    row_gap = float(np.median([s[4] for s in found])) * 0.75
+    rows, row, row_y = [], [], found[0][2]
+    for s in found:
+        if s[2] - row_y > row_gap:
+            rows.append(row)
+            row, row_y = [], s[2]
+        row.append(s)
+    rows.append(row)
+    seats = []
+    for r, row in enumerate(rows, 1):
+        for c, (seat_type, cx, cy, w, h, angle) in enumerate(sorted(row, key=lambda s: s[1]), 1):
+            seats.append({'id': f'R{r}_{c}', 'type': seat_type,
+                          'x': round(cx - w / 2, 1), 'y': round(cy - h / 2, 1),
+                          'w': round(w, 1), 'h': round(h, 1), 'angle_deg': round(angle, 1)})
+    return seats
+
+
+def detect_layout(image_path, palette=SEAT_COLORS, size=(1280, 720), cache_dir='.cache', use_cache=True,
+                  **options):
+    """Layout spec (as accepted by layout.compile_layout) for the seats on a chart image."""
+    with open(image_path, 'rb') as f:
+        raw = f.read()
+    settings = json.dumps([sorted(palette.items()), list(size), sorted(options.items())])
+    key = hashlib.sha1(raw + settings.encode()).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(image_path))[0]
+    cached = os.path.join(cache_dir, f"{name}-{key}.layout.json")
+    if use_cache and os.path.exists(cached):
+        with open(cached) as f:
+            return json.load(f)
+    image = cv2.imdecode(np.frombuffer(raw, np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError(f"Cannot decode image {image_path}")
+    seats = number_seats(detect_seats(image, palette, size, **options))
+    if not seats:
+        saturation = int(np.median(cv2.cvtColor(image, cv2.COLOR_BGR2HSV)[..., 1]))
+        hint = (f"the image is (nearly) grayscale (median saturation {saturation}), so seat types "
+                "cannot be told apart by colour" if saturation < 40 else
+                "pick the seat colours with hsv_color_picker.py and pass them with --palette, "
+                "or widen the tolerances")
+        raise ValueError(f"No seats found in {image_path}: {hint}")
+    spec = {'name': name, 'source': {'image': os.path.basename(image_path),
+                                     'sha1': hashlib.sha1(raw).hexdigest()},
+            'blocks': [{'seats': seats}]}
+    if use_cache:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{cached}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(spec, f)
+        os.replace(tmp, cached)
+    return spec
+
+
+def load_palette(path):
+    """{seat_type: colour} from a JSON file; colours are '#rrggbb', Tk names or OpenCV [h, s, v]."""
+    with open(path) as f:
+        palette = json.load(f)
+    if not isinstance(palette, dict) or not palette:
+        raise ValueError(f"{path} must map seat types to colours")
+    for seat_type, color in palette.items():
+        if not isinstance(color, str) and not (isinstance(color, list) and len(color) == 3):
+            raise ValueError(f"{path}: colour for {seat_type!r} must be '#rrggbb', a name or [h, s, v]")
+    return palette
+
+
+def _main():
+    parser = argparse.ArgumentParser(description='Detect seats on a seating chart and write a layout file.')
+    parser.add_argument('image')
+    parser.add_argument('-o', '--output', help='layout file to write (default layouts/<image name>.json)')
+    parser.add_argument('--size', default='1280x720', help='canvas size the layout is for')
+    parser.add_argument('--min-area', type=int, default=40)
+    parser.add_argument('--max-area', type=int)
+    parser.add_argument('--seat-width', type=float, default=DEFAULT_SIZE[0],
+                        help='expected seat width in canvas pixels, used to cut runs of touching seats')
+    parser.add_argument('--palette', help='JSON file mapping seat types to colours (default: the app palette)')
+    parser.add_argument('--hue-tol', type=int, default=8, help='hue tolerance (OpenCV hue is 0-179)')
+    parser.add_argument('--sat-tol', type=int, default=60)
+    parser.add_argument('--val-tol', type=int, default=60)
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args()
+
+    size = tuple(int(v) for v in args.size.split('x'))
+    try:
+        palette = load_palette(args.palette) if args.palette else SEAT_COLORS
+        spec = detect_layout(args.image, palette, size=size, use_cache=not args.no_cache,
+                             min_area=args.min_area, max_area=args.max_area, seat_width=args.seat_width,
+                             hue_tol=args.hue_tol, sat_tol=args.sat_tol, val_tol=args.val_tol)
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"seat_detector: {e}\n")
+    output = args.output or os.path.join('layouts', f"{spec['name']}.json")
+    with open(output, 'w') as f:
+        json.dump(spec, f, indent=1)
+    seats = spec['blocks'][0]['seats']
+    counts = {}
+    for s in seats:
+        counts[s['type']] = counts.get(s['type'], 0) + 1
+    print(f"{len(seats)} seats written to {output}: " + ', '.join(f"{t} {n}" for t, n in sorted(counts.items())))
+
+
+if __name__ == '__main__':
+    _main()
@@ -0,0 +1,562 @@
+from array import array
+import hashlib
+from itertools import chain
+import math
+
+import numpy as np
+
+
+def seat_polygon(x, y, w, h, angle_deg=0):
+    # Four corners of a w*h box whose top-left is (x, y), rotated about its centre
+    angle = math.radians(angle_deg)
+    cos_a, sin_a = math.cos(angle), math.sin(angle)
+    cx, cy = x + w / 2, y + h / 2
+    coords = []
+    for dx, dy in ((-w / 2, -h / 2), (w / 2, -h / 2), (w / 2, h / 2), (-w / 2, h / 2)):
+        coords.append(cx + dx * cos_a - dy * sin_a)
+        coords.append(cy + dx * sin_a + dy * cos_a)
+    return coords
+
+
+def _point_in_polygon(px, py, coords):
+    # Convex polygon test: the point must lie on the same side of every edge
+    sign = 0
+    n = len(coords)
+    for k in range(0, n, 2):
+        x0, y0 = coords[k], coords[k + 1]
+        x1, y1 = coords[(k + 2) % n], coords[(k + 3) % n]
+        cross = (x1 - x0) * (py - y0) - (y1 - y0) * (px - x0)
+        if cross:
+            if sign and (cross > 0) != (sign > 0):
+                return False
+            sign = cross
+    return True
+
+
+class SpatialGrid:
+    """Uniform grid over seat bounding boxes for point and rectangle queries.
+
+    Buckets are stored compressed: sorted cell keys, an offset per cell and one flat array
+    of seat indices, so a large venue costs a few machine words per (cell, seat) pair.
+    Seats inserted one at a time wait in a small dict until there are enough of them to be
+    worth merging in; bulk loads go through insert_many and are merged in one pass.
+    """
+
+    _BIAS = 1 << 30  # cell coordinates are biased so every key is a non-negative int64
+
+    def __init__(self, cell_size=32):
+        self.cell_size = cell_size
+        self._keys = np.empty(0, np.int64)
+        self._offsets = np.zeros(1, np.int64)
+        self._items = np.empty(0, np.int64)
+        self._pending = {}
+        self._pending_count = 0
+
+    def _span(self, x0, y0, x1, y1):
+        size = self.cell_size
+        return int(x0 // size), int(y0 // size), int(x1 // size), int(y1 // size)
+
+    def _key(self, c, r):
+        return (r + self._BIAS) << 31 | (c + self._BIAS)
+
+    def insert(self, i, coords):
+        xs, ys = coords[0::2], coords[1::2]
+        self.insert_bbox(i, min(xs), min(ys), max(xs), max(ys))
+
+    def insert_bbox(self, i, x0, y0, x1, y1):
+        c0, r0, c1, r1 = self._span(x0, y0, x1, y1)
+        bias, pending = self._BIAS, self._pending
+        for r in range(r0 + bias, r1 + bias + 1):
+            for c in range(c0 + bias, c1 + bias + 1):
+                pending.setdefault(r << 31 | c, []).append(i)
+        self._pending_count += (c1 - c0 + 1) * (r1 - r0 + 1)
+        # Merging is linear, so waiting for half the current size keeps single adds amortised O(1)
+        if self._pending_count > max(4096, len(self._items) // 2):
+            self._merge()
+
+    def insert_many(self, start, bboxes):
+        """Insert seats start, start + 1, ... with their (x0, y0, x1, y1) boxes (an (n, 4) array or rows)."""
+        boxes = np.asarray(bboxes if isinstance(bboxes, np.ndarray) else list(bboxes), dtype=np.float64)
+        boxes = boxes.reshape(-1, 4)
+        c0, r0, c1, r1 = (boxes // self.cell_size).astype(np.int64).T
+        width = c1 - c0 + 1
+        counts = width * (r1 - r0 + 1)
+        # One (key, seat) pair per covered cell, row by row within each seat as insert_bbox does
+        seat = np.repeat(np.arange(len(boxes)), counts)
+        k = np.arange(len(seat)) - np.repeat(np.cumsum(counts) - counts, counts)
+        rows, cols = np.divmod(k, width[seat])
+        keys = (r0[seat] + rows + self._BIAS) << 31 | (c0[seat] + cols + self._BIAS)
+        self._merge(keys, seat + start)
+
+    def _merge(self, keys=None, items=None):
+        # Expand the stored buckets back into (key, index) pairs, append the pending and new
+        # ones, and regroup with a stable sort: indices stay in insertion order in each cell
+        key_parts = [np.repeat(self._keys, np.diff(self._offsets))]
+        item_parts = [self._items]
+        if self._pending:
+            key_parts.append(np.repeat(np.fromiter(self._pending, np.int64, len(self._pending)),
+                                       [len(bucket) for bucket in self._pending.values()]))
+            item_parts.append(np.fromiter(chain.from_iterable(self._pending.values()), np.int64,
+                                          self._pending_count))
+        if keys is not None:
+            key_parts.append(keys)
+            item_parts.append(items)
+        all_keys = np.concatenate(key_parts)
+        order = np.argsort(all_keys, kind='stable')
+        all_keys = all_keys[order]
+        self._items = np.concatenate(item_parts)[order]
+        first = np.flatnonzero(np.concatenate(([True], all_keys[1:] != all_keys[:-1]))) if len(all_keys) else order
+        self._keys = all_keys[first]
+        self._offsets = np.append(first, len(all_keys))
+        self._pending = {}
+        self._pending_count = 0
+
+    def _bucket(self, lo_key, hi_key):
+        lo = int(np.searchsorted(self._keys, lo_key, 'left'))
+        hi = int(np.searchsorted(self._keys, hi_key, 'right'))
+        return self._items[self._offsets[lo]:self._offsets[hi]].tolist()
+
+    def at(self, x, y):
+        size = self.cell_size
+        key = self._key(int(x // size), int(y // size))
+        found = self._bucket(key, key)
+        pending = self._pending.get(key)
+        return found + pending if pending else found
+
+    def in_rect(self, x0, y0, x1, y1):
+        c0, r0, c1, r1 = self._span(x0, y0, x1, y1)
+        c0, c1 = max(c0, -self._BIAS), min(c1, self._BIAS - 1)
+        if len(self._keys):
+            # Cells are sorted row by row, so each row of the rectangle is one contiguous run
+            first, last = (int(self._keys[0]) >> 31) - self._BIAS, (int(self._keys[-1]) >> 31) - self._BIAS
+            for r in range(max(r0, first), min(r1, last) + 1):
+                yield from self._bucket(self._key(c0, r), self._key(c1, r))
+        for key, bucket in self._pending.items():
+            c, r = (key & ((1 << 31) - 1)) - self._BIAS, (key >> 31) - self._BIAS
+            if c0 <= c <= c1 and r0 <= r <= r1:
+                yield from bucket
+
+
+def _bbox(coords):
+    xs, ys = coords[0::2], coords[1::2]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _iter_bits(bits):
+    for byte_no, byte in enumerate(bits):
+        if not byte:
+            continue
+        base = byte_no << 3
+        for bit in range(8):
+            if byte & (1 << bit):
+                yield base + bit
+
+
+def _cents(price):
+    return int(round(price * 100))
+
+
+class SeatMap:
+    """Canvas-free seat storage: one slot per seat in flat arrays, booked flags in a bitset.
+
+    Booked revenue and per-type counts are kept as running totals (in integer cents, so
+    they never drift) and updated on every state change.
+    """
+
+    def __init__(self, cell_size=32):
+        self._cell_size = cell_size
+        self._listeners = []
+        self._hold_listeners = []
+        self.clear()
+
+    def clear(self):
+        """Drop every seat; subscribed listeners stay attached and are not called."""
+        self._ids = []
+        self._index = {}
+        self._types = []
+        self._type_codes = {}
+        self._type = array('B')
+        self._x = array('d')
+        self._y = array('d')
+        self._w = array('d')
+        self._h = array('d')
+        self._angle = array('d')
+        self._price = array('d')
+        self._poly = array('d')  # 8 corner coordinates per seat, so drawing needs no trig
+        self._booked = bytearray()
+        self._type_booked = array('q')
+        self._type_cents = array('q')
+        self._booked_cents = 0
+        self._held = bytearray()
+        self._held_count = 0
+        self._held_cents = 0
+        self._grid = SpatialGrid(self._cell_size)
+        self._layout = hashlib.blake2b(digest_size=16)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, seat_id):
+        return seat_id in self._index
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def add(self, seat_id, x, y, seat_type, w=20, h=15, angle_deg=0, price=0.0):
+        if seat_id in self._index:
+            raise ValueError(f"Duplicate seat id {seat_id!r}")
+        if price < 0:
+            raise ValueError("Price must be non-negative")
+        i = len(self._ids)
+        code = self._type_code(seat_type)
+        self._ids.append(seat_id)
+        self._index[seat_id] = i
+        self._type.append(code)
+        self._x.append(x)
+        self._y.append(y)
+        self._w.append(w)
+        self._h.append(h)
+        self._angle.append(angle_deg)
+        self._price.append(price)
+        if i >> 3 >= len(self._booked):
+            self._booked.append(0)
+            self._held.append(0)
+        coords = seat_polygon(x, y, w, h, angle_deg)
+        self._poly.extend(coords)
+        self._grid.insert(i, coords)
+        self._layout.update(f"{seat_id}\0{seat_type}\n".encode())
+        return i
+
+    def extend(self, seat_ids, seat_types, xs, ys, ws, hs, angles, prices, bboxes=None, polygons=None):
+        """Bulk add: every argument is a sequence with one entry per seat.
+
+        `polygons`, when given, is the (n, 8) corner array compiled with the layout (see
+        layout.CompiledLayout) and is stored as is; `bboxes` holds precomputed (x0, y0, x1, y1)
+        polygon bounds. Either saves recomputing the rotated corners. Returns the first new index.
+        """
+        seat_ids = list(seat_ids)
+        seat_types = list(seat_types)
+        prices = list(prices)
+        start, n = len(self._ids), len(seat_ids)
+        index = dict(zip(seat_ids, range(start, start + n)))
+        if len(index) != n or not self._index.keys().isdisjoint(index):
+            raise ValueError("Duplicate seat ids in layout")
+        if prices and min(prices) < 0:
+            raise ValueError("Price must be non-negative")
+        for t in dict.fromkeys(seat_types):
+            self._type_code(t)
+        codes = list(map(self._type_codes.__getitem__, seat_types))
+        self._ids.extend(seat_ids)
+        self._index.update(index)
+        self._type.extend(codes)
+        self._x.extend(xs)
+        self._y.extend(ys)
+        self._w.extend(ws)
+        self._h.extend(hs)
+        self._angle.extend(angles)
+        self._price.extend(prices)
+        grow = (start + n + 7) // 8 - len(self._booked)
+        if grow > 0:
+            self._booked.extend(bytes(grow))
+            self._held.extend(bytes(grow))
+        if polygons is not None:
+            polygons = np.ascontiguousarray(polygons, dtype=np.float64).reshape(n, 8)
+            self._poly.frombytes(polygons.tobytes())
+            if bboxes is None:
+                xs, ys = polygons[:, 0::2], polygons[:, 1::2]
+                bboxes = np.stack([xs.min(axis=1), ys.min(axis=1), xs.max(axis=1), ys.max(axis=1)], axis=1)
+        else:
+            for i in range(start, start + n):
+                self._poly.extend(seat_polygon(self._x[i], self._y[i], self._w[i], self._h[i], self._angle[i]))
+        if bboxes is None:
+            bboxes = (_bbox(self.polygon(i)) for i in range(start, start + n))
+        self._grid.insert_many(start, bboxes)
+        self._layout.update("".join(f"{sid}\0{t}\n" for sid, t in zip(seat_ids, seat_types)).encode())
+        return start
+
+    def _type_code(self, seat_type):
+        code = self._type_codes.get(seat_type)
+        if code is None:
+            if len(self._types) >= 256:
+                raise ValueError("Too many seat types")
+            code = self._type_codes[seat_type] = len(self._types)
+            self._types.append(seat_type)
+            self._type_booked.append(0)
+            self._type_cents.append(0)
+        return code
+
+    def subscribe(self, fn):
+        """Call fn(index, booked) after every booked-flag change."""
+        self._listeners.append(fn)
+
+    def unsubscribe(self, fn):
+        self._listeners.remove(fn)
+
+    def subscribe_holds(self, fn):
+        """Call fn(index, held) after every held-flag change."""
+        self._hold_listeners.append(fn)
+
+    def unsubscribe_holds(self, fn):
+        self._hold_listeners.remove(fn)
+
+    def index(self, seat_id):
+        return self._index[seat_id]
+
+    def get_index(self, seat_id, default=None):
+        return self._index.get(seat_id, default)
+
+    def seat_id(self, i):
+        return self._ids[i]
+
+    def seat_type(self, i):
+        return self._types[self._type[i]]
+
+    @property
+    def seat_types(self):
+        return tuple(self._types)
+
+    def price(self, i):
+        return self._price[i]
+
+    def set_price(self, i, val):
+        if val < 0:
+            raise ValueError("Price must be non-negative")
+        delta = _cents(val) - _cents(self._price[i])
+        if self.is_booked(i):
+            self._type_cents[self._type[i]] += delta
+            self._booked_cents += delta
+        elif self.is_held(i):
+            self._held_cents += delta
+        self._price[i] = val
+
+    def price_column(self):
+        # Copies, so callers can take NumPy views without pinning the live arrays
+        return array('d', self._price)
+
+    def type_column(self):
+        return bytes(self._type)
+
+    def set_prices(self, prices):
+        """Replace every seat's price in one pass and rebuild the price aggregates."""
+        prices = array('d', prices)
+        if len(prices) != len(self._ids):
+            raise ValueError("Need exactly one price per seat")
+        if prices and min(prices) < 0:
+            raise ValueError("Price must be non-negative")
+        self._price = prices
+        type_cents = array('q', [0]) * len(self._types)
+        for i in _iter_bits(self._booked):
+            type_cents[self._type[i]] += _cents(prices[i])
+        self._type_cents = type_cents
+        self._booked_cents = sum(type_cents)
+        self._held_cents = sum(_cents(prices[i]) for i in _iter_bits(self._held))
+
+    def geometry(self, i):
+        return self._x[i], self._y[i], self._w[i], self._h[i], self._angle[i]
+
+    def polygon(self, i):
+        return self._poly[8 * i:8 * i + 8].tolist()
+
+    def seat_at(self, x, y):
+        """Index of the seat whose polygon contains (x, y), or None. Later seats win on overlap."""
+        hit = None
+        for i in self._grid.at(x, y):
+            if _point_in_polygon(x, y, self.polygon(i)):
+                hit = i
+        return hit
+
+    def seats_in_rect(self, x0, y0, x1, y1):
+        """Sorted indices of the seats whose centre lies inside the rectangle."""
+        x0, x1 = min(x0, x1), max(x0, x1)
+        y0, y1 = min(y0, y1), max(y0, y1)
+        found = set()
+        for i in self._grid.in_rect(x0, y0, x1, y1):
+            cx = self._x[i] + self._w[i] / 2
+            cy = self._y[i] + self._h[i] / 2
+            if x0 <= cx <= x1 and y0 <= cy <= y1:
+                found.add(i)
+        return sorted(found)
+
+    def is_booked(self, i):
+        return bool(self._booked[i >> 3] & (1 << (i & 7)))
+
+    def set_booked(self, i, flag):
+        """Set seat i's booked flag; returns True if the flag actually changed.
+
+        Booking a held seat converts the hold into a booking.
+        """
+        if not 0 <= i < len(self._ids):
+            raise IndexError(i)
+        byte, bit = i >> 3, 1 << (i & 7)
+        if bool(self._booked[byte] & bit) == flag:
+            return False
+        released = flag and self.set_held(i, False, notify=False)
+        self._booked[byte] ^= bit
+        code, cents = self._type[i], _cents(self._price[i])
+        if not flag:
+            cents = -cents
+        self._type_booked[code] += 1 if flag else -1
+        self._type_cents[code] += cents
+        self._booked_cents += cents
+        for fn in self._listeners:
+            fn(i, flag)
+        if released:
+            for fn in self._hold_listeners:
+                fn(i, False)
+        return True
+
+    def booked_indices(self):
+        return _iter_bits(self._booked)
+
+    # Holds: a temporary reservation between free and booked; expiry is driven by the caller
+    def is_held(self, i):
+        return bool(self._held[i >> 3] & (1 << (i & 7)))
+
+    def is_available(self, i):
+        byte, bit = i >> 3, 1 << (i & 7)
+        return not (self._booked[byte] | self._held[byte]) & bit
+
+    def set_held(self, i, flag, notify=True):
+        """Set seat i's held flag; returns True if it changed. Booked seats cannot be held."""
+        if not 0 <= i < len(self._ids):
+            raise IndexError(i)
+        byte, bit = i >> 3, 1 << (i & 7)
+        if bool(self._held[byte] & bit) == flag or (flag and self._booked[byte] & bit):
+            return False
+        self._held[byte] ^= bit
+        cents = _cents(self._price[i])
+        self._held_count += 1 if flag else -1
+        self._held_cents += cents if flag else -cents
+        if notify:
+            for fn in self._hold_listeners:
+                fn(i, flag)
+        return True
+
+    def held_indices(self):
+        return _iter_bits(self._held)
+
+    @property
+    def held_count(self):
+        return self._held_count
+
+    @property
+    def held_total(self):
+        return self._held_cents / 100
+
+    def layout_hash(self):
+        """Digest of the seat ids and types in index order, maintained incrementally."""
+        return self._layout.digest()
+
+    def booked_bits(self):
+        return bytes(self._booked)
+
+    def book_bits(self, bits):
+        """Book every seat whose bit is set in `bits` (a bitset in seat-index order), yielding each newly booked index."""
+        count = len(self._ids)
+        for byte_no in range(min(len(bits), len(self._booked))):
+            new = bits[byte_no] & ~self._booked[byte_no]
+            if not new:
+                continue
+            base = byte_no << 3
+            for bit in range(8):
+                if new & (1 << bit) and base + bit < count:
+                    self.set_booked(base + bit, True)
+                    yield base + bit
+
+    def booked_count(self):
+        return sum(self._type_booked)
+
+    @property
+    def booked_total(self):
+        return self._booked_cents / 100
+
+    def type_counts(self):
+        return dict(zip(self._types, self._type_booked))
+
+    def type_totals(self):
+        return {t: c / 100 for t, c in zip(self._types, self._type_cents)}
+
+    def to_dict(self, i):
+        return {
+            'seat_id': self._ids[i],
+            'booked': self.is_booked(i),
+            'seat_type': self.seat_type(i),
+            'x': self._x[i], 'y': self._y[i],
+            'w': self._w[i], 'h': self._h[i],
+            'angle_deg': self._angle[i],
+            'price': self._price[i]
+        }
+
+
+class SeatSlot:
+    """State of one standalone seat, answering the per-seat SeatMap calls a Seat view makes.
+
+    A standalone Seat would otherwise need a SeatMap of its own, several kilobytes of arrays
+    and indexes for a single seat. The index argument is always 0.
+    """
+
+    __slots__ = ('_id', '_type', '_x', '_y', '_w', '_h', '_angle', '_price', '_booked', '_held')
+
+    def __init__(self, seat_id, x, y, seat_type, w=20, h=15, angle_deg=0, price=0.0):
+        if price < 0:
+            raise ValueError("Price must be non-negative")
+        self._id = seat_id
+        self._type = seat_type
+        self._x, self._y, self._w, self._h, self._angle = x, y, w, h, angle_deg
+        self._price = price
+        self._booked = False
+        self._held = False
+
+    def seat_id(self, i):
+        return self._id
+
+    def seat_type(self, i):
+        return self._type
+
+    def price(self, i):
+        return self._price
+
+    def set_price(self, i, val):
+        if val < 0:
+            raise ValueError("Price must be non-negative")
+        self._price = val
+
+    def geometry(self, i):
+        return self._x, self._y, self._w, self._h, self._angle
+
+    def polygon(self, i):
+        return seat_polygon(self._x, self._y, self._w, self._h, self._angle)
+
+    def is_booked(self, i):
+        return self._booked
+
+    def set_booked(self, i, flag):
+        if self._booked == flag:
+            return False
+        if flag:
+            self._held = False
+        self._booked = flag
+        return True
+
+    def is_held(self, i):
+        return self._held
+
+    def is_available(self, i):
+        return not (self._booked or self._held)
+
+    def set_held(self, i, flag, notify=True):
+        if self._held == flag or (flag and self._booked):
+            return False
+        self._held = flag
+        return True
+
+    def to_dict(self, i):
+        return {
+            'seat_id': self._id,
+            'booked': self._booked,
+            'seat_type': self._type,
+            'x': self._x, 'y': self._y,
+            'w': self._w, 'h': self._h,
+            'angle_deg': self._angle,
+            'price': self._price
+        }
@@ -0,0 +1,155 @@
+import json
+import os
+
+from booking_journal import BookingJournal, write_json_atomic
+from main import CinemaScreen
+
+
+def make_screen(journal=None, seats=('A1', 'A2', 'A3')):
+    screen = CinemaScreen(None, {}, lambda: None)
+    for n, seat_id in enumerate(seats):
+        screen.add_seat(seat_id, n * 22, 0, 'standard')
+    if journal is not None:
+        screen.attach_journal(journal)
+    return screen
+
+
+def booked(screen):
+    return [screen.seat_map.seat_id(i) for i in screen.seat_map.booked_indices()]
+
+
+def test_record_and_replay(tmp_path):
+    journal = BookingJournal(tmp_path / 'j', snapshot=tmp_path / 's.json')
+    journal.record('A1', True)
+    journal.record('A1', False)
+    assert list(journal.replay()) == [('A1', True), ('A1', False)]
+    journal.close()
+
+
+def test_torn_last_line_is_skipped(tmp_path):
+    path = tmp_path / 'j'
+    path.write_text(json.dumps({'seat_id': 'A1', 'booked': True}) + '\n' + '{"seat_id": "A2", "boo')
+    journal = BookingJournal(path, snapshot=tmp_path / 's.json')
+    assert list(journal.replay()) == [('A1', True)]
+    # New events still land on their own line after the torn one
+    journal.record('A3', True)
+    assert list(journal.replay()) == [('A1', True), ('A3', True)]
+    journal.close()
+
+
+def test_compact_folds_journal_into_snapshot(tmp_path):
+    snapshot = str(tmp_path / 's.json')
+    journal = BookingJournal(str(tmp_path / 'j'), snapshot=snapshot)
+    screen = make_screen(journal)
+    screen.seat('A2').book(None)
+    screen.compact(background=False)
+    assert not os.path.exists(journal.old_path)
+    assert list(journal.replay()) == []
+    with open(snapshot) as f:
+        assert [d['seat_id'] for d in json.load(f) if d['booked']] == ['A2']
+    journal.close()
+
+    reopened = make_screen(BookingJournal(str(tmp_path / 'j'), snapshot=snapshot))
+    reopened.load_bookings(snapshot)
+    assert booked(reopened) == ['A2']
+    reopened.journal.close()
+
+
+def test_replay_order_snapshot_then_old_then_live(tmp_path):
+    path, snapshot = str(tmp_path / 'j'), str(tmp_path / 's.json')
+    # Snapshot: A1 and A2 booked. A compaction that never finished left A1's reset and
+    # A3's booking in .old; the live journal then reset A3 and re-booked A1.
+    write_json_atomic(snapshot, [{'seat_id': 'A1', 'booked': True}, {'seat_id': 'A2', 'booked': True},
+                                 {'seat_id': 'A3', 'booked': False}])
+    with open(f"{path}.old", 'w') as f:
+        f.write(json.dumps({'seat_id': 'A1', 'booked': False}) + '\n')
+        f.write(json.dumps({'seat_id': 'A3', 'booked': True}) + '\n')
+    with open(path, 'w') as f:
+        f.write(json.dumps({'seat_id': 'A3', 'booked': False}) + '\n')
+        f.write(json.dumps({'seat_id': 'A1', 'booked': True}) + '\n')
+    journal = BookingJournal(path, snapshot=snapshot)
+    screen = make_screen(journal)
+    screen.load_bookings(snapshot)
+    assert booked(screen) == ['A1', 'A2']
+    # Replaying must not write the replayed events back into the journal
+    assert len(list(journal.replay())) == 4
+    journal.close()
+
+
+def test_leftover_old_survives_next_compaction(tmp_path):
+    path, snapshot = str(tmp_path / 'j'), str(tmp_path / 's.json')
+    with open(f"{path}.old", 'w') as f:
+        f.write(json.dumps({'seat_id': 'A1', 'booked': True}) + '\n')
+    journal = BookingJournal(path, snapshot=snapshot)
+    journal.record('A2', True)
+
+    def failing_records():
+        yield {'seat_id': 'A1', 'booked': True}
+        raise OSError('disk full')
+
+    # A compaction that dies while writing the snapshot: the rotation appended the live
+    # events to the unfinished .old instead of replacing it, and nothing was lost
+    try:
+        journal.compact(failing_records(), background=False)
+    except OSError:
+        pass
+    journal.record('A3', True)
+    assert list(journal.replay()) == [('A1', True), ('A2', True), ('A3', True)]
+
+    screen = make_screen(journal)
+    screen.load_bookings(snapshot)
+    assert booked(screen) == ['A1', 'A2', 'A3']
+    screen.compact(background=False)
+    assert not os.path.exists(journal.old_path)
+    journal.close()
+
+    reopened = make_screen(BookingJournal(path, snapshot=snapshot))
+    reopened.load_bookings(snapshot)
+    assert booked(reopened) == ['A1', 'A2', 'A3']
+    reopened.journal.close()
+
+
+def test_crash_before_old_is_removed_replays_idempotently(tmp_path):
+    path, snapshot = str(tmp_path / 'j'), str(tmp_path / 's.json')
+    journal = BookingJournal(path, snapshot=snapshot)
+    screen = make_screen(journal)
+    screen.seat('A1').book(None)
+    screen.seat('A2').book(None)
+    screen.seat('A2').reset(None)
+    journal.close()
+    # Crash after the snapshot was renamed into place but before .old was dropped
+    os.replace(path, f"{path}.old")
+    write_json_atomic(snapshot, (screen.seat_map.to_dict(i) for i in range(len(screen.seat_map))))
+
+    reopened = make_screen(BookingJournal(path, snapshot=snapshot))
+    reopened.load_bookings(snapshot)
+    assert booked(reopened) == ['A1']
+    reopened.journal.close()
+
+
+def test_due_grows_with_venue(tmp_path):
+    journal = BookingJournal(str(tmp_path / 'j'), snapshot=str(tmp_path / 's.json'), compact_after=2)
+    journal.record('A1', True)
+    journal.record('A1', False)
+    assert journal.due()
+    assert not journal.due(seat_count=10)
+    journal.close()
+
+
+def test_live_events_appended_after_torn_old(tmp_path):
+    path, snapshot = str(tmp_path / 'j'), str(tmp_path / 's.json')
+    with open(f"{path}.old", 'w') as f:
+        f.write(json.dumps({'seat_id': 'A1', 'booked': True}) + '\n{"seat_id": "A2"')
+    journal = BookingJournal(path, snapshot=snapshot)
+    journal.record('A3', True)
+
+    def failing_records():
+        raise OSError('disk full')
+        yield
+
+    try:
+        journal.compact(failing_records(), background=False)
+    except OSError:
+        pass
+    assert list(journal.replay()) == [('A1', True), ('A3', True)]
+    journal.close()
@@ -0,0 +1,174 @@
+import asyncio
+import os
+
+import pytest
+
+import booking_service
+from booking_service import BookingClient, BookingService, serve
+
+
+def small_hall(screen):
+    for n in range(4):
+        screen.add_seat(f'A{n + 1}', n * 22, 0, 'standard')
+
+
+def make_service(tmp_path, **kwargs):
+    return BookingService(str(tmp_path / 'showtimes'), layout=small_hall, **kwargs)
+
+
+def test_compare_and_swap(tmp_path):
+    async def scenario():
+        service = make_service(tmp_path)
+        first = await service.book('fri', 'A1', expected_version=0)
+        assert first == {'ok': True, 'seat_id': 'A1', 'booked': True, 'version': 1}
+        again = await service.book('fri', 'A1')
+        assert again['error'] == 'already booked'
+        stale = await service.reset('fri', 'A1', expected_version=0)
+        assert stale['error'] == 'version conflict' and stale['version'] == 1
+        assert (await service.reset('fri', 'A1', expected_version=1))['ok']
+        taken = await service.book_many('fri', ['A2', 'A1', 'A1'])
+        assert not taken['ok']
+        assert not (await service.state('fri', 'A2'))['booked']
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize('key', ['../escaped', '', 'a/b', '.hidden', 'x' * 65, 7, None])
+def test_bad_showtime_keys_are_rejected(tmp_path, key):
+    async def scenario():
+        service = make_service(tmp_path)
+        reply = await service.handle({'op': 'book', 'showtime': key, 'seat_id': 'A1'})
+        assert not reply['ok']
+        assert service.showtimes == {}
+    asyncio.run(scenario())
+    assert not os.path.exists(tmp_path / 'escaped.bin')
+
+
+def test_known_keys_and_limit(tmp_path):
+    async def scenario():
+        service = make_service(tmp_path, keys=['fri', 'sat'])
+        assert (await service.handle({'op': 'state', 'showtime': 'sun', 'seat_id': 'A1'}))['error'].startswith('bad')
+        service = make_service(tmp_path, max_showtimes=1)
+        assert (await service.handle({'op': 'state', 'showtime': 'fri', 'seat_id': 'A1'}))['ok']
+        assert not (await service.handle({'op': 'state', 'showtime': 'sat', 'seat_id': 'A1'}))['ok']
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize('request_', [
+    [1, 2],
+    'book',
+    {'op': 'best_available', 'showtime': 'fri', 'n': '2'},
+    {'op': 'best_available', 'showtime': 'fri', 'n': True},
+    {'op': 'best_available', 'showtime': 'fri', 'n': 0},
+    {'op': 'book_many', 'showtime': 'fri', 'seat_ids': [['x']]},
+    {'op': 'book_many', 'showtime': 'fri', 'seat_ids': 'A1'},
+    {'op': 'book', 'showtime': 'fri', 'seat_id': ['A1']},
+    {'op': 'book', 'showtime': 'fri', 'seat_id': 'A1', 'version': '0'},
+    {'op': 'state', 'showtime': 'fri'},
+])
+def test_malformed_requests_get_error_replies(tmp_path, request_):
+    async def scenario():
+        return await make_service(tmp_path).handle(request_)
+    reply = asyncio.run(scenario())
+    assert reply['ok'] is False and reply['error']
+
+
+def test_connection_survives_bad_requests(tmp_path):
+    async def scenario():
+        service = make_service(tmp_path)
+        server = await serve(service, port=0)
+        port = server.sockets[0].getsockname()[1]
+        client = await BookingClient.connect(port=port)
+        try:
+            assert not (await client.request(op='best_available', showtime='fri', n='2'))['ok']
+            assert not (await client.request(op='book_many', showtime='fri', seat_ids=[['x']]))['ok']
+            assert (await client.book('fri', 'A1'))['ok']
+        finally:
+            await client.close()
+            server.close()
+            await server.wait_closed()
+            await service.stop()
+    asyncio.run(scenario())
+
+
+def test_failed_flush_keeps_showtime_dirty(tmp_path, monkeypatch):
+    async def scenario():
+        service = make_service(tmp_path, flush_interval=0.01)
+        await service.book('fri', 'A1')
+        show = service.showtimes['fri']
+        calls = []
+
+        def failing_write(*args):
+            calls.append(args)
+            raise OSError('disk full')
+
+        monkeypatch.setattr(booking_service, 'write_snapshot_bits', failing_write)
+        await service.start()
+        await asyncio.sleep(0.1)
+        # The flusher keeps retrying instead of dying on the first error
+        assert len(calls) > 1 and show.dirty
+        monkeypatch.undo()
+        await service.stop()
+        assert not show.dirty
+
+        reloaded = make_service(tmp_path)
+        assert (await reloaded.state('fri', 'A1'))['booked']
+    asyncio.run(scenario())
+
+
+def test_stale_capture_does_not_overwrite_newer_snapshot(tmp_path):
+    async def scenario():
+        service = make_service(tmp_path)
+        await service.book('fri', 'A1')
+        show = service.showtimes['fri']
+        old = (show.changes, show.screen.seat_map.booked_bits())
+        await service.book('fri', 'A2')
+        await service.flush()
+        path = service._path('fri')
+        show.save(path, *old)
+        reloaded = make_service(tmp_path)
+        assert (await reloaded.state('fri', 'A2'))['booked']
+    asyncio.run(scenario())
+
+
+def test_snapshot_for_another_layout_is_left_alone(tmp_path):
+    async def scenario():
+        service = make_service(tmp_path)
+        await service.book('fri', 'A1')
+        await service.flush()
+        path = service._path('fri')
+        with open(path, 'rb') as f:
+            saved = f.read()
+
+        def bigger_hall(screen):
+            small_hall(screen)
+            screen.add_seat('B1', 0, 30, 'standard')
+
+        other = BookingService(str(tmp_path / 'showtimes'), layout=bigger_hall)
+        for _ in range(2):
+            reply = await other.handle({'op': 'book', 'showtime': 'fri', 'seat_id': 'B1'})
+            assert not reply['ok'] and 'layout' in reply['error']
+        assert other.showtimes == {}
+        await other.flush()
+        with open(path, 'rb') as f:
+            assert f.read() == saved
+    asyncio.run(scenario())
+
+
+def test_oversized_and_unhashable_requests_get_error_replies(tmp_path, caplog):
+    async def scenario():
+        service = make_service(tmp_path)
+        server = await serve(service, port=0)
+        port = server.sockets[0].getsockname()[1]
+        client = await BookingClient.connect(port=port)
+        try:
+            assert (await client.request(op='book', showtime='fri', seat_id='x' * 100000))['error'] == 'request too long'
+            reply = await client.request(op='book', showtime=['fri'], seat_id='A1')
+            assert reply['error'].startswith('bad request')
+            assert (await client.book('fri', 'A1'))['ok']
+        finally:
+            await client.close()
+            server.close()
+            await server.wait_closed()
+            await service.stop()
+    asyncio.run(scenario())
+    assert not [r for r in caplog.records if r.levelname == 'ERROR']
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from booking_snapshot import HEADER, Snapshot, is_snapshot, json_to_snapshot, snapshot_to_json
+from seat_map import SeatMap
+
+RECORDS = [
+    {'seat_id': 'A1', 'x': 0, 'y': 0, 'seat_type': 'premium', 'booked': True},
+    {'seat_id': 'A2', 'x': 30, 'y': 0, 'seat_type': 'standard', 'booked': False},
+    {'seat_id': 'B1', 'x': 0, 'y': 30, 'seat_type': 'value', 'angle_deg': 15, 'price': 7.5, 'booked': True},
+]
+
+
+def write_records(tmp_path, records=RECORDS):
+    path = tmp_path / 'bookings.json'
+    path.write_text(json.dumps(records))
+    return str(path)
+
+
+def test_json_round_trip(tmp_path):
+    snap_path = str(tmp_path / 'bookings.snap')
+    seat_map = json_to_snapshot(write_records(tmp_path), snap_path)
+    assert is_snapshot(snap_path)
+    with Snapshot(snap_path) as snap:
+        assert len(snap) == 3 and snap.booked_count() == 2
+        assert [snap.is_booked(i) for i in range(3)] == [True, False, True]
+        assert snap.matches(seat_map)
+    out = tmp_path / 'out.json'
+    snapshot_to_json(snap_path, str(out), seat_map)
+    records = json.loads(out.read_text())
+    assert [(d['seat_id'], d['seat_type'], d['booked']) for d in records] == \
+        [(d['seat_id'], d['seat_type'], d['booked']) for d in RECORDS]
+    assert records[2]['price'] == 7.5
+
+
+def test_truncated_snapshot_is_rejected(tmp_path):
+    snap_path = tmp_path / 'bookings.snap'
+    # 20 seats need 3 bytes of flags; keep only the header and one byte
+    json_to_snapshot(write_records(tmp_path, [dict(RECORDS[0], seat_id=f'S{k}', x=30 * k) for k in range(20)]),
+                     str(snap_path))
+    data = snap_path.read_bytes()
+    snap_path.write_bytes(data[:HEADER.size + 1])
+    with pytest.raises(ValueError, match='truncated'):
+        Snapshot(str(snap_path))
+    snap_path.write_bytes(data[:HEADER.size - 1])
+    with pytest.raises(ValueError, match='too short'):
+        Snapshot(str(snap_path))
+
+
+def test_snapshot_for_another_layout_is_rejected(tmp_path):
+    snap_path = str(tmp_path / 'bookings.snap')
+    json_to_snapshot(write_records(tmp_path), snap_path)
+    # Same seat count, different seat ids
+    other = SeatMap()
+    for d in RECORDS:
+        other.add('X' + d['seat_id'], d['x'], d['y'], d['seat_type'])
+    with Snapshot(snap_path) as snap:
+        assert len(snap) == len(other) and not snap.matches(other)
+    with pytest.raises(ValueError, match='different seat layout'):
+        snapshot_to_json(snap_path, str(tmp_path / 'out.json'), other)
+    assert not (tmp_path / 'out.json').exists()
@@ -0,0 +1,51 @@
+import pytest
+
+from booking_service import Showtime
+from main import CinemaScreen, Seat, enable_metrics
+
+ENV = {'CINEMA_METRICS': 'metrics.prom'}
+
+
+@pytest.fixture
+def metrics():
+    metrics = enable_metrics(environ=ENV)
+    yield metrics
+    metrics.uninstrument()
+
+
+def small_hall(screen):
+    for n in range(4):
+        screen.add_seat(f'A{n + 1}', n * 22, 0, 'standard')
+
+
+def test_enabling_twice_wraps_once(metrics):
+    screen = CinemaScreen(None, {}, lambda: None)
+    assert enable_metrics(screen, environ=ENV) is metrics
+    assert enable_metrics(screen, environ=ENV) is metrics
+    small_hall(screen)
+    screen.book_all()
+    assert metrics.histograms['screen_book_all_seconds'].count == 1
+    assert metrics.histograms['screen_set_booked_seconds'].count == 4
+    assert metrics.histograms['update_callback_seconds'].count == 1
+
+
+def test_uninstrument_restores_the_originals(metrics):
+    assert Seat.__dict__['book']._metrics is metrics
+    metrics.uninstrument()
+    assert not hasattr(Seat.__dict__['book'], '_metrics')
+    again = enable_metrics(environ=ENV)
+    assert again is not metrics
+    again.uninstrument()
+
+
+def test_service_changes_go_through_the_instrumented_screen(metrics):
+    show = Showtime('fri', small_hall)
+    metrics.instrument(Showtime, 'change', 'book_many')
+    metrics.instrument(Showtime, 'change')
+    try:
+        assert show.change('A1', True)['ok'] and show.book_many(['A2', 'A3'])['ok']
+        assert metrics.histograms['showtime_change_seconds'].count == 1
+        assert metrics.histograms['showtime_book_many_seconds'].count == 1
+        assert metrics.histograms['screen_set_booked_seconds'].count == 3
+    finally:
+        metrics.uninstrument()
@@ -0,0 +1,101 @@
+import datetime
+
+import pytest
+
+from main import CinemaScreen
+from pricing import PricingEngine
+from seat_map import SeatMap
+
+
+def make_map(n=10):
+    # Even seats standard at $10, odd seats premium at $20
+    seat_map = SeatMap()
+    for i in range(n):
+        seat_type, price = ('standard', 10.0) if i % 2 == 0 else ('premium', 20.0)
+        seat_map.add(f'A_{i + 1}', i * 25, 0, seat_type, price=price)
+    return seat_map
+
+
+def prices(seat_map):
+    return [seat_map.price(i) for i in range(len(seat_map))]
+
+
+def test_rules_compile_into_seat_prices():
+    seat_map = make_map(4)
+    # Saturday matinee: 1.15 for the day, 0.8 for the time slot
+    engine = PricingEngine(seat_map, showtime=datetime.datetime(2024, 6, 1, 14, 0),
+                           type_multipliers={'premium': 1.5}, day_multipliers={5: 1.15},
+                           time_multipliers=[(10, 16, 0.8)])
+    assert prices(seat_map) == [9.2, 27.6, 9.2, 27.6]
+    engine.set_showtime(datetime.datetime(2024, 6, 3, 20, 0))
+    assert prices(seat_map) == [10.0, 30.0, 10.0, 30.0]
+
+
+def test_surge_thresholds():
+    seat_map = make_map(10)
+    PricingEngine(seat_map, surge=[(0.5, 1.5), (0.8, 2.0)])
+    for i in range(4):
+        seat_map.set_booked(i, True)
+    assert seat_map.price(9) == 20.0
+    # The tier starts at the threshold itself
+    seat_map.set_booked(4, True)
+    assert seat_map.price(9) == 30.0 and seat_map.price(8) == 15.0
+    for i in range(5, 8):
+        seat_map.set_booked(i, True)
+    assert seat_map.price(9) == 40.0
+    # Falling back below a threshold drops the tier again
+    seat_map.set_booked(7, False)
+    assert seat_map.price(9) == 30.0 and seat_map.price(7) == 30.0
+
+
+def test_promo_codes():
+    seat_map = make_map(4)
+    engine = PricingEngine(seat_map, promos={'STUDENT': {'percent': 20, 'seat_types': ['standard']}})
+    engine.add_promo('HALF', 50)
+    assert engine.quote([0, 1], promo='STUDENT') == 28.0
+    assert engine.quote([0, 1], promo='HALF') == 15.0
+    assert prices(seat_map) == [10.0, 20.0, 10.0, 20.0]
+    engine.apply_promo('STUDENT')
+    engine.apply_promo('STUDENT')
+    assert prices(seat_map) == [8.0, 20.0, 8.0, 20.0]
+    # Stacks with active codes; an active code is not applied twice through quote
+    assert engine.quote([0, 1], promo='HALF') == 14.0 and engine.quote([0], promo='STUDENT') == 8.0
+    engine.remove_promo('STUDENT')
+    assert prices(seat_map) == [10.0, 20.0, 10.0, 20.0]
+    with pytest.raises(ValueError):
+        engine.apply_promo('NOPE')
+    with pytest.raises(ValueError):
+        engine.quote([0], promo='NOPE')
+
+
+def test_booked_seats_keep_their_price():
+    seat_map = make_map(4)
+    engine = PricingEngine(seat_map)
+    seat_map.set_booked(0, True)
+    engine.set_type_multiplier('standard', 2.0)
+    assert prices(seat_map) == [10.0, 20.0, 20.0, 20.0]
+    # A reset seat goes back on sale at the current price
+    seat_map.set_booked(0, False)
+    assert seat_map.price(0) == 20.0
+
+
+def test_running_totals_follow_repricing():
+    screen = CinemaScreen(None, {}, lambda: None)
+    for i in range(10):
+        screen.add_seat(f'A_{i + 1}', i * 25, 0, 'standard')
+    base = screen.seat_map.price(0)
+    engine = PricingEngine(screen.seat_map, surge=[(0.5, 2.0)])
+    screen.attach_pricing(engine)
+    screen.apply_bookings((i, True) for i in range(4))
+    assert screen.get_total_price() == pytest.approx(4 * base)
+    # The fifth booking is sold at the old price and lifts occupancy into the surge tier;
+    # only seats still on sale are repriced
+    screen.apply_bookings([(4, True)])
+    assert screen.seat_map.price(9) == pytest.approx(2 * base)
+    assert screen.get_total_price() == pytest.approx(5 * base)
+    screen.apply_bookings([(5, True)])
+    assert screen.get_total_price() == pytest.approx(5 * base + 2 * base)
+    screen.apply_bookings([(0, False)])
+    assert screen.get_total_price() == pytest.approx(4 * base + 2 * base)
+    assert screen.get_total_price() == pytest.approx(sum(screen.seat_map.price(i)
+                                                         for i in screen.seat_map.booked_indices()))
@@ -0,0 +1,64 @@
+from radar_alerts import AlertEngine
+from radar_system import Car, RadarSystem
+
+T = 1_700_000_000 * 10**9
+
+
+def make_radars(n):
+    car = Car(1, "ABC-123", "Sedan")
+    return [RadarSystem(i, car, "Front") for i in range(n)]
+
+
+def test_run_spanning_batches_is_one_alert():
+    radar, = make_radars(1)
+    engine = AlertEngine(speed_limit=100)
+    radar.add_readings([50, 50], [90, 130], [T + 1, T + 2])
+    alert, = engine.evaluate(radar)
+    radar.add_readings([50, 50], [150, 90], [T + 3, T + 4])
+    assert engine.evaluate(radar) == []
+    assert alert.window == (T + 2, T + 3, 2) and alert._speed_measured == 150
+
+
+def test_resolved_alert_is_not_extended():
+    radar, = make_radars(1)
+    engine = AlertEngine(speed_limit=100)
+    radar.add_readings([50], [130], [T + 1])
+    first, = engine.evaluate(radar)
+    first.resolve()
+    radar.add_readings([50], [140], [T + 2])
+    second, = engine.evaluate(radar)
+    assert first.window == (T + 1, T + 1, 1)
+    assert second.window == (T + 2, T + 2, 1)
+
+
+def test_evaluate_accepts_any_iterable():
+    radars = make_radars(3)
+    for radar in radars:
+        radar.add_readings([5], [50], [T + 1])
+    created = AlertEngine(min_distance=10).evaluate(radar for radar in radars)
+    assert sorted(alert._radar_system.id for alert in created) == [0, 1, 2]
+
+
+def test_worst_value_comes_from_the_run_only():
+    radar, = make_radars(1)
+    # The readings between the two runs, NaN among them, must not leak into either alert
+    radar.add_readings([50, 50, 50, 50, 50, 5], [130, 90, float('nan'), 200, 125, 90],
+                       [T + 1, T + 2, T + 3, T + 4, T + 5, T + 6])
+    first, second = AlertEngine(speed_limit=120, min_distance=0).evaluate(radar)
+    assert first._speed_measured == 130 and first.window == (T + 1, T + 1, 1)
+    assert second._speed_measured == 200 and second.window == (T + 4, T + 5, 2)
+    radar.add_readings([float('nan'), 4, 3, 50], [90, 90, 90, 90], [T + 7, T + 8, T + 9, T + 10])
+    alerts = AlertEngine(speed_limit=1000, min_distance=10).evaluate(radar)
+    assert [(a._distance_measured, a.window) for a in alerts] == [(5, (T + 6, T + 6, 1)), (3, (T + 8, T + 9, 2))]
+
+
+def test_radars_are_tracked_by_id():
+    engine = AlertEngine(speed_limit=100)
+    radar, = make_radars(1)
+    radar.add_readings([50], [130], [T + 1])
+    alert, = engine.evaluate(radar)
+    # The same radar rebuilt (e.g. reloaded from the database) continues where it left off
+    reloaded = RadarSystem(radar.id, Car(1, "ABC-123", "Sedan"), "Front")
+    reloaded.add_readings([50, 50], [130, 140], [T + 1, T + 2])
+    assert engine.evaluate(reloaded) == []
+    assert alert.window == (T + 1, T + 2, 2) and alert._speed_measured == 140
@@ -0,0 +1,116 @@
+import sqlite3
+
+import pytest
+
+from radar_db import LazyReadingStore, RadarDatabase
+from radar_system import Car, MaintenanceRecord, RadarSystem, SpeedAlert, Technician
+
+T = 1_700_000_000 * 10**9
+
+
+def make_fleet():
+    car = Car(1, "ABC-123", "Sedan", owner="Ann", mileage=1200)
+    radar = RadarSystem(10, car, "Front")
+    radar.add_readings([30.0, 25.5, 8.0], [90, 130, 110], [T, T + 10, T + 20])
+    alert = SpeedAlert(100, radar, 130, 120)
+    alert.window = (T + 10, T + 10, 1)
+    tech = Technician(5, "Bob", "bob@example.com")
+    MaintenanceRecord(7, radar, tech, notes="calibrated", date="2024-03-01")
+    return car, radar, tech
+
+
+def reading_count(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM readings").fetchone()[0]
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'radar.db')
+    car, radar, tech = make_fleet()
+    with RadarDatabase(path) as db:
+        db.save_fleet([car], [tech])
+    with RadarDatabase(path) as db:
+        (loaded,), (loaded_tech,) = db.load_fleet()
+        assert (loaded.id, loaded.get_license_plate(), loaded.owner, loaded.mileage) == (1, "ABC-123", "Ann", 1200)
+        loaded_radar, = loaded.radar_systems
+        assert [r.display_info() for r in loaded_radar.radar_readings] == \
+            [r.display_info() for r in radar.radar_readings]
+        alert, = loaded_radar.alerts
+        assert alert.display_info() == radar.alerts[0].display_info() and alert.window == (T + 10, T + 10, 1)
+        record, = loaded_radar.maintenance_records
+        assert record._technician is loaded_tech and record._date == "2024-03-01"
+
+
+def test_history_loads_lazily(tmp_path):
+    path = str(tmp_path / 'radar.db')
+    car, _, tech = make_fleet()
+    with RadarDatabase(path) as db:
+        db.save_fleet([car], [tech])
+    with RadarDatabase(path) as db:
+        (loaded,), _ = db.load_fleet()
+        store = loaded.radar_systems[0].readings
+        assert isinstance(store, LazyReadingStore) and not store._loaded
+        assert store.indices_between(T + 5, T + 25).tolist() == [1, 2]
+        assert store._loaded
+
+
+def test_only_new_readings_are_saved(tmp_path):
+    path = str(tmp_path / 'radar.db')
+    car, radar, tech = make_fleet()
+    with RadarDatabase(path) as db:
+        db.save_fleet([car], [tech])
+        radar.add_readings([40.0], [80], [T + 30])
+        db.save_fleet([car], [tech])
+    assert reading_count(path) == 4
+    with RadarDatabase(path) as db:
+        (loaded,), _ = db.load_fleet()
+        loaded_radar = loaded.radar_systems[0]
+        db.save_fleet([loaded])  # nothing loaded, nothing new
+        loaded_radar.add_readings([50.0], [70], [T + 40])
+        db.save_fleet([loaded])
+        assert len(loaded_radar.readings) == 5
+    assert reading_count(path) == 5
+
+
+def test_second_instance_does_not_duplicate_readings(tmp_path):
+    path = str(tmp_path / 'radar.db')
+    car, _, tech = make_fleet()
+    with RadarDatabase(path) as db:
+        db.save_fleet([car], [tech])
+    with RadarDatabase(path) as db:
+        db.save_fleet([car], [tech])
+    assert reading_count(path) == 3
+
+
+class FailingConnection:
+    # Stands in for the writer connection while the database is locked by someone else
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __enter__(self):
+        return self._conn.__enter__()
+
+    def __exit__(self, *exc):
+        return self._conn.__exit__(*exc)
+
+    def executemany(self, *args):
+        raise sqlite3.OperationalError("database is locked")
+
+    def close(self):
+        self._conn.close()
+
+
+def test_failed_flush_keeps_readings_queued(tmp_path):
+    path = str(tmp_path / 'radar.db')
+    car, radar, tech = make_fleet()
+    db = RadarDatabase(path)
+    conn = db._conn
+    db._conn = FailingConnection(conn)
+    with pytest.raises(sqlite3.OperationalError):
+        db.save_fleet([car], [tech])
+    # Nothing counts as saved until it is committed; saving again does not queue the rows twice
+    assert db._saved_readings.get(radar.id, 0) == 0
+    db.save_readings(radar)
+    db._conn = conn
+    db.close()
+    assert reading_count(path) == 3 and db._saved_readings[radar.id] == 3
@@ -0,0 +1,117 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from radar_system import (NO_TIMESTAMP, Car, DistanceAlert, EntityRegistry, MaintenanceRecord, RadarReading,
+                          RadarSystem, SpeedAlert, Technician, to_epoch_ns)
+
+T = 1_700_000_000 * 10**9
+
+
+def make_radar():
+    return RadarSystem(1, Car(1, "ABC-123", "Sedan"), "Front")
+
+
+def test_reading_views_compare_by_row():
+    radar = make_radar()
+    radar.add_readings([10, 20], [50, 60])
+    readings = radar.radar_readings
+    assert readings[0] == readings[0] and readings[0] != readings[1]
+    assert readings[0] in readings
+    assert len({readings[0], readings[0], readings[1]}) == 2
+    assert readings[0] not in make_radar().radar_readings
+
+
+def test_to_epoch_ns_formats():
+    jan1 = round(datetime.datetime(2024, 1, 1).timestamp() * 1e6) * 1000
+    assert to_epoch_ns("2024-01-01") == jan1
+    assert to_epoch_ns("2024-01-01 00:00:00") == jan1
+    assert to_epoch_ns(datetime.date(2024, 1, 1)) == jan1
+    assert to_epoch_ns(1.7e9) == 1_700_000_000 * 10**9
+    assert to_epoch_ns(None) == to_epoch_ns(float('nan')) == NO_TIMESTAMP
+
+
+def test_unparseable_timestamp_is_kept_as_entered():
+    radar = make_radar()
+    RadarReading(1, radar, 10, 50, "last tuesday")
+    radar.add_readings([10, 20], [50, 60], [1.7e9, "2024-01-01"])
+    reading = radar.radar_readings[0]
+    assert reading.timestamp == "last tuesday" and reading.timestamp_ns == NO_TIMESTAMP
+    assert radar.radar_readings[2].timestamp == "2024-01-01 00:00:00"
+    reading.timestamp = "2024-01-02"
+    assert reading.timestamp == "2024-01-02 00:00:00"
+
+
+def test_numbers_outside_the_epoch_range_are_rejected():
+    # Epoch seconds or milliseconds given as an int would otherwise read as January 1970
+    for value in (1_700_000_000, 1_700_000_000_000, 1.7e18, float('inf')):
+        with pytest.raises(ValueError):
+            to_epoch_ns(value)
+    radar = make_radar()
+    RadarReading(1, radar, 10, 50, 1_700_000_000)
+    reading = radar.radar_readings[0]
+    assert reading.timestamp_ns == NO_TIMESTAMP and reading.timestamp == 1_700_000_000
+
+
+def test_ns_column_with_missing_values_stays_exact():
+    radar = make_radar()
+    radar.add_readings([1, 2, 3], [1, 2, 3], np.ma.masked_array([T + 1, 0, T + 3], mask=[False, True, False]))
+    radar.add_readings([4, 5], [4, 5], [T + 4, None])
+    # NaN promotes ns ints to float64, where they are out of range for seconds: kept, not garbled
+    radar.add_readings([6, 7], [6, 7], np.array([T + 6, np.nan]))
+    ts = radar.readings.column('timestamp').tolist()
+    assert ts == [T + 1, NO_TIMESTAMP, T + 3, T + 4, NO_TIMESTAMP, NO_TIMESTAMP, NO_TIMESTAMP]
+    assert radar.radar_readings[5].timestamp == float(T + 6)
+
+
+@pytest.fixture
+def registry():
+    registry = EntityRegistry().attach()
+    yield registry
+    registry.detach()
+
+
+def test_registry_lookup_by_plate(registry):
+    car = Car(1, "ABC-123", "Sedan")
+    other = Car(2, "XYZ-9", "Van")
+    assert registry.cars_by_plate("ABC-123") == [car]
+    car.set_license_plate("NEW-1")
+    assert registry.cars_by_plate("ABC-123") == [] and registry.cars_by_plate("NEW-1") == [car]
+    assert registry.get(Car, 2) is other
+
+
+def test_registry_top_alerts(registry):
+    radar = make_radar()
+    low = SpeedAlert(1, radar, 130, 120, "Low")
+    high_old = DistanceAlert(2, radar, 5, 10, "High")
+    medium = SpeedAlert(3, radar, 140, 120, "Medium")
+    high_new = SpeedAlert(4, radar, 150, 120, "High")
+    assert registry.top_alerts(3) == [high_old, high_new, medium]
+    high_old.resolve()
+    assert registry.top_alerts() == [high_new, medium, low]
+    assert registry.unresolved_alerts("High") == [high_new]
+
+
+def test_registry_replaces_entities_with_the_same_id(registry):
+    first = Car(1, "ABC-123", "Sedan")
+    radar = RadarSystem(1, first, "Front")
+    old_alert = SpeedAlert(1, radar, 130, 120, "High")
+    second = Car(1, "XYZ-9", "Van")
+    new_alert = SpeedAlert(1, radar, 125, 120, "Low")
+    assert registry.get(Car, 1) is second and registry.cars_by_plate("ABC-123") == []
+    assert registry.top_alerts() == [new_alert] and not old_alert._resolved
+
+
+def test_registry_maintenance_between(registry):
+    radar = make_radar()
+    ann, bob = Technician(1, "Ann", "ann@x"), Technician(2, "Bob", "bob@x")
+    r1 = MaintenanceRecord(1, radar, ann, date="2024-01-10")
+    r2 = MaintenanceRecord(2, radar, bob, date=datetime.date(2024, 2, 1))
+    r3 = MaintenanceRecord(3, radar, ann, date="2024-03-05 09:30")
+    MaintenanceRecord(4, radar, ann)  # "Not Set" is not indexed
+    assert registry.maintenance_between("2024-01-10", "2024-03-05") == [r1, r2, r3]
+    assert registry.maintenance_between(datetime.date(2024, 1, 11), "2024-12-31", technician=ann) == [r3]
+    for start, end in (("soon", "2024-12-31"), ("2024-01-01", None)):
+        with pytest.raises(ValueError):
+            registry.maintenance_between(start, end)
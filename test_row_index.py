@@ -0,0 +1,72 @@
+import math
+import random
+
+from main import CinemaScreen
+from row_index import split_seat_id
+
+
+def make_screen():
+    # Four rows of 12, with a type change mid-row and a gap in the numbering of row C
+    screen = CinemaScreen(None, {}, lambda: None)
+    for r, row in enumerate('ABCD'):
+        for c in range(1, 13):
+            if row == 'C' and c == 6:
+                continue
+            seat_type = 'premium' if row in 'BC' and 4 <= c <= 9 else 'standard'
+            screen.add_seat(f'{row}_{c}', c * 25 + r * 3, r * 30, seat_type)
+    return screen
+
+
+def brute_force(seat_map, n, seat_type, focus):
+    # Best score over every window of n free seats with consecutive numbers and one type
+    rows = {}
+    for i in range(len(seat_map)):
+        row, col = split_seat_id(seat_map.seat_id(i))
+        rows.setdefault(row, {})[col] = i
+    best = None
+    for cols in rows.values():
+        for col, first in cols.items():
+            block = [cols.get(col + k) for k in range(n)]
+            if None in block or len({seat_map.seat_type(i) for i in block}) != 1:
+                continue
+            if (seat_type is not None and seat_map.seat_type(first) != seat_type) or \
+                    not all(seat_map.is_available(i) for i in block):
+                continue
+            score = block_score(seat_map, block, focus)
+            if best is None or score < best:
+                best = score
+    return best
+
+
+def block_score(seat_map, block, focus):
+    centres = [(x + w / 2, y + h / 2) for x, y, w, h, _ in map(seat_map.geometry, block)]
+    cx = sum(c[0] for c in centres) / len(block)
+    cy = sum(c[1] for c in centres) / len(block)
+    return math.hypot(cx - focus[0], cy - focus[1])
+
+
+def test_find_matches_brute_force_after_random_changes():
+    rng = random.Random(7)
+    screen = make_screen()
+    seat_map = screen.seat_map
+    screen.find_best_available(1, book=False)
+    rows = screen._rows
+    for step in range(400):
+        roll = rng.random()
+        if roll < 0.02:
+            screen.reset_all()
+        elif roll < 0.1:
+            screen.hold(seat_map.seat_id(rng.randrange(len(seat_map))), ttl=60)
+        else:
+            i = rng.randrange(len(seat_map))
+            screen.apply_bookings([(i, not seat_map.is_booked(i))])
+        n = rng.randint(1, 5)
+        seat_type = rng.choice([None, 'standard', 'premium'])
+        focus = rng.choice([None, (rng.uniform(0, 330), rng.uniform(0, 100))])
+        block = rows.find(n, seat_type, focus)
+        expected = brute_force(seat_map, n, seat_type, focus or rows.centre)
+        if expected is None:
+            assert block is None
+            continue
+        assert block is not None and len(block) == n and all(seat_map.is_available(i) for i in block)
+        assert math.isclose(block_score(seat_map, block, focus or rows.centre), expected, abs_tol=1e-9)
@@ -0,0 +1,95 @@
+import gc
+from types import SimpleNamespace
+
+import pytest
+
+from main import CinemaScreen, Seat
+
+
+def test_standalone_seat_counts_once():
+    before = Seat.total_seats()
+    seat = Seat(None, 'A1', 0, 0, 'premium', 'gold', lambda: None)
+    seat.hold(None)
+    seat.book(None)
+    assert seat.booked and not seat.held and seat.price == Seat.PRICES['premium']
+    assert Seat.total_seats() == before + 1
+    seat.dispose()
+    seat.dispose()
+    assert Seat.total_seats() == before
+    with pytest.raises(RuntimeError, match='seat view detached'):
+        seat.price
+
+
+def test_disposing_a_view_keeps_the_slot_counted():
+    screen = CinemaScreen(None, {}, lambda: None)
+    screen.add_seat('A1', 0, 0, 'standard')
+    count = Seat.total_seats()
+    screen.seat('A1').dispose()
+    assert Seat.total_seats() == count
+    screen.clear()
+    assert Seat.total_seats() == count - 1
+
+
+def test_clear_detaches_views():
+    screen = CinemaScreen(None, {}, lambda: None)
+    screen.add_seat('A1', 0, 0, 'standard')
+    old = screen.seat('A1')
+    screen.clear()
+    screen.add_seat('B1', 0, 0, 'premium')
+    with pytest.raises(RuntimeError, match='seat view detached'):
+        old.book(None)
+    with pytest.raises(RuntimeError, match='seat view detached'):
+        old.seat_id
+    assert not screen.seat_map.is_booked(0)
+
+
+def test_apply_bookings_counts_only_changes():
+    screen = CinemaScreen(None, {}, lambda: None)
+    for k in range(3):
+        screen.add_seat(f'A{k}', k * 30, 0, 'standard')
+    assert screen.apply_bookings([(0, True), (1, True), (0, True), (2, False)]) == 2
+    assert screen.apply_bookings([(0, False), (1, True)]) == 1
+    assert [screen.seat_map.is_booked(i) for i in range(3)] == [False, True, False]
+
+
+class FakeCanvas:
+    def __init__(self):
+        self.items = {}
+        self.bindings = {}
+        self.current = None
+
+    def _create(self, *args, tags=(), **kwargs):
+        self.items[len(self.items) + 1] = tags
+        return len(self.items)
+
+    create_polygon = create_text = _create
+
+    def tag_bind(self, tag, sequence, callback):
+        self.bindings[tag, sequence] = callback
+
+    def gettags(self, item):
+        return self.items.get(self.current, ())
+
+    def itemconfig(self, *args, **kwargs):
+        pass
+
+    def delete(self, tag):
+        self.items = {k: tags for k, tags in self.items.items() if tag not in tags}
+
+
+def test_drawn_seat_stays_clickable_until_disposed(monkeypatch):
+    clicked = []
+    monkeypatch.setattr(Seat, 'on_click', lambda self, canvas: clicked.append(self.seat_id))
+    canvas = FakeCanvas()
+    seat = Seat(canvas, 'A1', 0, 0, 'premium', 'gold', lambda: None)
+    del seat
+    gc.collect()
+    click = canvas.bindings[Seat.TAG, '<Button-1>']
+    canvas.current = 1
+    click(SimpleNamespace(widget=canvas))
+    assert clicked == ['A1']
+    seat = Seat._drawn[canvas]['A1']
+    seat.dispose(canvas)
+    assert 'A1' not in Seat._drawn[canvas] and not canvas.items
+    click(SimpleNamespace(widget=canvas))
+    assert clicked == ['A1']
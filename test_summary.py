@@ -0,0 +1,39 @@
+import random
+
+from main import CinemaScreen
+
+
+def make_screen(n=60, seed=3):
+    rng = random.Random(seed)
+    screen = CinemaScreen(None, {}, lambda: None)
+    for k in range(n):
+        screen.add_seat(f'A_{k + 1}', k * 25, 0, rng.choice(['premium', 'standard', 'value', 'reserved']))
+    screen.apply_bookings((k, rng.random() < 0.4) for k in range(n))
+    return screen
+
+
+def test_seeking_matches_the_full_summary():
+    screen = make_screen()
+    rows = list(screen.iter_summary())
+    assert len(rows) == screen.summary_length()
+    for start in range(len(rows) + 2):
+        assert list(screen.iter_summary(start)) == rows[start:]
+
+
+def test_summary_groups_by_type_in_seat_order():
+    screen = make_screen()
+    seat_map = screen.seat_map
+    booked = list(seat_map.booked_indices())
+    expected = [i for t in seat_map.seat_types for i in booked if seat_map.seat_type(i) == t]
+    assert list(screen.iter_booked()) == expected
+    assert list(screen.iter_booked('value')) == [i for i in booked if seat_map.seat_type(i) == 'value']
+    assert list(screen.iter_booked('balcony')) == []
+    seats = [row['seat_id'] for row in screen.iter_summary() if row['kind'] == 'seat']
+    assert seats == [seat_map.seat_id(i) for i in expected]
+
+
+def test_empty_summary_is_just_the_total():
+    screen = make_screen(seed=1)
+    screen.reset_all()
+    assert list(screen.iter_summary()) == [{'kind': 'total', 'count': 0, 'amount': 0}]
+    assert list(screen.iter_summary(1)) == []
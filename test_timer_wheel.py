@@ -0,0 +1,129 @@
+import random
+
+import pytest
+
+import main
+from main import CinemaScreen
+from timer_wheel import TimerWheel
+
+
+def test_fires_at_deadline_not_before():
+    wheel = TimerWheel(tick=1.0, slots=8, levels=2)
+    assert wheel.schedule('a', 5)
+    assert wheel.advance(4) == []
+    assert wheel.advance(5) == ['a']
+    assert len(wheel) == 0
+
+
+def test_past_deadline_is_not_scheduled():
+    wheel = TimerWheel(now=10)
+    assert not wheel.schedule('a', 9.5)
+    assert 'a' not in wheel
+
+
+def test_cancel_and_reschedule():
+    wheel = TimerWheel(tick=1.0, slots=4, levels=2)
+    wheel.schedule('a', 3)
+    wheel.schedule('b', 3)
+    assert wheel.cancel('a')
+    assert not wheel.cancel('a')
+    wheel.schedule('b', 12)
+    assert wheel.deadline('b') == 12
+    assert wheel.advance(11) == []
+    assert wheel.advance(12) == ['b']
+
+
+def test_cascading_matches_brute_force():
+    # 4 slots x 3 levels covers 64 ticks, so most deadlines start on an upper level,
+    # cascade down as the lower wheels turn, and some are parked past the span
+    rng = random.Random(7)
+    wheel = TimerWheel(tick=1.0, slots=4, levels=3)
+    pending = {}
+    now = 0
+    for step in range(400):
+        for _ in range(rng.randint(0, 3)):
+            key = rng.randrange(50)
+            deadline = now + rng.choice([rng.randint(1, 5), rng.randint(1, 70), rng.randint(60, 300)])
+            wheel.schedule(key, deadline)
+            pending[key] = deadline
+        if rng.random() < 0.2 and pending:
+            key = rng.choice(sorted(pending))
+            wheel.cancel(key)
+            del pending[key]
+        now += rng.choice([1, 1, 2, 7, 30])
+        expired = wheel.advance(now)
+        due = {key for key, deadline in pending.items() if deadline <= now}
+        assert sorted(expired) == sorted(due), step
+        for key in due:
+            del pending[key]
+        assert len(wheel) == len(pending)
+
+
+def test_fractional_ticks_round_up():
+    wheel = TimerWheel(tick=0.5, slots=8, levels=2)
+    wheel.schedule('a', 1.2)
+    assert wheel.advance(1.4) == []
+    assert wheel.advance(1.5) == ['a']
+
+
+# Holds on a CinemaScreen expire through the wheel
+
+def make_screen(now):
+    screen = CinemaScreen(None, {}, lambda: None)
+    for n in range(4):
+        screen.add_seat(f'A{n + 1}', n * 22, 0, 'standard')
+    screen.clock = lambda: now[0]
+    return screen
+
+
+def test_hold_expires():
+    now = [0.0]
+    screen = make_screen(now)
+    assert screen.hold('A1', ttl=10)
+    now[0] = 9
+    assert screen.expire_holds() == []
+    now[0] = 10
+    assert screen.expire_holds() == ['A1']
+    assert screen.seat_map.is_available(0)
+
+
+def test_booking_a_held_seat_cancels_its_expiry():
+    now = [0.0]
+    screen = make_screen(now)
+    screen.hold('A1', ttl=10)
+    screen.book_all()
+    assert 0 not in screen._holds
+    screen.reset_all()
+    # A new hold on the same seat must not be ended by the first hold's deadline
+    screen.hold('A1', ttl=100)
+    now[0] = 20
+    assert screen.expire_holds() == []
+    assert screen.seat_map.is_held(0)
+
+
+def test_book_rect_skips_held_seats(monkeypatch):
+    now = [0.0]
+    screen = make_screen(now)
+    screen.hold('A2', ttl=10)
+    monkeypatch.setattr(main.messagebox, 'askyesno', lambda *args: True)
+    screen.book_rect(-10, -10, 200, 50)
+    assert [screen.seat_map.is_booked(i) for i in range(4)] == [True, False, True, True]
+    assert screen.seat_map.is_held(1)
+    now[0] = 10
+    assert screen.expire_holds() == ['A2']
+
+
+def test_hold_that_cannot_be_scheduled_is_not_kept():
+    now = [0.0]
+    screen = make_screen(now)
+    with pytest.raises(ValueError):
+        screen.hold('A1', ttl=0)
+    assert screen.seat_map.is_available(0)
+    screen.hold('A2', ttl=10)
+    screen.expire_holds()
+    now[0] = 5
+    screen.expire_holds()
+    # A clock that went backwards gives a deadline the wheel has already passed
+    now[0] = -20
+    assert not screen.hold('A3', ttl=10)
+    assert screen.seat_map.is_available(2)
@@ -0,0 +1,87 @@
+import math
+
+
+class TimerWheel:
+    """Hierarchical timing wheel: O(1) schedule/cancel, expiry cost proportional to what expires.
+
+    Time is cut into ticks of `tick` seconds. Level 0 has one slot per tick for the next
+    `slots` ticks, level 1 one slot per `slots` ticks, and so on; entries cascade down a
+    level whenever the wheel below completes a turn. Deadlines past the top level are
+    parked in its furthest slot and re-filed when they cascade.
+    """
+
+    def __init__(self, tick=1.0, slots=64, levels=4, now=0.0):
+        if slots & (slots - 1):
+            raise ValueError("slots must be a power of two")
+        self.tick = tick
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._levels = [[{} for _ in range(slots)] for _ in range(levels)]
+        self._span = slots ** levels
+        self._now = int(now // tick)
+        self._where = {}
+
+    def __len__(self):
+        return len(self._where)
+
+    def __contains__(self, key):
+        return key in self._where
+
+    def deadline(self, key):
+        return self._where[key][2] * self.tick
+
+    def schedule(self, key, deadline):
+        """(Re)schedule key to fire at `deadline` (same clock as advance()); returns False if already due."""
+        self.cancel(key)
+        target = math.ceil(deadline / self.tick)
+        if target <= self._now:
+            return False
+        self._file(key, target)
+        return True
+
+    def cancel(self, key):
+        where = self._where.pop(key, None)
+        if where is None:
+            return False
+        level, slot, _ = where
+        del self._levels[level][slot][key]
+        return True
+
+    def _file(self, key, target):
+        delta = min(target - self._now, self._span - 1)
+        level = 0
+        while delta >> (self._bits * (level + 1)):
+            level += 1
+        slot = ((self._now + delta) >> (self._bits * level)) & self._mask
+        self._levels[level][slot][key] = target
+        self._where[key] = (level, slot, target)
+
+    def advance(self, now):
+        """Move the wheel to `now` and return the keys whose deadline has passed."""
+        end = int(now // self.tick)
+        expired = []
+        while self._now < end:
+            if not self._where:
+                self._now = end
+                break
+            self._now += 1
+            t = self._now
+            for level in range(len(self._levels) - 1, 0, -1):
+                if t & ((1 << (self._bits * level)) - 1) == 0:
+                    bucket = self._levels[level][(t >> (self._bits * level)) & self._mask]
+                    if bucket:
+                        moved = list(bucket.items())
+                        bucket.clear()
+                        for key, target in moved:
+                            del self._where[key]
+                            if target <= t:
+                                expired.append(key)
+                            else:
+                                self._file(key, target)
+            bucket = self._levels[0][t & self._mask]
+            if bucket:
+                for key in bucket:
+                    del self._where[key]
+                expired.extend(bucket)
+                bucket.clear()
+        return expired
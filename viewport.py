@@ -0,0 +1,134 @@
+class Viewport:
+    """World <-> canvas transform: canvas = (world - origin) * scale."""
+
+    def __init__(self, width=1280, height=720, scale=1.0, origin=(0.0, 0.0)):
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self.ox, self.oy = origin
+
+    def to_canvas(self, x, y):
+        return (x - self.ox) * self.scale, (y - self.oy) * self.scale
+
+    def to_world(self, cx, cy):
+        return cx / self.scale + self.ox, cy / self.scale + self.oy
+
+    def world_rect(self, margin=0):
+        x0, y0 = self.to_world(-margin, -margin)
+        x1, y1 = self.to_world(self.width + margin, self.height + margin)
+        return x0, y0, x1, y1
+
+
+class SeatRenderer:
+    """Keeps canvas items only for the seats inside the viewport.
+
+    Items of seats that scroll out of view are hidden and reused for seats that scroll in,
+    pans and zooms are applied to every live item with one canvas.move/scale call, and seat
+    labels are hidden below `label_zoom`. Redraw cost therefore follows what is visible,
+    not the size of the venue.
+    """
+
+    SEAT_TAG = 'seat'
+    LABEL_TAG = 'seat_label'
+
+    def __init__(self, canvas, seat_map, fill, viewport=None, label_zoom=0.9, margin=40):
+        self.canvas = canvas
+        self.seat_map = seat_map
+        self.fill = fill
+        self.viewport = viewport or Viewport()
+        self.label_zoom = label_zoom
+        self.margin = margin
+        self.visible = {}
+        self._pool = []
+
+    @property
+    def labels_shown(self):
+        return self.viewport.scale >= self.label_zoom
+
+    def _coords(self, i):
+        # Corners come from the SeatMap's stored polygon array (compiled with the layout), so
+        # placing a seat is a scale and offset, and its centre is the mean of the corners
+        vp = self.viewport
+        ox, oy, scale = vp.ox, vp.oy, vp.scale
+        poly = self.seat_map.polygon(i)
+        coords = [(poly[k] - (oy if k & 1 else ox)) * scale for k in range(8)]
+        return coords, (sum(coords[0::2]) / 4, sum(coords[1::2]) / 4)
+
+    def _show(self, i):
+        coords, (cx, cy) = self._coords(i)
+        label_state = 'normal' if self.labels_shown else 'hidden'
+        if self._pool:
+            shape, label = self._pool.pop()
+            self.canvas.coords(shape, *coords)
+            self.canvas.itemconfigure(shape, fill=self.fill(i), state='normal')
+            self.canvas.coords(label, cx, cy)
+            self.canvas.itemconfigure(label, text=self.seat_map.seat_id(i), state=label_state)
+        else:
+            shape = self.canvas.create_polygon(coords, fill=self.fill(i), outline="black", tags=self.SEAT_TAG)
+            label = self.canvas.create_text(cx, cy, text=self.seat_map.seat_id(i), font=("Arial", 8),
+                                            tags=self.LABEL_TAG, state=label_state)
+        self.visible[i] = (shape, label)
+
+    def _hide(self, i):
+        shape, label = self.visible.pop(i)
+        self.canvas.itemconfigure(shape, state='hidden')
+        self.canvas.itemconfigure(label, state='hidden')
+        self._pool.append((shape, label))
+
+    def render(self):
+        wanted = set(self.seat_map.seats_in_rect(*self.viewport.world_rect(self.margin)))
+        for i in [i for i in self.visible if i not in wanted]:
+            self._hide(i)
+        for i in wanted:
+            if i not in self.visible:
+                self._show(i)
+        # Keep a bounded reserve of recycled items after zooming back in from a wide view
+        keep = max(2 * len(self.visible), 1000)
+        while len(self._pool) > keep:
+            self.canvas.delete(*self._pool.pop())
+
+    def add(self, i):
+        x0, y0, x1, y1 = self.viewport.world_rect(self.margin)
+        x, y, w, h, _ = self.seat_map.geometry(i)
+        if x0 <= x + w / 2 <= x1 and y0 <= y + h / 2 <= y1:
+            self._show(i)
+
+    def repaint(self, i):
+        items = self.visible.get(i)
+        if items is not None:
+            self.canvas.itemconfigure(items[0], fill=self.fill(i))
+
+    def pan(self, dx, dy):
+        """Shift the view by (dx, dy) canvas pixels."""
+        vp = self.viewport
+        vp.ox -= dx / vp.scale
+        vp.oy -= dy / vp.scale
+        self.canvas.move(self.SEAT_TAG, dx, dy)
+        self.canvas.move(self.LABEL_TAG, dx, dy)
+        self.render()
+
+    def zoom(self, factor, cx, cy):
+        """Scale the view by `factor` about canvas point (cx, cy)."""
+        vp = self.viewport
+        wx, wy = vp.to_world(cx, cy)
+        labels_before = self.labels_shown
+        vp.scale *= factor
+        vp.ox, vp.oy = wx - cx / vp.scale, wy - cy / vp.scale
+        self.canvas.scale(self.SEAT_TAG, cx, cy, factor, factor)
+        # Text items only move with scale(); their font size stays put
+        self.canvas.scale(self.LABEL_TAG, cx, cy, factor, factor)
+        if self.labels_shown != labels_before:
+            state = 'normal' if self.labels_shown else 'hidden'
+            for _, label in self.visible.values():
+                self.canvas.itemconfigure(label, state=state)
+        self.render()
+
+    def resize(self, width, height):
+        self.viewport.width, self.viewport.height = width, height
+        self.render()
+
+    def clear(self):
+        self.canvas.delete(self.SEAT_TAG)
+        self.canvas.delete(self.LABEL_TAG)
+        self.visible.clear()
+        self._pool.clear()